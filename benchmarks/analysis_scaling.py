@@ -0,0 +1,255 @@
+"""
+Analysis scaling benchmarks: time of node entropy, information gain and
+drift detection as graph size and simulated days grow, with empirical
+complexity exponents fitted over each growing axis.
+
+Run from the repository root:
+
+    python -m benchmarks.analysis_scaling --quick
+    python -m benchmarks.analysis_scaling --max-exponent 1.5
+"""
+
+import contextlib
+import copy
+import os
+import random
+import sys
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.harness import (START_DATE, argument_parser, build_graph, finish,
+                                fit_exponent, run_isolated, timed)
+
+# Nodes timed per calculate_node_entropy case
+ENTROPY_SAMPLE = 200
+
+# Modes exercising the project's own code paths; the other modes time the
+# reference implementations (full scans, per-day snapshots, the example's
+# loop) for comparison and are expected to scale worse
+GATED_MODES = {'incremental', 'delta', 'online'}
+
+def bench_node_entropy(triples: int, mode: str, seed: int = 0) -> Dict[str, Any]:
+    """
+    calculate_node_entropy on a sample of nodes, and entropy_all.
+
+    'scan' analyzes a plain Graph, so every call scans the node's triples;
+    'incremental' analyzes the GraphManager and reads maintained counts.
+    """
+    from src.analysis.information_gain import InformationGainAnalyzer
+
+    gm, _ = build_graph(triples, seed)
+    analyzer = InformationGainAnalyzer(gm if mode == 'incremental' else gm.graph)
+    nodes = sorted(set(gm.graph.subjects()))
+    nodes = random.Random(seed).sample(nodes, min(ENTROPY_SAMPLE, len(nodes)))
+
+    def entropies():
+        for node in nodes:
+            analyzer.calculate_node_entropy(node)
+
+    seconds, _ = timed(entropies)
+    all_seconds, _ = timed(analyzer.entropy_all)
+    return {
+        'triples': len(gm.graph),
+        'seconds': seconds / len(nodes),
+        'entropy_all_seconds': all_seconds
+    }
+
+def bench_information_gain(days: int, persons: int, mode: str, seed: int = 0) -> Dict[str, Any]:
+    """
+    Daily health and travel information gain over a simulated period.
+
+    'snapshot' follows examples/analyze_information_gain.py: deep-copy the
+    graph every day and compare the copy with the grown graph using a new
+    analyzer. 'delta' keeps one analyzer attached to the GraphManager and
+    calls calculate_information_gain_delta every day. Only the analysis is
+    timed, not the simulation.
+    """
+    from rdflib import Graph
+    from src.analysis.information_gain import InformationGainAnalyzer
+    from src.core.graph_manager import GraphManager
+    from src.core.personal_data_simulator import PersonalDataKnowledgeSimulator
+
+    random.seed(seed)
+    gm = GraphManager()
+    simulators = [PersonalDataKnowledgeSimulator(f"person{i}", START_DATE, graph_manager=gm)
+                  for i in range(persons)]
+    analyzer = InformationGainAnalyzer(gm) if mode == 'delta' else None
+    if analyzer is not None:
+        analyzer.calculate_information_gain_delta()
+
+    seconds = 0.0
+    for day in range(days):
+        if mode == 'snapshot':
+            elapsed, prev_graph = timed(lambda: copy.deepcopy(gm.graph) if day else Graph())
+            seconds += elapsed
+        for simulator in simulators:
+            simulator.simulate_day()
+        if mode == 'snapshot':
+            def gains():
+                day_analyzer = InformationGainAnalyzer(gm.graph)
+                day_analyzer.calculate_information_gain('health', prev_graph, gm.graph)
+                day_analyzer.calculate_information_gain('travel', prev_graph, gm.graph)
+        else:
+            def gains():
+                analyzer.calculate_information_gain_delta(categories=['health', 'travel'])
+        elapsed, _ = timed(gains)
+        seconds += elapsed
+
+    return {'triples': len(gm.graph), 'seconds': seconds, 'seconds_per_day': seconds / days}
+
+def _health_records(persons: int, days: int, seed: int) -> List[List[Dict[str, Any]]]:
+    from src.utils.data_simulator import PersonalDataSimulator
+
+    random.seed(seed)
+    records = []
+    for _ in range(persons):
+        data_simulator = PersonalDataSimulator(START_DATE)
+        person_records = []
+        for _ in range(days):
+            person_records.append(data_simulator.generate_daily_health_data())
+            data_simulator.advance_day()
+        records.append(person_records)
+    return records
+
+def bench_drift(days: int, persons: int, mode: str, seed: int = 0) -> Dict[str, Any]:
+    """
+    Weekly drift detection over every person's health metrics.
+
+    'example' runs the per-person path of
+    examples/baseline_drift_identification.py (weekly averages, change
+    detection for three metrics and merging each person's graph into a
+    combined graph) and needs that script's dependencies. 'online' extracts
+    the metrics from one graph with QueryManager.get_health_arrays,
+    aggregates them per week and feeds OnlineDriftDetector one week at a
+    time. Building the graphs is not timed.
+    """
+    from rdflib import Graph
+    from src.core.personal_ontology_builder import PersonalOntologyBuilder
+
+    records = _health_records(persons, days, seed)
+
+    if mode == 'example':
+        from examples.baseline_drift_identification import (calculate_weekly_averages,
+                                                            detect_significant_changes)
+
+        graphs = []
+        for i, person_records in enumerate(records):
+            builder = PersonalOntologyBuilder()
+            for record in person_records:
+                builder.add_health_data(record, f"person{i}")
+            graphs.append(builder.get_graph_manager().graph)
+
+        def detect():
+            combined = Graph()
+            for person_records, graph in zip(records, graphs):
+                combined += graph
+                for weekly in calculate_weekly_averages(person_records):
+                    detect_significant_changes(weekly)
+            return combined
+
+        # detect_significant_changes prints the length of every series
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            seconds, combined = timed(detect)
+        return {'triples': len(combined), 'seconds': seconds}
+
+    import numpy as np
+    from src.analysis.aggregation import aggregate_metrics
+    from src.analysis.drift_detection import OnlineDriftDetector
+    from src.core.query_manager import QueryManager
+
+    builder = PersonalOntologyBuilder()
+    person_ids = [f"person{i}" for i in range(persons)]
+    for person_id, person_records in zip(person_ids, records):
+        for record in person_records:
+            builder.add_health_data(record, person_id)
+    graph = builder.get_graph_manager().graph
+    metrics = ['heart_rate_average', 'blood_pressure_systolic', 'sleep_duration']
+
+    def detect():
+        arrays = QueryManager(graph).get_health_arrays(person_ids, metrics=metrics)
+        weekly = aggregate_metrics(arrays['metrics'], window='week')
+        detector = OnlineDriftDetector(metrics)
+        detector.add_persons(person_ids)
+        weeks = np.stack([weekly[m]['mean'] for m in metrics], axis=-1)
+        for week in range(weeks.shape[1]):
+            detector.update(weeks[:, week, :])
+        return detector
+
+    seconds, _ = timed(detect)
+    return {'triples': len(graph), 'seconds': seconds}
+
+def _scaling_case(name: str, params: Dict[str, Any], axis: str,
+                  points: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Fit seconds over the growing axis of one benchmark configuration."""
+    xs = [x for x, _ in points]
+    return {'name': f"{name}_scaling", 'params': dict(params, axis=axis),
+            'metrics': {'exponent': fit_exponent(xs, [m['seconds'] for _, m in points]),
+                        'triples_exponent': fit_exponent(xs, [m['triples'] for _, m in points]),
+                        axis: xs}}
+
+def main(argv=None) -> int:
+    parser = argument_parser(__doc__.strip().splitlines()[0],
+                             os.path.join('data', 'benchmarks', 'analysis_scaling.json'))
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        help='graph sizes in triples for calculate_node_entropy')
+    parser.add_argument('--days', type=int, nargs='+',
+                        help='simulated days for information gain and drift detection')
+    parser.add_argument('--persons', type=int, default=None,
+                        help='persons simulated in the days-axis benchmarks')
+    parser.add_argument('--only', nargs='+', choices=['node_entropy', 'information_gain', 'drift'],
+                        help='benchmarks to run (default: all)')
+    parser.add_argument('--max-exponent', type=float,
+                        help='fail when a fitted time exponent of an incremental, '
+                             'delta or online case exceeds this value')
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or ([1000, 4000, 16000] if args.quick else [1000, 10000, 100000])
+    days_axis = args.days or ([14, 28, 56] if args.quick else [30, 90, 180, 365])
+    persons = args.persons or (1 if args.quick else 5)
+
+    matrix = {
+        'node_entropy': (bench_node_entropy, 'triples', sizes, [{'mode': 'scan'}, {'mode': 'incremental'}]),
+        'information_gain': (bench_information_gain, 'days', days_axis,
+                             [{'mode': 'snapshot', 'persons': persons},
+                              {'mode': 'delta', 'persons': persons}]),
+        'drift': (bench_drift, 'days', days_axis,
+                  [{'mode': 'example', 'persons': persons}, {'mode': 'online', 'persons': persons}])
+    }
+
+    cases = []
+    for name in args.only or matrix:
+        func, axis, values, configurations = matrix[name]
+        for params in configurations:
+            points = []
+            for value in values:
+                try:
+                    metrics = run_isolated(func, **{axis: value}, **params)
+                except ImportError as e:
+                    print(f"{name:18s} {params} skipped: {e}")
+                    break
+                points.append((value, metrics))
+                cases.append({'name': name, 'params': dict(params, **{axis: value}),
+                              'metrics': metrics})
+                print(f"{name:18s} {params['mode']:11s} {axis}={value:<8d} "
+                      f"triples={metrics['triples']:<9d} {metrics['seconds']:.4g}s")
+            if len(points) > 1:
+                cases.append(_scaling_case(name, params, axis, points))
+
+    superlinear = []
+    for case in cases:
+        if not case['name'].endswith('_scaling'):
+            continue
+        exponent = case['metrics']['exponent']
+        print(f"{case['name']:26s} {case['params']['mode']:11s} "
+              f"time ~ {case['params']['axis']}^{exponent:.2f}")
+        if (args.max_exponent is not None and exponent is not None
+                and case['params']['mode'] in GATED_MODES and exponent > args.max_exponent):
+            superlinear.append(case)
+
+    status = finish(args, 'analysis_scaling', cases)
+    for case in superlinear:
+        print(f"SUPERLINEAR {case['name']} {case['params']}: exponent "
+              f"{case['metrics']['exponent']:.2f} > {args.max_exponent}")
+    return 1 if superlinear else status
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Shared helpers for the benchmark suites: isolated runs, environment
+metadata, JSON results and regression checks against a saved baseline.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# Metric name -> True if larger values are better
+METRIC_DIRECTIONS = {
+    'triples_per_second': True,
+    'ops_per_second': True,
+    'seconds': False,
+    'peak_rss_mb': False,
+    'p50_ms': False,
+    'p95_ms': False,
+    'p99_ms': False,
+    'exponent': False
+}
+
+DEFAULT_THRESHOLD = 0.10
+
+# Metrics compared by absolute difference, with their default tolerance: a
+# fitted exponent near 0 or 1 makes relative changes meaningless
+ABSOLUTE_TOLERANCES = {
+    'exponent': 0.15
+}
+
+# First simulated day of the graphs built for benchmarks
+START_DATE = datetime(2024, 1, 1)
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, if measurable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+def _measured(func: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    result = func(**kwargs)
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+def run_isolated(func: Callable[..., Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+    """
+    Run one benchmark case in a fresh process.
+
+    A new interpreter per case keeps peak RSS attributable to that case and
+    avoids warm caches leaking between cases.
+
+    Args:
+        func: Module-level function returning a dict of measurements
+        **kwargs: Parameters of the case
+
+    Returns:
+        Dict[str, Any]: The measurements plus 'peak_rss_mb'
+    """
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_measured, func, kwargs).result()
+
+def build_graph(target_triples: int, seed: int = 0,
+                travel_probability: float = 0.3) -> Tuple[Any, List[str]]:
+    """
+    Simulate persons of up to a year each into one graph until it holds
+    target_triples triples.
+
+    Args:
+        target_triples: Minimum number of triples in the graph
+        seed: Seed of the random module
+        travel_probability: Daily travel probability of every person
+
+    Returns:
+        Tuple of the GraphManager and the simulated person ids
+    """
+    from src.core.graph_manager import GraphManager
+    from src.core.personal_data_simulator import PersonalDataKnowledgeSimulator
+
+    random.seed(seed)
+    gm = GraphManager()
+    person_ids = []
+    while len(gm.graph) < target_triples:
+        person_id = f"person{len(person_ids)}"
+        person_ids.append(person_id)
+        simulator = PersonalDataKnowledgeSimulator(person_id, START_DATE, graph_manager=gm)
+        simulator.travel_probability = travel_probability
+        for _ in range(365):
+            simulator.simulate_day()
+            if len(gm.graph) >= target_triples:
+                break
+    return gm, person_ids
+
+def percentiles_ms(latencies: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of latencies given in seconds, in milliseconds."""
+    import numpy as np
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000.0, [50, 95, 99])
+    return {'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+def fit_exponent(sizes: List[float], values: List[float]) -> Optional[float]:
+    """
+    Empirical complexity exponent k of values ~ sizes**k.
+
+    Fits a line to log(values) over log(sizes); needs at least two distinct
+    positive sizes.
+    """
+    import numpy as np
+    points = [(x, y) for x, y in zip(sizes, values) if x and y and x > 0 and y > 0]
+    if len({x for x, _ in points}) < 2:
+        return None
+    x, y = np.log([p[0] for p in points]), np.log([p[1] for p in points])
+    return float(np.polyfit(x, y, 1)[0])
+
+def timed(func: Callable, *args, **kwargs) -> Tuple[float, Any]:
+    """Wall-clock seconds of one call, and its return value."""
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return time.perf_counter() - start, value
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def environment_metadata() -> Dict[str, Any]:
+    """Describe the machine and software versions a run was made with."""
+    versions = {}
+    for module in ('rdflib', 'numpy'):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': _git_commit(),
+        'packages': versions
+    }
+
+def case_key(case: Dict[str, Any]) -> str:
+    """Identify a case by its name and parameters."""
+    return json.dumps({'name': case['name'], 'params': case.get('params', {})}, sort_keys=True)
+
+def write_results(path: str, suite: str, cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Write a suite's results with environment metadata as JSON.
+
+    Args:
+        path: Output file
+        suite: Name of the benchmark suite
+        cases: One dict per case with 'name', 'params' and 'metrics'
+
+    Returns:
+        Dict[str, Any]: The written document
+    """
+    document = {'suite': suite, 'environment': environment_metadata(), 'cases': cases}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, default=str)
+    return document
+
+def compare_to_baseline(cases: List[Dict[str, Any]], baseline_path: str,
+                        thresholds: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    Find metrics that regressed against a saved baseline.
+
+    A metric regresses when it is worse than the baseline by more than its
+    relative threshold, in the direction given by METRIC_DIRECTIONS; metrics
+    in ABSOLUTE_TOLERANCES are compared by absolute difference instead.
+    Metrics of unknown direction and cases missing from the baseline are
+    skipped.
+
+    Args:
+        cases: Current results
+        baseline_path: JSON file written by write_results
+        thresholds: Metric name -> allowed relative change, or absolute
+            difference for ABSOLUTE_TOLERANCES metrics ('default' sets the
+            relative fallback, DEFAULT_THRESHOLD otherwise)
+
+    Returns:
+        List[Dict[str, Any]]: One entry per regression
+    """
+    thresholds = dict(thresholds or {})
+    default = thresholds.pop('default', DEFAULT_THRESHOLD)
+    with open(baseline_path) as f:
+        baseline = {case_key(case): case for case in json.load(f)['cases']}
+
+    regressions = []
+    for case in cases:
+        previous = baseline.get(case_key(case))
+        if previous is None:
+            continue
+        for metric, value in case['metrics'].items():
+            before = previous['metrics'].get(metric)
+            higher_is_better = METRIC_DIRECTIONS.get(metric)
+            if higher_is_better is None or value is None or before is None:
+                continue
+            if metric in ABSOLUTE_TOLERANCES:
+                change = value - before
+                allowed = thresholds.get(metric, ABSOLUTE_TOLERANCES[metric])
+            elif before:
+                change = (value - before) / abs(before)
+                allowed = thresholds.get(metric, default)
+            else:
+                continue
+            if (higher_is_better and change < -allowed) or (not higher_is_better and change > allowed):
+                regressions.append({
+                    'case': case['name'],
+                    'params': case.get('params', {}),
+                    'metric': metric,
+                    'baseline': before,
+                    'current': value,
+                    'change': change
+                })
+    return regressions
+
+def argument_parser(description: str, default_output: str) -> argparse.ArgumentParser:
+    """Command-line options shared by all suites."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--output', default=default_output,
+                        help='JSON file receiving the results')
+    parser.add_argument('--baseline', help='baseline JSON to compare against')
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=FRACTION',
+                        help="allowed relative regression, e.g. triples_per_second=0.05 "
+                             "or default=0.2, or absolute increase for exponents, e.g. "
+                             "exponent=0.1 (repeatable)")
+    parser.add_argument('--quick', action='store_true', help='run a reduced matrix')
+    return parser
+
+def parse_thresholds(values: List[str]) -> Dict[str, float]:
+    """Parse repeated METRIC=FRACTION options."""
+    thresholds = {}
+    for value in values:
+        metric, _, fraction = value.partition('=')
+        if not fraction:
+            raise ValueError(f"Expected METRIC=FRACTION, got {value!r}")
+        thresholds[metric] = float(fraction)
+    return thresholds
+
+def finish(args: argparse.Namespace, suite: str, cases: List[Dict[str, Any]]) -> int:
+    """Write results, report regressions and return the process exit code."""
+    write_results(args.output, suite, cases)
+    print(f"Wrote {len(cases)} results to {args.output}")
+    if not args.baseline:
+        return 0
+    regressions = compare_to_baseline(cases, args.baseline, parse_thresholds(args.threshold))
+    for r in regressions:
+        print(f"REGRESSION {r['case']} {r['params']}: {r['metric']} "
+              f"{r['baseline']:.4g} -> {r['current']:.4g} ({r['change']:+.1%})")
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
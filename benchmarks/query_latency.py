@@ -0,0 +1,188 @@
+"""
+Query latency benchmarks: p50/p95/p99 of QueryManager and GraphManager
+queries on simulated graphs of increasing size, cold and warm, at several
+concurrency levels, with scaling exponents over graph size.
+
+Run from the repository root:
+
+    python -m benchmarks.query_latency --quick
+    python -m benchmarks.query_latency --sizes 1000 10000 100000 1000000 10000000 --concurrency 1 8
+"""
+
+import contextlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.harness import (argument_parser, build_graph, finish, fit_exponent,
+                                percentiles_ms, run_isolated)
+
+WINDOW = (datetime(2024, 2, 1), datetime(2024, 3, 1))
+
+PREFIXES = """
+    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+    PREFIX person: <http://example.org/personal/person/>
+    PREFIX health: <http://example.org/personal/health/>
+    PREFIX travel: <http://example.org/personal/travel/>
+"""
+
+# Representative query_graph shapes; {person} is replaced by a person URI
+SPARQL_SHAPES = {
+    'sparql_point_lookup': """
+        SELECT ?p ?o WHERE { <{person}> ?p ?o }
+    """,
+    'sparql_type_scan': """
+        SELECT ?s WHERE { ?s rdf:type health:VitalSigns }
+    """,
+    'sparql_person_join_top10': """
+        SELECT ?record ?date WHERE {
+            <{person}> person:hasHealthData ?record .
+            ?record health:timestamp ?date .
+        } ORDER BY DESC(?date) LIMIT 10
+    """,
+    'sparql_group_count': """
+        SELECT ?type (COUNT(?s) AS ?n) WHERE { ?s rdf:type ?type } GROUP BY ?type
+    """
+}
+
+def _queries(gm, person_uri: str) -> Dict[str, Callable[[], Any]]:
+    from src.core.query_manager import QueryManager
+
+    query_manager = QueryManager(gm.graph)
+    queries = {
+        'get_health_data': lambda: query_manager.get_health_data(*WINDOW, person_uri),
+        'get_travel_data': lambda: query_manager.get_travel_data(*WINDOW, person_uri),
+        'get_combined_timeline': lambda: query_manager.get_combined_timeline(*WINDOW, person_uri)
+    }
+    for name, shape in SPARQL_SHAPES.items():
+        sparql = PREFIXES + shape.replace('{person}', person_uri)
+        queries[name] = lambda sparql=sparql: gm.query_graph(sparql)
+    return queries
+
+def _run(query: Callable[[], Any]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    rows = query()
+    return time.perf_counter() - start, len(rows)
+
+def bench_queries(triples: int, concurrency: List[int], repeats: int,
+                  seed: int = 0) -> Dict[str, Any]:
+    """
+    Build one graph and time every query on it.
+
+    The first execution of each query in the process is reported as cold;
+    repeats per concurrency level are reported as warm, with that many
+    threads issuing queries at once.
+    """
+    gm, person_ids = build_graph(triples, seed)
+    person_uri = f"http://example.org/personal/person/person_{person_ids[0]}"
+    results = []
+
+    # QueryManager prints every row it finds
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        queries = _queries(gm, person_uri)
+        for name, query in queries.items():
+            latency, rows = _run(query)
+            results.append({'query': name, 'cache': 'cold', 'concurrency': 1,
+                            'latencies': [latency], 'rows': rows})
+
+        for level in (concurrency if repeats else []):
+            for name, query in queries.items():
+                with ThreadPoolExecutor(max_workers=level) as executor:
+                    timings = list(executor.map(lambda _: _run(query), range(repeats * level)))
+                results.append({'query': name, 'cache': 'warm', 'concurrency': level,
+                                'latencies': [t for t, _ in timings], 'rows': timings[-1][1]})
+
+    return {'triples': len(gm.graph), 'persons': len(person_ids), 'results': results}
+
+def main(argv=None) -> int:
+    parser = argument_parser(__doc__.strip().splitlines()[0],
+                             os.path.join('data', 'benchmarks', 'query_latency.json'))
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        help='target graph sizes in triples (default 10^3..10^6)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4],
+                        help='numbers of concurrent querying threads')
+    parser.add_argument('--repeats', type=int, default=20,
+                        help='warm executions per query and thread')
+    parser.add_argument('--cold-runs', type=int, default=1,
+                        help='fresh processes per size, each contributing one cold sample')
+    parser.add_argument('--plot', help='save scaling curves (p50 against graph size) to this image')
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or ([1000, 10000] if args.quick else [1000, 10000, 100000, 1000000])
+    repeats = 5 if args.quick else args.repeats
+
+    samples = {}  # (query, cache, concurrency) -> size -> {'latencies', 'rows', 'triples'}
+    for size in sizes:
+        for run in range(args.cold_runs):
+            measured = run_isolated(bench_queries, triples=size, concurrency=args.concurrency,
+                                    repeats=repeats if run == 0 else 0)
+            for r in measured['results']:
+                if not r['latencies']:
+                    continue
+                entry = samples.setdefault((r['query'], r['cache'], r['concurrency']), {}).setdefault(
+                    size, {'latencies': [], 'rows': r['rows'], 'triples': measured['triples']})
+                entry['latencies'].extend(r['latencies'])
+
+    cases = []
+    for (query, cache, level), by_size in samples.items():
+        curve_sizes, curve_p50, curve_rows = [], [], []
+        for size, entry in sorted(by_size.items()):
+            metrics = percentiles_ms(entry['latencies'])
+            metrics['rows'] = entry['rows']
+            cases.append({'name': query,
+                          'params': {'triples': size, 'cache': cache, 'concurrency': level},
+                          'metrics': metrics})
+            curve_sizes.append(entry['triples'])
+            curve_p50.append(metrics['p50_ms'])
+            curve_rows.append(entry['rows'])
+            print(f"{query:26s} {cache:4s} c={level:<3d} triples={entry['triples']:<9d} "
+                  f"rows={entry['rows']:<7d} p50={metrics['p50_ms']:9.2f}ms "
+                  f"p95={metrics['p95_ms']:9.2f}ms p99={metrics['p99_ms']:9.2f}ms")
+
+        # Latency growth with graph size versus growth of the result itself
+        cases.append({'name': f"{query}_scaling",
+                      'params': {'cache': cache, 'concurrency': level},
+                      'metrics': {'exponent': fit_exponent(curve_sizes, curve_p50),
+                                  'rows_exponent': fit_exponent(curve_sizes, curve_rows),
+                                  'sizes': curve_sizes}})
+
+    for case in cases:
+        if case['name'].endswith('_scaling'):
+            m = case['metrics']
+            exponent = m['exponent'] if m['exponent'] is not None else float('nan')
+            rows_exponent = m['rows_exponent'] if m['rows_exponent'] is not None else float('nan')
+            print(f"{case['name']:34s} {case['params']['cache']:4s} c={case['params']['concurrency']:<3d} "
+                  f"latency ~ n^{exponent:.2f}, result rows ~ n^{rows_exponent:.2f}")
+
+    if args.plot:
+        _plot(samples, args.plot)
+    return finish(args, 'query_latency', cases)
+
+def _plot(samples: Dict, path: str) -> None:
+    """Plot warm p50 latency at the lowest concurrency against graph size."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    for (query, cache, level), by_size in sorted(samples.items()):
+        if cache != 'warm' or level != min(l for _, c, l in samples if c == 'warm'):
+            continue
+        points = sorted((e['triples'], percentiles_ms(e['latencies'])['p50_ms'])
+                        for e in by_size.values())
+        plt.plot([p[0] for p in points], [p[1] for p in points], marker='o', label=query)
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.xlabel('Triples in graph')
+    plt.ylabel('p50 latency (ms)')
+    plt.title('Query latency scaling')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(path, dpi=150)
+
+if __name__ == '__main__':
+    sys.exit(main())
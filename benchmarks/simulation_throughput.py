@@ -0,0 +1,145 @@
+"""
+Simulation throughput benchmarks: triples per second and peak RSS of the
+simulators and builders over a persons x days matrix.
+
+Run from the repository root:
+
+    python -m benchmarks.simulation_throughput --quick
+    python -m benchmarks.simulation_throughput --baseline data/benchmarks/simulation_baseline.json
+"""
+
+import os
+import random
+import sys
+from datetime import datetime
+from itertools import product
+from typing import Any, Dict, List
+
+from benchmarks.harness import argument_parser, finish, run_isolated, timed
+
+START_DATE = datetime(2024, 1, 1)
+CUSTOM_ONTOLOGY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               '..', 'data', 'custom_ontology.owl')
+
+def _rate(triples: int, seconds: float) -> Dict[str, Any]:
+    return {
+        'seconds': seconds,
+        'triples': triples,
+        'triples_per_second': triples / seconds if seconds > 0 else None
+    }
+
+def bench_simulate_period(persons: int, days: int, seed: int = 0) -> Dict[str, Any]:
+    """PersonalDataKnowledgeSimulator.simulate_period for several persons in one graph."""
+    from src.core.graph_manager import GraphManager
+    from src.core.personal_data_simulator import PersonalDataKnowledgeSimulator
+
+    random.seed(seed)
+    gm = GraphManager()
+    simulators = [PersonalDataKnowledgeSimulator(f"person{i}", START_DATE, graph_manager=gm)
+                  for i in range(persons)]
+    initial = len(gm.graph)
+    seconds = 0.0
+    for simulator in simulators:
+        elapsed, _ = timed(simulator.simulate_period, days)
+        seconds += elapsed
+    return _rate(len(gm.graph) - initial, seconds)
+
+def _records(persons: int, days: int, seed: int, kind: str) -> List[List[Dict[str, Any]]]:
+    """Pre-generate records so only graph construction is timed."""
+    from src.utils.data_simulator import PersonalDataSimulator
+
+    random.seed(seed)
+    records = []
+    for _ in range(persons):
+        data_simulator = PersonalDataSimulator(START_DATE)
+        person_records = []
+        for _ in range(days):
+            if kind == 'health':
+                person_records.append(data_simulator.generate_daily_health_data())
+            else:
+                person_records.append(data_simulator.generate_travel_booking())
+            data_simulator.advance_day()
+        records.append(person_records)
+    return records
+
+def bench_add_health_data(persons: int, days: int, seed: int = 0) -> Dict[str, Any]:
+    """PersonalOntologyBuilder.add_health_data for one record per person and day."""
+    from src.core.personal_ontology_builder import PersonalOntologyBuilder
+
+    records = _records(persons, days, seed, 'health')
+    builder = PersonalOntologyBuilder()
+    graph = builder.get_graph_manager().graph
+    initial = len(graph)
+
+    def build():
+        for i, person_records in enumerate(records):
+            for record in person_records:
+                builder.add_health_data(record, f"person{i}")
+
+    seconds, _ = timed(build)
+    return _rate(len(graph) - initial, seconds)
+
+def bench_add_travel_booking(persons: int, days: int, seed: int = 0) -> Dict[str, Any]:
+    """PersonalOntologyBuilder.add_travel_booking for one booking per person and day."""
+    from src.core.personal_ontology_builder import PersonalOntologyBuilder
+
+    records = _records(persons, days, seed, 'travel')
+    builder = PersonalOntologyBuilder()
+    graph = builder.get_graph_manager().graph
+    initial = len(graph)
+
+    def build():
+        for i, person_records in enumerate(records):
+            for record in person_records:
+                builder.add_travel_booking(record, f"person{i}")
+
+    seconds, _ = timed(build)
+    return _rate(len(graph) - initial, seconds)
+
+def bench_ontology_simulate_data(persons: int, days: int, seed: int = 0) -> Dict[str, Any]:
+    """OntologyBasedSimulator.simulate_data with one instance per person and day."""
+    from rdflib import URIRef
+    from src.core.ontology_simulator import OntologyBasedSimulator
+
+    random.seed(seed)
+    simulator = OntologyBasedSimulator(custom_ontology_path=CUSTOM_ONTOLOGY, use_cache=False)
+    simulator.analyze_ontology()
+    graph = simulator.ontology_builder.get_graph_manager().graph
+    initial = len(graph)
+    seconds, _ = timed(simulator.simulate_data, URIRef("http://example.org/custom/Person"),
+                       persons * days)
+    return _rate(len(graph) - initial, seconds)
+
+BENCHMARKS = {
+    'simulate_period': bench_simulate_period,
+    'add_health_data': bench_add_health_data,
+    'add_travel_booking': bench_add_travel_booking,
+    'ontology_simulate_data': bench_ontology_simulate_data
+}
+
+def main(argv=None) -> int:
+    parser = argument_parser(__doc__.strip().splitlines()[0],
+                             os.path.join('data', 'benchmarks', 'simulation_throughput.json'))
+    parser.add_argument('--persons', type=int, nargs='+', help='persons axis of the matrix')
+    parser.add_argument('--days', type=int, nargs='+', help='days axis of the matrix')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS),
+                        help='benchmarks to run (default: all)')
+    args = parser.parse_args(argv)
+
+    persons_axis = args.persons or ([1, 5] if args.quick else [1, 10, 50])
+    days_axis = args.days or ([30] if args.quick else [30, 365])
+
+    cases = []
+    for name in args.only or BENCHMARKS:
+        for persons, days in product(persons_axis, days_axis):
+            metrics = run_isolated(BENCHMARKS[name], persons=persons, days=days)
+            cases.append({'name': name, 'params': {'persons': persons, 'days': days},
+                          'metrics': metrics})
+            rate = metrics['triples_per_second'] or 0
+            print(f"{name:24s} persons={persons:<4d} days={days:<4d} "
+                  f"{metrics['triples']:>9d} triples {rate:>12,.0f} triples/s "
+                  f"peak {metrics['peak_rss_mb'] or 0:.0f} MiB")
+    return finish(args, 'simulation_throughput', cases)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,11 +6,15 @@ setup(
     packages=find_packages(),
     install_requires=[
         'rdflib>=6.3.2',
+        'numpy>=1.24.0',
         'SPARQLWrapper>=2.0.0',
         'pandas>=2.0.0',
         'networkx>=3.0',
         'matplotlib>=3.7.0',
         'tqdm>=4.65.0',
         'pytest>=7.3.1'
-    ]
+    ],
+    extras_require={
+        'parquet': ['pyarrow>=12.0.0']
+    }
 ) 
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Vectorized window aggregation of persons x days metric arrays.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
+from ..utils.profiling import profiled
+
+def window_starts(num_days: int, window: Union[int, str] = 'week',
+                  start_date: Optional[datetime] = None) -> np.ndarray:
+    """
+    Day indices at which aggregation windows start.
+
+    Fixed windows are counted from the first day, so the last window may be
+    shorter (a ragged trailing week); calendar months need start_date.
+
+    Args:
+        num_days: Number of days covered by the data
+        window: Window length in days, 'week' (7 days) or 'month' (calendar months)
+        start_date: Date of day 0, required for 'month'
+
+    Returns:
+        np.ndarray: Sorted start indices, beginning with 0
+    """
+    if num_days <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if window == 'week':
+        window = 7
+    if window == 'month':
+        if start_date is None:
+            raise ValueError("Monthly windows need the start date of the data")
+        days = np.datetime64(start_date.date(), 'D') + np.arange(num_days)
+        months = days.astype('datetime64[M]')
+        return np.concatenate(([0], np.flatnonzero(months[1:] != months[:-1]) + 1))
+    if not isinstance(window, (int, np.integer)) or window < 1:
+        raise ValueError(f"Unsupported window: {window}")
+    return np.arange(0, num_days, window, dtype=np.int64)
+
+def aggregate_windows(values: np.ndarray, starts: np.ndarray,
+                      percentiles: Sequence[float] = (),
+                      chunk_size: int = 10000) -> Dict[str, np.ndarray]:
+    """
+    Aggregate a persons x days array over day windows.
+
+    Means and (population) standard deviations use np.add.reduceat over the
+    window starts, so every window of every person is reduced in one call.
+    Percentiles gather the windows into a NaN-padded persons x windows x
+    length block, sort it once and interpolate like np.percentile; blocks
+    are processed in chunks of persons to bound memory. Missing days may
+    be NaN and are ignored.
+
+    Args:
+        values: Array of shape (persons, days)
+        starts: Window start indices as returned by window_starts
+        percentiles: Percentiles (0-100) to compute per window
+        chunk_size: Persons per block when computing percentiles
+
+    Returns:
+        Dict with 'count', 'mean' and 'std' arrays of shape (persons, windows)
+        and one 'p<q>' array per requested percentile
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2:
+        raise ValueError("Expected an array of shape (persons, days)")
+    num_days = values.shape[1]
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.diff(np.append(starts, num_days))
+
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    count = np.add.reduceat(present, starts, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.add.reduceat(filled, starts, axis=1) / count
+        # Second pass on deviations from each window's own mean
+        deviation = np.where(present, values - np.repeat(mean, lengths, axis=1), 0.0)
+        std = np.sqrt(np.add.reduceat(deviation ** 2, starts, axis=1) / count)
+
+    result = {'count': count, 'mean': mean, 'std': std}
+    if percentiles:
+        width = int(lengths.max())
+        positions = starts[:, None] + np.arange(width)[None, :]
+        padding = positions >= (starts + lengths)[:, None]
+        positions = np.minimum(positions, num_days - 1)
+
+        blocks = {q: [] for q in percentiles}
+        for first in range(0, values.shape[0], chunk_size):
+            block = values[first:first + chunk_size][:, positions]
+            block[:, padding] = np.nan
+            # NaNs sort last, so each window's observations are a sorted prefix
+            block.sort(axis=-1)
+            observed = count[first:first + chunk_size]
+            for q in percentiles:
+                blocks[q].append(_sorted_percentile(block, observed, q))
+        for q in percentiles:
+            result[f"p{q:g}"] = np.concatenate(blocks[q], axis=0)
+    return result
+
+def _sorted_percentile(block: np.ndarray, observed: np.ndarray, q: float) -> np.ndarray:
+    """Linearly interpolated percentile of sorted, NaN-padded windows."""
+    position = q / 100.0 * np.maximum(observed - 1, 0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(observed - 1, 0))
+    low = np.take_along_axis(block, lower[..., None], axis=-1)[..., 0]
+    high = np.take_along_axis(block, upper[..., None], axis=-1)[..., 0]
+    return np.where(observed > 0, low + (high - low) * (position - lower), np.nan)
+
+@profiled('analysis')
+def aggregate_metrics(metrics: Dict[str, np.ndarray], window: Union[int, str] = 'week',
+                      start_date: Optional[datetime] = None,
+                      percentiles: Sequence[float] = ()) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Aggregate every metric of a population over the same day windows.
+
+    Accepts the persons x days arrays produced by
+    PersonalDataSimulator.generate_health_arrays or extracted from a graph.
+
+    Args:
+        metrics: Metric name -> array of shape (persons, days)
+        window: Window length in days, 'week' or 'month'
+        start_date: Date of day 0, required for 'month'
+        percentiles: Percentiles (0-100) to compute per window
+
+    Returns:
+        Dict mapping each metric to its aggregate arrays (see
+        aggregate_windows), plus 'windows' with the 'start' day index and
+        'length' of every window
+    """
+    if not metrics:
+        return {}
+    num_days = next(iter(metrics.values())).shape[1]
+    starts = window_starts(num_days, window, start_date)
+    result = {name: aggregate_windows(values, starts, percentiles)
+              for name, values in metrics.items()}
+    result['windows'] = {'start': starts, 'length': np.diff(np.append(starts, num_days))}
+    return result
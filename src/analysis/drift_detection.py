@@ -0,0 +1,239 @@
+"""
+Online drift detection over streaming health metrics.
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+import numpy as np
+from ..utils.profiling import profiled
+
+class OnlineDriftDetector:
+    def __init__(self, metrics: Sequence[str],
+                 alpha: float = 0.3,
+                 z_threshold: float = 2.0,
+                 trend_window: int = 3,
+                 threshold: Optional[float] = None,
+                 baseline_size: int = 3):
+        """
+        Detect drift in per-person metric streams, one observation at a time.
+
+        Every (person, metric) stream keeps an exponentially weighted mean and
+        variance, the previous value, a signed run length of consecutive
+        increases or decreases, and Welford statistics of its relative changes
+        during a baseline period. An observation is flagged when, once the
+        baseline is complete,
+        - its relative change from the previous value exceeds the threshold,
+        - it lies more than z_threshold standard deviations from the
+          exponentially weighted mean, or
+        - it extends a monotonic run of at least trend_window steps with a
+          relative change above half the threshold.
+        Updates cost O(1) per observation; update() applies one observation
+        for many persons at once with vectorized NumPy operations.
+
+        Args:
+            metrics: Names of the metrics tracked for every person
+            alpha: Smoothing factor of the exponentially weighted statistics
+            z_threshold: Deviation from the weighted mean, in standard
+                deviations, that counts as drift
+            trend_window: Run length of same-direction changes that counts
+                as a trend
+            threshold: Fixed relative-change threshold; if omitted, each
+                stream uses mean + 2 * std of its baseline relative changes
+            baseline_size: Number of relative changes forming the baseline
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.metrics = list(metrics)
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.trend_window = trend_window
+        self.threshold = threshold
+        self.baseline_size = baseline_size
+
+        self.persons = []
+        self._person_index = {}
+        self._metric_index = {m: i for i, m in enumerate(self.metrics)}
+        self._allocate(0)
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)allocate the per-stream state arrays, keeping existing rows."""
+        shape = (capacity, len(self.metrics))
+        fields = {
+            'count': np.int64, 'last': float, 'mean': float, 'var': float,
+            'run': np.int64, 'base_n': np.int64, 'base_mean': float,
+            'base_m2': float, 'alarms': np.int64
+        }
+        old = getattr(self, '_state', None)
+        self._state = {name: np.zeros(shape, dtype=dtype) for name, dtype in fields.items()}
+        if old is not None:
+            rows = len(self.persons)
+            for name, values in old.items():
+                self._state[name][:rows] = values[:rows]
+
+    def add_person(self, person_id: Hashable) -> int:
+        """
+        Register a person, returning its row in the state arrays.
+
+        Args:
+            person_id: Identifier of the person
+
+        Returns:
+            int: Row index of the person
+        """
+        index = self._person_index.get(person_id)
+        if index is not None:
+            return index
+        index = len(self.persons)
+        capacity = len(self._state['count'])
+        if index >= capacity:
+            self._allocate(max(16, capacity * 2))
+        self.persons.append(person_id)
+        self._person_index[person_id] = index
+        return index
+
+    def add_persons(self, person_ids: Iterable[Hashable]) -> List[int]:
+        """Register several persons, returning their row indexes."""
+        return [self.add_person(p) for p in person_ids]
+
+    @profiled('analysis')
+    def observe(self, person_id: Hashable, metric: str, value: float) -> bool:
+        """
+        Feed one observation of one metric for one person.
+
+        Args:
+            person_id: Identifier of the person (registered on first use)
+            metric: Name of the metric
+            value: Observed value
+
+        Returns:
+            bool: Whether the observation is flagged as drift
+        """
+        row = np.array([self.add_person(person_id)])
+        col = np.array([self._metric_index[metric]])
+        return bool(self._step(row, col, np.array([value], dtype=float))[0])
+
+    @profiled('analysis')
+    def update(self, values: np.ndarray,
+               person_ids: Optional[Sequence[Hashable]] = None) -> np.ndarray:
+        """
+        Feed one observation of every metric for many persons at once.
+
+        Args:
+            values: Array of shape (persons, metrics); NaN marks a missing
+                observation, which leaves its stream untouched
+            person_ids: Persons of the rows of values (defaults to all
+                registered persons, in registration order)
+
+        Returns:
+            np.ndarray: Boolean array of the same shape, True where drift is flagged
+        """
+        values = np.asarray(values, dtype=float)
+        if person_ids is None:
+            rows = np.arange(len(self.persons))
+        else:
+            rows = np.array(self.add_persons(person_ids), dtype=np.int64)
+        if values.shape != (len(rows), len(self.metrics)):
+            raise ValueError(f"Expected values of shape {(len(rows), len(self.metrics))}, "
+                             f"got {values.shape}")
+
+        row_index = np.repeat(rows, len(self.metrics))
+        col_index = np.tile(np.arange(len(self.metrics)), len(rows))
+        flags = self._step(row_index, col_index, values.ravel())
+        return flags.reshape(values.shape)
+
+    def _step(self, rows: np.ndarray, cols: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """Apply one observation to each selected stream; returns drift flags."""
+        flags = np.zeros(len(x), dtype=bool)
+        present = ~np.isnan(x)
+        rows, cols, x = rows[present], cols[present], x[present]
+        if not len(x):
+            return flags
+        st = self._state
+        key = (rows, cols)
+
+        count = st['count'][key]
+        prev = st['last'][key]
+        mean = st['mean'][key]
+        var = st['var'][key]
+        run = st['run'][key]
+        has_prev = count > 0
+
+        # Relative change from the previous observation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where(has_prev & (prev != 0), np.abs(x - prev) / np.abs(prev), 0.0)
+
+        # Signed run of same-direction changes
+        direction = np.sign(x - prev) * has_prev
+        run = np.where(direction > 0, np.where(run > 0, run + 1, 1),
+                       np.where(direction < 0, np.where(run < 0, run - 1, -1), 0))
+
+        base_n = st['base_n'][key]
+        ready = base_n >= self.baseline_size
+        if self.threshold is not None:
+            threshold = np.full(len(x), float(self.threshold))
+        else:
+            base_std = np.sqrt(st['base_m2'][key] / np.maximum(base_n, 1))
+            threshold = st['base_mean'][key] + 2 * base_std
+
+        deviation = np.abs(x - mean) > self.z_threshold * np.sqrt(var)
+        trend = (np.abs(run) >= self.trend_window) & (change > threshold / 2)
+        drift = ready & has_prev & ((change > threshold) | deviation | trend)
+
+        # Welford update of the baseline relative changes
+        grow = has_prev & ~ready
+        n_new = base_n + grow
+        delta = change - st['base_mean'][key]
+        base_mean = st['base_mean'][key] + np.where(grow, delta / np.maximum(n_new, 1), 0.0)
+        st['base_m2'][key] += np.where(grow, delta * (change - base_mean), 0.0)
+        st['base_mean'][key] = base_mean
+        st['base_n'][key] = n_new
+
+        # Exponentially weighted mean and variance
+        diff = x - mean
+        increment = self.alpha * diff
+        st['mean'][key] = np.where(has_prev, mean + increment, x)
+        st['var'][key] = np.where(has_prev, (1 - self.alpha) * (var + diff * increment), 0.0)
+
+        st['count'][key] = count + 1
+        st['last'][key] = x
+        st['run'][key] = run
+        st['alarms'][key] += drift
+
+        flags[present] = drift
+        return flags
+
+    def statistics(self, metric: str) -> Dict[str, np.ndarray]:
+        """
+        Current per-person state of one metric.
+
+        Args:
+            metric: Name of the metric
+
+        Returns:
+            Dict with 'mean', 'std', 'run', 'count' and 'alarms' arrays,
+            indexed like self.persons
+        """
+        col = self._metric_index[metric]
+        rows = len(self.persons)
+        st = self._state
+        return {
+            'mean': st['mean'][:rows, col].copy(),
+            'std': np.sqrt(st['var'][:rows, col]),
+            'run': st['run'][:rows, col].copy(),
+            'count': st['count'][:rows, col].copy(),
+            'alarms': st['alarms'][:rows, col].copy()
+        }
+
+    def reset(self, person_id: Optional[Hashable] = None) -> None:
+        """
+        Forget the state of one person, or of everyone.
+
+        Args:
+            person_id: Person to reset (all persons if omitted)
+        """
+        if person_id is None:
+            for values in self._state.values():
+                values[...] = 0
+            return
+        row = self._person_index[person_id]
+        for values in self._state.values():
+            values[row] = 0
@@ -3,22 +3,241 @@ Module for analyzing information gain in knowledge graphs.
 """
 
 import numpy as np
-from rdflib import Graph, URIRef
-from typing import Dict, List, Tuple
+import os
+from multiprocessing import Pool, shared_memory
+from rdflib import Graph, URIRef, Literal
+from rdflib.namespace import RDF, RDFS, OWL
+from rdflib.term import Node
+from typing import Dict, List, Optional, Set, Tuple, Iterable, Union
 import matplotlib.pyplot as plt
 from collections import defaultdict
+from itertools import repeat
 import math
+from ..core.graph_manager import GraphManager
+from ..core.sharded_graph_manager import ShardedGraphManager
+from ..utils.profiling import profiled
+
+def _xlogx(count: int) -> float:
+    """count * log2(count), with 0 for a zero count."""
+    return count * math.log2(count) if count > 0 else 0.0
+
+# Nodes typed with these are ontology terms, not data in any category
+SCHEMA_TYPES = (OWL.Class, RDFS.Class, OWL.ObjectProperty, OWL.DatatypeProperty, RDF.Property)
+
+# Arrays of the shared CSR incidence representation, attached once per worker
+_shared_arrays = {}
+_shared_blocks = []
+
+def _attach_shared(specs: Dict[str, Tuple[str, Tuple[int, ...], str]]) -> None:
+    """Pool initializer: map the parent's shared-memory arrays read-only."""
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        _shared_blocks.append(block)
+        _shared_arrays[key] = array
+
+def _shared_chunk_sums(bounds: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    return _chunk_sums(_shared_arrays, bounds)
+
+def _chunk_sums(arrays: Dict[str, np.ndarray], bounds: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Entropy sums and node counts per category for a slice of the candidates.
+    
+    Args:
+        arrays: CSR incidence arrays ('indptr', 'predicates') and the
+            candidate arrays ('nodes', 'categories'), plus 'sizes' holding
+            the number of predicates and categories
+        bounds: (start, end) slice of the candidate arrays
+        
+    Returns:
+        Tuple of per-category entropy sums and node counts
+    """
+    start, end = bounds
+    num_predicates, num_categories = (int(v) for v in arrays['sizes'])
+    nodes = arrays['nodes'][start:end]
+    categories = arrays['categories'][start:end]
+    indptr = arrays['indptr']
+    
+    # Gather every candidate's predicate list from the CSR arrays
+    first = indptr[nodes]
+    lengths = indptr[nodes + 1] - first
+    local = np.repeat(np.arange(len(nodes), dtype=np.int64), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    positions = np.arange(lengths.sum(), dtype=np.int64) - np.repeat(offsets - first, lengths)
+    pairs = local * num_predicates + arrays['predicates'][positions]
+    
+    pairs, counts = np.unique(pairs, return_counts=True)
+    owners = pairs // num_predicates
+    counts = counts.astype(float)
+    totals = np.bincount(owners, weights=counts, minlength=len(nodes))
+    sums = np.bincount(owners, weights=counts * np.log2(counts), minlength=len(nodes))
+    entropy = InformationGainAnalyzer._entropy_vector(totals, sums)
+    
+    present = (totals > 0).astype(float)
+    return (np.bincount(categories, weights=entropy, minlength=num_categories),
+            np.bincount(categories, weights=present, minlength=num_categories))
 
 class InformationGainAnalyzer:
-    def __init__(self, graph: Graph):
+    # Node categories, as namespaces of PersonalOntologyBuilder under the base URI
+    CATEGORIES = ('health', 'travel', 'location')
+    
+    def __init__(self, graph: Union[Graph, GraphManager],
+                 base_uri: str = "http://example.org/personal/"):
         """
         Initialize the analyzer with a knowledge graph.
         
+        When given a GraphManager, the analyzer registers itself as a listener
+        and keeps per-node predicate counts up to date as triples are added
+        or removed. Each node also carries a running sum of c*log2(c) over its
+        predicate counts c, so its entropy log2(N) - sum/N is available in
+        O(1) and every changed triple costs O(1) to apply. The categories of
+        the nodes touched by a change are re-evaluated as well, keeping a
+        category -> nodes index for select_nodes. A plain Graph cannot report
+        changes, so entropies and categories are then found by scanning.
+        A ShardedGraphManager is rejected, as its triples live in the shard
+        processes; analyze its to_graph() instead.
+        
         Args:
-            graph: RDFLib Graph to analyze
+            graph: RDFLib Graph or GraphManager to analyze
+            base_uri: Base URI under which the category namespaces live
         """
-        self.graph = graph
+        if isinstance(graph, ShardedGraphManager):
+            raise ValueError("Cannot analyze a sharded graph incrementally; "
+                             "pass its to_graph() instead")
+        self.gm = graph if isinstance(graph, GraphManager) else None
+        self.graph = self.gm.graph if self.gm is not None else graph
+        self.category_namespaces = {c: f"{base_uri}{c}/" for c in self.CATEGORIES}
+        
+        # node -> [predicate counts, total incident triples, sum of c*log2(c)]
+        self._node_stats = {}
+        
+        # node -> categories it belongs to, and category -> nodes; maintained
+        # from changes with a GraphManager, built by the first delta call
+        # on a plain Graph
+        self._node_categories = {}
+        self._category_nodes = {c: set() for c in self.CATEGORIES}
+        
+        # Per-category [entropy sum, node count] once
+        # calculate_information_gain_delta has been used, and, with a
+        # GraphManager, the (entropy, categories) of every node touched since
+        # the previous call as they were at that call
+        self._category_totals = None
+        self._pending_before = {}
+        
+        if self.gm is not None:
+            self._count(self.graph, 1)
+            self._build_category_index()
+            self.gm.add_listener(self)
+            
+    @property
+    def incremental(self) -> bool:
+        """Whether entropies are maintained from GraphManager changes."""
+        return self.gm is not None
+        
+    def detach(self) -> None:
+        """Stop tracking changes; entropies are computed by scanning afterwards."""
+        if self.gm is not None:
+            self.gm.remove_listener(self)
+            self.gm = None
+            self._node_stats = {}
+            self._category_totals = None
+            self._node_categories = {}
+            self._category_nodes = {c: set() for c in self.CATEGORIES}
+            self._pending_before = {}
+            
+    @profiled('analysis')
+    def on_add(self, triples: List[Tuple[Node, Node, Node]]) -> None:
+        """Count newly added triples for their subject and (non-literal) object."""
+        self._apply(triples, 1)
+            
+    @profiled('analysis')
+    def on_remove(self, triples: List[Tuple[Node, Node, Node]]) -> None:
+        """Uncount removed triples."""
+        self._apply(triples, -1)
+        
+    def _apply(self, triples: List[Tuple[Node, Node, Node]], delta: int) -> None:
+        """Apply a change reported by the manager to statistics and categories."""
+        touched = set()
+        for s, _, o in triples:
+            touched.add(s)
+            if not isinstance(o, Literal):
+                touched.add(o)
+        if self._category_totals is not None:
+            # Remember how the node was counted in the totals before its
+            # first change since the previous delta call
+            for node in touched:
+                if node not in self._pending_before:
+                    self._pending_before[node] = (self._stats_entropy(node),
+                                                  self._node_categories.get(node, ()))
+        self._count(triples, delta)
+        for node in touched:
+            self._index_node(node)
+            
+    def _build_category_index(self) -> None:
+        """Assign every node with statistics to its categories by scanning once."""
+        namespaces = list(self.category_namespaces.items())
+        self._category_nodes = self._select(namespaces, self.graph, list(self._node_stats))
+        node_categories = defaultdict(list)
+        for category, nodes in self._category_nodes.items():
+            for node in nodes:
+                node_categories[node].append(category)
+        self._node_categories = dict(node_categories)
+        
+    def _index_node(self, node: Node) -> None:
+        """Re-evaluate the categories of one node after a change."""
+        categories = self._categories_of(node) if node in self._node_stats else []
+        old = self._node_categories.get(node, ())
+        if categories == list(old):
+            return
+        for category in old:
+            self._category_nodes[category].discard(node)
+        for category in categories:
+            self._category_nodes[category].add(node)
+        if categories:
+            self._node_categories[node] = categories
+        else:
+            self._node_categories.pop(node, None)
+            
+    def _count(self, triples: Iterable[Tuple[Node, Node, Node]], delta: int) -> None:
+        """Apply a count change for every triple's subject and (non-literal) object."""
+        update = self._update
+        for s, p, o in triples:
+            update(s, p, delta)
+            if not isinstance(o, Literal):
+                update(o, p, delta)
+                
+    def _update(self, node: Node, predicate: Node, delta: int) -> None:
+        """Apply a count change for one (node, predicate) pair in O(1)."""
+        stats = self._node_stats.get(node)
+        if stats is None:
+            stats = self._node_stats[node] = [{}, 0, 0.0]
+        counts = stats[0]
+        old = counts.get(predicate, 0)
+        new = old + delta
+        if new > 0:
+            counts[predicate] = new
+        else:
+            counts.pop(predicate, None)
+        stats[1] += delta
+        stats[2] += _xlogx(new) - _xlogx(old)
+        if not counts:
+            del self._node_stats[node]
+            
+    @staticmethod
+    def _entropy(total: int, sum_xlogx: float) -> float:
+        """Shannon entropy of a distribution given N and sum of c*log2(c)."""
+        if total <= 0:
+            return 0.0
+        # Clamp rounding noise accumulated by the running sums
+        return max(0.0, math.log2(total) - sum_xlogx / total)
         
+    def _stats_entropy(self, node: Node) -> Optional[float]:
+        """Entropy from the maintained statistics, or None for an absent node."""
+        stats = self._node_stats.get(node)
+        return self._entropy(stats[1], stats[2]) if stats else None
+        
+    @profiled('analysis')
     def calculate_node_entropy(self, node: URIRef) -> float:
         """
         Calculate the entropy of a node based on its connections.
@@ -30,34 +249,187 @@ class InformationGainAnalyzer:
         Returns:
             float: Entropy value
         """
-        # Get all predicates connected to this node
-        predicates = set()
+        if self.gm is not None:
+            entropy = self._stats_entropy(node)
+            return entropy if entropy is not None else 0.0
+            
+        # Count incident triples per predicate in one pass over each direction
+        pred_counts = defaultdict(int)
         for _, p, _ in self.graph.triples((node, None, None)):
-            predicates.add(str(p))
+            pred_counts[p] += 1
         for _, p, _ in self.graph.triples((None, None, node)):
-            predicates.add(str(p))
+            pred_counts[p] += 1
             
-        if not predicates:
-            return 0.0
+        total_connections = sum(pred_counts.values())
+        return self._entropy(total_connections, sum(_xlogx(c) for c in pred_counts.values()))
+        
+    @profiled('analysis')
+    def entropy_all(self, include_literals: bool = False) -> Dict[Node, float]:
+        """
+        Calculate the entropy of every node in the graph at once.
+        
+        (node, predicate) incidences from both triple directions are encoded
+        as integer pairs and counted with NumPy in COO form; per-node totals
+        and sums of c*log2(c) are then reduced with bincount, so the entropy
+        formula runs vectorized over all nodes.
+        
+        Args:
+            include_literals: Whether literal objects get an entropy too
             
-        # Calculate probability distribution of predicates
-        pred_counts = defaultdict(int)
-        total_connections = 0
+        Returns:
+            Dict[Node, float]: Entropy per node
+        """
+        if self.gm is not None and not include_literals:
+            nodes = list(self._node_stats)
+            totals = np.fromiter((st[1] for st in self._node_stats.values()), dtype=float, count=len(nodes))
+            sums = np.fromiter((st[2] for st in self._node_stats.values()), dtype=float, count=len(nodes))
+            return dict(zip(nodes, self._entropy_vector(totals, sums).tolist()))
+            
+        node_ids, rows, cols, num_predicates = self._incidences(self.graph, include_literals)
+        if not len(rows):
+            return {}
+            
+        pairs = rows * num_predicates + cols
+        pairs, counts = np.unique(pairs, return_counts=True)
+        owners = pairs // num_predicates
+        counts = counts.astype(float)
+        
+        totals = np.bincount(owners, weights=counts, minlength=len(node_ids))
+        sums = np.bincount(owners, weights=counts * np.log2(counts), minlength=len(node_ids))
+        return dict(zip(node_ids, self._entropy_vector(totals, sums).tolist()))
+        
+    @staticmethod
+    def _incidences(graph: Graph, include_literals: bool = False
+                    ) -> Tuple[Dict[Node, int], np.ndarray, np.ndarray, int]:
+        """
+        Intern nodes and predicates of a graph into (node, predicate) arrays.
+        
+        Returns:
+            Node ids, node id and predicate id per incidence, and the number
+            of distinct predicates
+        """
+        node_ids = {}
+        predicate_ids = {}
+        rows = []
+        cols = []
+        for s, p, o in graph:
+            pid = predicate_ids.setdefault(p, len(predicate_ids))
+            rows.append(node_ids.setdefault(s, len(node_ids)))
+            cols.append(pid)
+            if include_literals or not isinstance(o, Literal):
+                rows.append(node_ids.setdefault(o, len(node_ids)))
+                cols.append(pid)
+        return (node_ids, np.asarray(rows, dtype=np.int64),
+                np.asarray(cols, dtype=np.int64), len(predicate_ids))
+        
+    @staticmethod
+    def _entropy_vector(totals: np.ndarray, sums: np.ndarray) -> np.ndarray:
+        """Vectorized form of _entropy."""
+        entropy = np.zeros_like(totals)
+        present = totals > 0
+        entropy[present] = np.log2(totals[present]) - sums[present] / totals[present]
+        return np.maximum(entropy, 0.0)
+        
+    def _check_categories(self, categories: Optional[Iterable[str]]) -> List[str]:
+        """Validate category names, defaulting to all of CATEGORIES."""
+        categories = list(categories) if categories is not None else list(self.CATEGORIES)
+        unknown = [c for c in categories if c not in self.category_namespaces]
+        if unknown:
+            raise ValueError(f"Unknown node categories: {unknown}")
+        return categories
+        
+    @profiled('analysis')
+    def select_nodes(self, categories: Optional[Iterable[str]] = None,
+                     graph: Optional[Graph] = None) -> Dict[str, Set[Node]]:
+        """
+        Find the data nodes of one or more categories in a single pass.
+        
+        A node belongs to a category if its URI lies in the category's
+        namespace or it has an rdf:type from that namespace. Literals and
+        ontology terms (classes and properties) belong to no category. For
+        the analyzed graph of a GraphManager the incrementally maintained
+        index is used; other graphs are scanned.
         
-        for p in predicates:
-            count = len(list(self.graph.triples((node, URIRef(p), None))))
-            count += len(list(self.graph.triples((None, URIRef(p), node))))
-            pred_counts[p] = count
-            total_connections += count
+        Args:
+            categories: Category names (defaults to all of CATEGORIES)
+            graph: Graph to select from (defaults to the analyzed graph)
             
-        # Calculate entropy using Shannon's formula
-        entropy = 0.0
-        for count in pred_counts.values():
-            prob = count / total_connections
-            entropy -= prob * math.log2(prob)
+        Returns:
+            Dict[str, Set[Node]]: Nodes per requested category
+        """
+        categories = self._check_categories(categories)
+        namespaces = [(c, self.category_namespaces[c]) for c in categories]
+        graph = graph if graph is not None else self.graph
+        
+        # With a GraphManager the maintained index answers without a scan
+        if graph is self.graph and self.gm is not None:
+            return {c: set(self._category_nodes[c]) for c in categories}
+        return self._select(namespaces, graph, graph.all_nodes())
+        
+    @staticmethod
+    def _select(namespaces: List[Tuple[str, str]], graph: Graph,
+                candidates: Iterable[Node]) -> Dict[str, Set[Node]]:
+        """Assign candidate nodes and typed nodes of a graph to categories."""
+        selected = {c: set() for c, _ in namespaces}
+        schema = set()
+        for schema_type in SCHEMA_TYPES:
+            schema.update(graph.subjects(RDF.type, schema_type))
             
-        return entropy
+        for node in candidates:
+            if isinstance(node, Literal) or node in schema:
+                continue
+            for category, namespace in namespaces:
+                if node.startswith(namespace):
+                    selected[category].add(node)
+                    
+        for node, class_uri in graph.subject_objects(RDF.type):
+            if node in schema:
+                continue
+            for category, namespace in namespaces:
+                if class_uri.startswith(namespace):
+                    selected[category].add(node)
+                    
+        return selected
+        
+    @profiled('analysis')
+    def calculate_information_gains(self, categories: Iterable[str],
+                                    before_graph: Graph,
+                                    after_graph: Graph) -> Dict[str, float]:
+        """
+        Calculate information gain for several categories at once.
         
+        Node selection and entropies are computed once for all categories.
+        
+        Args:
+            categories: Categories to analyze (see CATEGORIES)
+            before_graph: Graph state before
+            after_graph: Graph state after
+            
+        Returns:
+            Dict[str, float]: Information gain per category
+        """
+        categories = list(categories)
+        nodes_before = self.select_nodes(categories, before_graph)
+        nodes_after = self.select_nodes(categories, after_graph)
+        entropies = self.entropy_all()
+        
+        gains = {}
+        for category in categories:
+            before = nodes_before[category]
+            after = nodes_after[category]
+            
+            # Average entropy before and after
+            entropy_before = sum(entropies.get(n, 0.0) for n in before)
+            entropy_after = sum(entropies.get(n, 0.0) for n in after)
+            if before:
+                entropy_before /= len(before)
+            if after:
+                entropy_after /= len(after)
+                
+            gains[category] = max(0, entropy_after)
+        return gains
+        
+    @profiled('analysis')
     def calculate_information_gain(self, node_type: str, 
                                  before_graph: Graph, 
                                  after_graph: Graph) -> float:
@@ -66,40 +438,262 @@ class InformationGainAnalyzer:
         between two graph states.
         
         Args:
-            node_type: Type of nodes to analyze ('health' or 'travel')
+            node_type: Type of nodes to analyze ('health', 'travel' or 'location')
             before_graph: Graph state before
             after_graph: Graph state after
             
         Returns:
             float: Information gain value
         """
-        # Get nodes of specified type
-        nodes_before = set()
-        nodes_after = set()
+        return self.calculate_information_gains([node_type], before_graph, after_graph)[node_type]
+        
+    @profiled('analysis')
+    def category_entropy(self, categories: Optional[Iterable[str]] = None,
+                         processes: Optional[int] = None,
+                         chunk_size: int = 50000) -> Dict[str, Dict[str, float]]:
+        """
+        Calculate total and average node entropy per category in parallel.
+        
+        With a GraphManager the maintained statistics and category index
+        answer without scanning the graph, vectorized over each category's
+        nodes. Otherwise the graph is interned in a single pass into CSR
+        arrays (per-node predicate ids) placed in shared memory, together
+        with the candidate nodes of every category, which are taken from the
+        interned nodes rather than a second scan. Worker processes map those arrays read-only, compute
+        entropies for chunks of candidates and return per-category partial
+        sums, which are added up here; the graph itself is never pickled.
+        
+        Args:
+            categories: Categories to analyze (defaults to all of CATEGORIES)
+            processes: Number of worker processes for a plain Graph
+                (defaults to the CPU count; 1 computes in this process)
+            chunk_size: Candidate nodes per task
+            
+        Returns:
+            Dict[str, Dict[str, float]]: Per category, the number of 'nodes',
+            the 'total' entropy and its 'average'
+        """
+        categories = self._check_categories(categories)
+        if self.gm is not None:
+            return self._indexed_category_entropy(categories)
+            
+        node_ids, rows, cols, num_predicates = self._incidences(self.graph)
+        namespaces = [(c, self.category_namespaces[c]) for c in categories]
+        selected = self._select(namespaces, self.graph, node_ids)
+        
+        # Candidate node ids per category; -1 marks nodes without incidences
+        members = [np.fromiter(map(node_ids.get, selected[c], repeat(-1)), dtype=np.int64,
+                               count=len(selected[c])) for c in categories]
+        members = [m[m >= 0] for m in members]
+        
+        order = np.argsort(rows, kind='stable')
+        arrays = {
+            'indptr': np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=len(node_ids))))),
+            'predicates': cols[order],
+            'nodes': np.concatenate([np.zeros(0, dtype=np.int64)] + members),
+            'categories': np.repeat(np.arange(len(categories), dtype=np.int64),
+                                    [len(m) for m in members]),
+            'sizes': np.array([max(num_predicates, 1), len(categories)], dtype=np.int64)
+        }
         
-        for s, p, o in before_graph:
-            if node_type in str(s):
-                nodes_before.add(s)
-            if node_type in str(o):
-                nodes_before.add(o)
+        num_candidates = len(arrays['nodes'])
+        chunks = [(start, min(start + chunk_size, num_candidates))
+                  for start in range(0, num_candidates, chunk_size)]
+        workers = min(processes or os.cpu_count() or 1, max(len(chunks), 1))
+        
+        totals = np.zeros(len(categories))
+        counts = np.zeros(len(categories))
+        if workers <= 1:
+            partials = [_chunk_sums(arrays, bounds) for bounds in chunks]
+        else:
+            partials = self._map_shared(arrays, chunks, workers)
+        for partial_totals, partial_counts in partials:
+            totals += partial_totals
+            counts += partial_counts
+            
+        return {category: {
+                    'nodes': int(counts[i]),
+                    'total': float(totals[i]),
+                    'average': float(totals[i] / counts[i]) if counts[i] else 0.0
+                } for i, category in enumerate(categories)}
+        
+    def _indexed_category_entropy(self, categories: List[str]) -> Dict[str, Dict[str, float]]:
+        """category_entropy from the statistics maintained for a GraphManager."""
+        result = {}
+        for category in categories:
+            stats = [self._node_stats[node] for node in self._category_nodes[category]]
+            totals = np.fromiter((st[1] for st in stats), dtype=float, count=len(stats))
+            sums = np.fromiter((st[2] for st in stats), dtype=float, count=len(stats))
+            total = float(self._entropy_vector(totals, sums).sum())
+            result[category] = {
+                'nodes': len(stats),
+                'total': total,
+                'average': total / len(stats) if stats else 0.0
+            }
+        return result
+        
+    @staticmethod
+    def _map_shared(arrays: Dict[str, np.ndarray], chunks: List[Tuple[int, int]],
+                    workers: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Copy arrays into shared memory once and map chunks over a pool."""
+        blocks = []
+        specs = {}
+        try:
+            for key, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                specs[key] = (block.name, array.shape, array.dtype.str)
+            with Pool(workers, initializer=_attach_shared, initargs=(specs,)) as pool:
+                return pool.map(_shared_chunk_sums, chunks)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
                 
-        for s, p, o in after_graph:
-            if node_type in str(s):
-                nodes_after.add(s)
-            if node_type in str(o):
-                nodes_after.add(o)
+    @profiled('analysis')
+    def calculate_information_gain_delta(self,
+                                         added: Optional[Iterable[Tuple[Node, Node, Node]]] = None,
+                                         removed: Optional[Iterable[Tuple[Node, Node, Node]]] = None,
+                                         categories: Optional[Iterable[str]] = None
+                                         ) -> Dict[str, Dict[str, float]]:
+        """
+        Calculate information gain from the triples changed between two states.
+        
+        Per-category entropy sums and node counts are kept between calls, so
+        only the nodes touched by the change are re-evaluated and a call costs
+        O(changed triples) rather than O(graph). The first call builds the
+        category totals once.
+        
+        With a GraphManager, the changes made through the manager since the
+        previous call (or since the first call) are used, and added/removed
+        must be omitted. With a plain Graph, the graph is expected to already
+        contain the change passed to the first call, and every later change
+        must be passed in.
+        
+        Category membership of a touched node is judged on the state after
+        the change (namespace, rdf:type in the graph or among the added
+        triples), as in select_nodes.
+        
+        Args:
+            added: Triples added since the previous state (plain Graph only)
+            removed: Triples removed since the previous state (plain Graph only)
+            categories: Categories to report (defaults to all of CATEGORIES)
+            
+        Returns:
+            Dict[str, Dict[str, float]]: Per category, the average node
+            entropy 'before' and 'after' the change and their difference 'gain'
+        """
+        categories = self._check_categories(categories)
+            
+        if self.gm is not None:
+            if added is not None or removed is not None:
+                raise ValueError("Changes are tracked through the GraphManager; "
+                                 "added/removed must be omitted")
+            if self._category_totals is None:
+                self._init_category_totals()
+            return self._report_delta(categories)
+            
+        added = list(added or ())
+        removed = list(removed or ())
+        if self._category_totals is None:
+            # Reconstruct the statistics of the state before the change
+            self._count(self.graph, 1)
+            self._count(added, -1)
+            self._count(removed, 1)
+            self._init_category_totals()
+            
+        touched = set()
+        for s, p, o in added + removed:
+            touched.add(s)
+            if not isinstance(o, Literal):
+                touched.add(o)
+                
+        before = {n: self._stats_entropy(n) for n in touched}
+        self._count(removed, -1)
+        self._count(added, 1)
+        after = {n: self._stats_entropy(n) for n in touched}
+            
+        totals_before = {c: list(t) for c, t in self._category_totals.items()}
+        added_types = defaultdict(set)
+        for s, p, o in added:
+            if p == RDF.type:
+                added_types[s].add(o)
                 
-        # Calculate average entropy before and after
-        entropy_before = sum(self.calculate_node_entropy(n) for n in nodes_before)
-        entropy_after = sum(self.calculate_node_entropy(n) for n in nodes_after)
+        for node in touched:
+            for category in self._node_categories.pop(node, ()):
+                totals = self._category_totals[category]
+                totals[0] -= before[node]
+                totals[1] -= 1
+                self._category_nodes[category].discard(node)
+            if after[node] is None:
+                continue
+            node_categories = self._categories_of(node, added_types.get(node, ()))
+            for category in node_categories:
+                totals = self._category_totals[category]
+                totals[0] += after[node]
+                totals[1] += 1
+                self._category_nodes[category].add(node)
+            if node_categories:
+                self._node_categories[node] = node_categories
+                    
+        return self._gains(categories, totals_before)
+        
+    def _report_delta(self, categories: List[str]) -> Dict[str, Dict[str, float]]:
+        """Move the nodes changed through the manager to their new entropy and categories."""
+        totals_before = {c: list(t) for c, t in self._category_totals.items()}
+        pending, self._pending_before = self._pending_before, {}
+        for node, (entropy, node_categories) in pending.items():
+            for category in node_categories:
+                totals = self._category_totals[category]
+                totals[0] -= entropy
+                totals[1] -= 1
+            entropy = self._stats_entropy(node)
+            if entropy is None:
+                continue
+            for category in self._node_categories.get(node, ()):
+                totals = self._category_totals[category]
+                totals[0] += entropy
+                totals[1] += 1
+        return self._gains(categories, totals_before)
+        
+    def _gains(self, categories: List[str],
+               totals_before: Dict[str, List]) -> Dict[str, Dict[str, float]]:
+        """Average entropy before and after a change, per category."""
+        result = {}
+        for category in categories:
+            entropy_sum, count = totals_before[category]
+            avg_before = entropy_sum / count if count else 0.0
+            entropy_sum, count = self._category_totals[category]
+            avg_after = entropy_sum / count if count else 0.0
+            result[category] = {
+                'before': avg_before,
+                'after': avg_after,
+                'gain': avg_after - avg_before
+            }
+        return result
         
-        # Normalize by number of nodes
-        if nodes_before:
-            entropy_before /= len(nodes_before)
-        if nodes_after:
-            entropy_after /= len(nodes_after)
+    def _init_category_totals(self) -> None:
+        """Sum node entropies per category from the current statistics."""
+        if self.gm is None:
+            self._build_category_index()
+        self._category_totals = {c: [0.0, 0] for c in self.CATEGORIES}
+        for category, nodes in self._category_nodes.items():
+            totals = self._category_totals[category]
+            for node in nodes:
+                totals[0] += self._stats_entropy(node)
+                totals[1] += 1
             
-        return max(0, entropy_after)
+    def _categories_of(self, node: Node, extra_types: Iterable[Node] = ()) -> List[str]:
+        """Categories of a single node, judged like select_nodes."""
+        if isinstance(node, Literal):
+            return []
+        types = set(self.graph.objects(node, RDF.type))
+        types.update(extra_types)
+        if any(t in SCHEMA_TYPES for t in types):
+            return []
+        return [category for category, namespace in self.category_namespaces.items()
+                if node.startswith(namespace) or any(t.startswith(namespace) for t in types)]
         
     def plot_information_gain_comparison(self, 
                                        health_gains: List[float],
@@ -4,9 +4,12 @@ GraphManager class for managing RDF graphs.
 
 from rdflib import Graph, URIRef, Literal, Namespace
 from rdflib.namespace import RDF, RDFS, OWL, XSD
-from typing import Optional, List, Dict, Union, Tuple
+from rdflib.term import Node
+from typing import Any, Optional, List, Dict, Union, Tuple, Iterable
 import json
 import urllib.parse
+from ..utils.profiling import profiled
+from .memory import AllocationTracker, graph_memory_usage
 
 class GraphManager:
     def __init__(self, base_uri: str = "http://example.org/"):
@@ -26,6 +29,36 @@ class GraphManager:
         self.graph.bind('owl', OWL)
         self.graph.bind('xsd', XSD)
         self.graph.bind('base', self.base)
+        
+        # Objects notified of every triple added or removed through this manager
+        self._listeners = []
+        
+        # Incremented by every add, remove or import made through this manager
+        self.version = 0
+
+    def add_listener(self, listener) -> None:
+        """
+        Register a listener for graph changes made through this manager.
+        
+        A listener implements on_add(triples) and optionally on_remove(triples);
+        both receive only the triples that actually changed the graph. Changes
+        made directly on self.graph (e.g. graph.parse) are not reported.
+        
+        Args:
+            listener: Object to notify
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        """
+        Unregister a listener.
+        
+        Args:
+            listener: Previously registered listener
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def _create_uri_or_literal(self, value: Union[str, int, float, bool],
                              datatype: Optional[str] = None) -> Union[URIRef, Literal]:
@@ -52,6 +85,7 @@ class GraphManager:
                 return Literal(value)
         return value
 
+    @profiled('insert')
     def add_triple(self, subject: str, predicate: str, obj: Union[str, int, float, bool],
                   datatype: Optional[str] = None) -> None:
         """
@@ -63,6 +97,16 @@ class GraphManager:
             obj (Union[str, int, float, bool]): Object of the triple
             datatype (Optional[str]): XSD datatype for literal values
         """
+        triple = self._coerce_triple(subject, predicate, obj, datatype)
+        self.version += 1
+        if self._listeners:
+            self.add_triples([triple])
+        else:
+            self.graph.add(triple)
+
+    def _coerce_triple(self, subject: str, predicate: str, obj: Union[str, int, float, bool],
+                       datatype: Optional[str] = None) -> Tuple[Node, Node, Node]:
+        """Turn add_triple arguments into rdflib terms."""
         # Handle subject
         if ':' in subject:
             s = URIRef(subject)
@@ -81,7 +125,55 @@ class GraphManager:
         else:
             o = self._create_uri_or_literal(obj, datatype)
             
-        self.graph.add((s, p, o))
+        return (s, p, o)
+
+    @profiled('insert')
+    def add_triples(self, triples: Iterable[Tuple[Node, Node, Node]],
+                    partition_key: Optional[str] = None,
+                    broadcast: bool = False) -> None:
+        """
+        Add a batch of already-constructed triples to the graph.
+        
+        Unlike add_triple, no URI/literal coercion is performed: callers pass
+        rdflib terms and the whole batch is handed to the store in one call.
+        
+        Args:
+            triples (Iterable[Tuple[Node, Node, Node]]): Triples to add
+            partition_key (Optional[str]): Owner of the batch (e.g. a person id);
+                a routing hint for ShardedGraphManager, ignored here
+            broadcast (bool): Whether the batch is shared reference data; a
+                routing hint for ShardedGraphManager, ignored here
+        """
+        graph = self.graph
+        self.version += 1
+        if not self._listeners:
+            graph.addN((s, p, o, graph) for s, p, o in triples)
+            return
+            
+        # Listeners only hear about triples that are new to the graph
+        added = [t for t in dict.fromkeys(triples) if t not in graph]
+        graph.addN((s, p, o, graph) for s, p, o in added)
+        if added:
+            for listener in list(self._listeners):
+                listener.on_add(added)
+
+    @profiled('insert')
+    def remove_triples(self, triples: Iterable[Tuple[Node, Node, Node]]) -> None:
+        """
+        Remove a batch of already-constructed triples from the graph.
+        
+        Args:
+            triples (Iterable[Tuple[Node, Node, Node]]): Triples to remove
+        """
+        graph = self.graph
+        self.version += 1
+        removed = [t for t in dict.fromkeys(triples) if t in graph]
+        for triple in removed:
+            graph.remove(triple)
+        if removed:
+            for listener in list(self._listeners):
+                if hasattr(listener, 'on_remove'):
+                    listener.on_remove(removed)
 
     def remove_triple(self, subject: str, predicate: str, obj: str) -> None:
         """
@@ -96,8 +188,9 @@ class GraphManager:
         p = URIRef(self.base_uri + predicate) if not predicate.startswith('http') else URIRef(predicate)
         o = URIRef(self.base_uri + obj) if not obj.startswith('http') else URIRef(obj)
         
-        self.graph.remove((s, p, o))
+        self.remove_triples([(s, p, o)])
 
+    @profiled('query')
     def query_graph(self, sparql_query: str) -> List[Dict]:
         """
         Query the graph using SPARQL.
@@ -119,6 +212,7 @@ class GraphManager:
             
         return results
 
+    @profiled('serialization')
     def export_graph(self, format: str = 'turtle', file_path: Optional[str] = None) -> Optional[str]:
         """
         Export the graph in the specified format.
@@ -135,6 +229,7 @@ class GraphManager:
             return None
         return self.graph.serialize(format=format)
 
+    @profiled('serialization')
     def import_graph(self, file_path: str, format: str = 'turtle') -> None:
         """
         Import a graph from a file.
@@ -143,6 +238,7 @@ class GraphManager:
             file_path (str): Path to the file to import
             format (str): Format of the input file
         """
+        self.version += 1
         self.graph.parse(file_path, format=format)
 
     def get_all_triples(self) -> List[Tuple[str, str, str]]:
@@ -152,4 +248,36 @@ class GraphManager:
         Returns:
             List[Tuple[str, str, str]]: List of all triples
         """
-        return [(str(s), str(p), str(o)) for s, p, o in self.graph] 
\ No newline at end of file
+        return [(str(s), str(p), str(o)) for s, p, o in self.graph] 
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """
+        Estimate the memory held by the graph, by component.
+        
+        Returns:
+            Dict[str, Any]: Bytes in store indexes, term objects (URIs,
+            literals and blank nodes), namespace bindings and caches, the
+            total and bytes per triple (see memory.graph_memory_usage)
+        """
+        return graph_memory_usage(self.graph)
+
+    def track_allocations(self, targets: Optional[Iterable[Any]] = None,
+                          frames: int = 32) -> AllocationTracker:
+        """
+        Create a tracemalloc-backed tracker attributing allocations to builder methods.
+        
+        Use it as a context manager around the code filling this graph:
+        
+            with gm.track_allocations() as tracker:
+                simulator.simulate_period(365)
+            print(tracker.report())
+        
+        Args:
+            targets: Classes or functions to attribute allocations to
+                (defaults to PersonalOntologyBuilder and OntologyBuilder)
+            frames: Traceback depth recorded per allocation
+            
+        Returns:
+            AllocationTracker: The tracker, not yet started
+        """
+        return AllocationTracker(targets, frames)
@@ -0,0 +1,229 @@
+"""
+Incremental forward-chaining materialization of RDFS and OWL-RL entailments.
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from rdflib import Graph, Literal
+from rdflib.namespace import RDF, RDFS, OWL
+from rdflib.term import Node
+from .graph_manager import GraphManager
+from .sharded_graph_manager import ShardedGraphManager
+
+Triple = Tuple[Node, Node, Node]
+
+class RDFSMaterializer:
+    # Rule name -> description; see the _rule_* methods for the exact patterns
+    RULES = {
+        'rdfs2': 'rdfs:domain types the subject',
+        'rdfs3': 'rdfs:range types the (non-literal) object',
+        'rdfs5': 'rdfs:subPropertyOf is transitive',
+        'rdfs7': 'triples propagate to super-properties',
+        'rdfs9': 'rdf:type propagates to superclasses',
+        'rdfs11': 'rdfs:subClassOf is transitive',
+        'cax-eqc': 'owl:equivalentClass members share types',
+        'prp-inv': 'owl:inverseOf adds the inverse triple',
+        'prp-symp': 'owl:SymmetricProperty adds the reverse triple',
+        'prp-trp': 'owl:TransitiveProperty chains are closed'
+    }
+    RDFS_RULES = ('rdfs2', 'rdfs3', 'rdfs5', 'rdfs7', 'rdfs9', 'rdfs11')
+
+    def __init__(self, graph_manager: GraphManager,
+                 rules: Optional[Iterable[str]] = None,
+                 materialize_existing: bool = True):
+        """
+        Attach an incremental materializer to a GraphManager.
+
+        Every batch added through the manager is used as the delta of a
+        semi-naive evaluation: rules only join new triples against the graph,
+        and the inferred triples become the next delta until nothing new is
+        derived. Inferred triples are added through the manager, so other
+        listeners see them as well. Removals do not retract inferences.
+
+        A ShardedGraphManager is rejected: its triples live in the shard
+        processes, out of reach of the joins against the local graph.
+
+        Args:
+            graph_manager: Manager whose graph is materialized
+            rules: Names of the rules to apply (defaults to RDFS_RULES)
+            materialize_existing: Whether to close the triples already in the graph
+        """
+        if isinstance(graph_manager, ShardedGraphManager):
+            raise ValueError("Cannot materialize a sharded graph; "
+                             "materialize a GraphManager before sharding instead")
+        rules = list(rules) if rules is not None else list(self.RDFS_RULES)
+        unknown = [r for r in rules if r not in self.RULES]
+        if unknown:
+            raise ValueError(f"Unknown materialization rules: {unknown}")
+
+        self.gm = graph_manager
+        self.rules = rules
+        self._rule_functions = [getattr(self, '_rule_' + r.replace('-', '_')) for r in rules]
+        self.inferred_count = 0
+
+        self._running = False
+        self._pending = []
+
+        self.gm.add_listener(self)
+        if materialize_existing:
+            self.on_add(list(self.gm.graph))
+
+    def detach(self) -> None:
+        """Stop materializing new triples."""
+        self.gm.remove_listener(self)
+
+    def on_add(self, triples: List[Triple]) -> None:
+        """Derive and add everything entailed by newly added triples."""
+        if self._running:
+            # Triples we inferred ourselves; handled by the loop below
+            self._pending.extend(triples)
+            return
+
+        self._running = True
+        try:
+            delta = triples
+            while delta:
+                inferred = self._apply_rules(delta)
+                self._pending = []
+                if inferred:
+                    self.inferred_count += len(inferred)
+                    self.gm.add_triples(inferred)
+                delta = self._pending
+        finally:
+            self._running = False
+            self._pending = []
+
+    def _apply_rules(self, delta: List[Triple]) -> List[Triple]:
+        """Evaluate all enabled rules for one delta, returning new triples."""
+        graph = self.gm.graph
+        lookup = _MemoLookup(graph)
+        new = {}
+        for triple in delta:
+            for rule in self._rule_functions:
+                for inferred in rule(triple, graph, lookup):
+                    if not isinstance(inferred[0], Literal) and inferred not in graph:
+                        new[inferred] = None
+        return list(new)
+
+    # Each rule receives one delta triple and yields its consequences, joining
+    # the delta against the full graph in both directions (data and schema).
+
+    def _rule_rdfs2(self, triple, graph, lookup):
+        s, p, o = triple
+        if p == RDFS.domain:
+            for x in graph.subjects(s, None, unique=True):
+                yield (x, RDF.type, o)
+        for c in lookup.objects(p, RDFS.domain):
+            yield (s, RDF.type, c)
+
+    def _rule_rdfs3(self, triple, graph, lookup):
+        s, p, o = triple
+        if p == RDFS.range:
+            for y in graph.objects(None, s, unique=True):
+                if not isinstance(y, Literal):
+                    yield (y, RDF.type, o)
+        if not isinstance(o, Literal):
+            for c in lookup.objects(p, RDFS.range):
+                yield (o, RDF.type, c)
+
+    def _rule_rdfs5(self, triple, graph, lookup):
+        yield from self._transitive(triple, RDFS.subPropertyOf, graph)
+
+    def _rule_rdfs7(self, triple, graph, lookup):
+        s, p, o = triple
+        if p == RDFS.subPropertyOf:
+            for x, y in graph.subject_objects(s):
+                yield (x, o, y)
+        for q in lookup.objects(p, RDFS.subPropertyOf):
+            yield (s, q, o)
+
+    def _rule_rdfs9(self, triple, graph, lookup):
+        s, p, o = triple
+        if p == RDFS.subClassOf:
+            for x in graph.subjects(RDF.type, s):
+                yield (x, RDF.type, o)
+        elif p == RDF.type:
+            for d in lookup.objects(o, RDFS.subClassOf):
+                yield (s, RDF.type, d)
+
+    def _rule_rdfs11(self, triple, graph, lookup):
+        yield from self._transitive(triple, RDFS.subClassOf, graph)
+
+    def _rule_cax_eqc(self, triple, graph, lookup):
+        s, p, o = triple
+        if p == OWL.equivalentClass:
+            for x in graph.subjects(RDF.type, s):
+                yield (x, RDF.type, o)
+            for x in graph.subjects(RDF.type, o):
+                yield (x, RDF.type, s)
+        elif p == RDF.type:
+            for d in lookup.objects(o, OWL.equivalentClass):
+                yield (s, RDF.type, d)
+            for d in lookup.subjects(OWL.equivalentClass, o):
+                yield (s, RDF.type, d)
+
+    def _rule_prp_inv(self, triple, graph, lookup):
+        s, p, o = triple
+        if p == OWL.inverseOf:
+            for x, y in graph.subject_objects(s):
+                yield (y, o, x)
+            for x, y in graph.subject_objects(o):
+                yield (y, s, x)
+        for q in lookup.objects(p, OWL.inverseOf):
+            yield (o, q, s)
+        for q in lookup.subjects(OWL.inverseOf, p):
+            yield (o, q, s)
+
+    def _rule_prp_symp(self, triple, graph, lookup):
+        s, p, o = triple
+        if p == RDF.type and o == OWL.SymmetricProperty:
+            for x, y in graph.subject_objects(s):
+                yield (y, s, x)
+        if lookup.has(p, RDF.type, OWL.SymmetricProperty):
+            yield (o, p, s)
+
+    def _rule_prp_trp(self, triple, graph, lookup):
+        s, p, o = triple
+        if p == RDF.type and o == OWL.TransitiveProperty:
+            for x, y in graph.subject_objects(s):
+                for z in graph.objects(y, s):
+                    yield (x, s, z)
+        if lookup.has(p, RDF.type, OWL.TransitiveProperty):
+            yield from self._transitive(triple, p, graph)
+
+    @staticmethod
+    def _transitive(triple: Triple, prop: Node, graph: Graph) -> Iterator[Triple]:
+        """One semi-naive step of transitive closure for a new prop triple."""
+        s, p, o = triple
+        if p != prop:
+            return
+        for z in graph.objects(o, prop):
+            yield (s, prop, z)
+        for w in graph.subjects(prop, s):
+            yield (w, prop, o)
+
+class _MemoLookup:
+    """Per-delta memo of schema lookups, which repeat for every data triple."""
+
+    def __init__(self, graph: Graph):
+        self.graph = graph
+        self._objects = {}
+        self._subjects = {}
+        self._has = {}
+
+    def objects(self, s: Node, p: Node) -> List[Node]:
+        key = (s, p)
+        if key not in self._objects:
+            self._objects[key] = list(self.graph.objects(s, p))
+        return self._objects[key]
+
+    def subjects(self, p: Node, o: Node) -> List[Node]:
+        key = (p, o)
+        if key not in self._subjects:
+            self._subjects[key] = list(self.graph.subjects(p, o))
+        return self._subjects[key]
+
+    def has(self, s: Node, p: Node, o: Node) -> bool:
+        key = (s, p, o)
+        if key not in self._has:
+            self._has[key] = key in self.graph
+        return self._has[key]
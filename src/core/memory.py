@@ -0,0 +1,291 @@
+"""
+Memory accounting for RDFLib graphs.
+
+graph_memory_usage() breaks the footprint of an in-memory graph down into
+store indexes, term objects, namespace bindings and caches by walking the
+store's containers with sys.getsizeof. AllocationTracker uses tracemalloc
+to attribute the memory allocated (and still held) during a run to the
+builder methods that allocated it.
+"""
+
+import inspect
+import sys
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from rdflib import BNode, Graph, Literal
+from rdflib.term import Node
+
+TERM_KINDS = ('uris', 'literals', 'bnodes')
+
+def _term_kind(term: Node) -> str:
+    if isinstance(term, Literal):
+        return 'literals'
+    if isinstance(term, BNode):
+        return 'bnodes'
+    return 'uris'
+
+def _walk(roots: Iterable[Any], seen: set, terms: Dict[int, Node]) -> int:
+    """
+    Bytes of the containers reachable from roots, excluding RDF terms.
+
+    Dicts, sets, lists and tuples are traversed; terms met along the way are
+    collected into terms (by id) for separate accounting, and other objects
+    (Graph identifiers, flags) count with their shallow size. Objects already
+    in seen are not counted again.
+    """
+    total = 0
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        if isinstance(obj, Node) and not isinstance(obj, Graph):
+            terms.setdefault(id(obj), obj)
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (set, frozenset, list, tuple)):
+            stack.extend(obj)
+    return total
+
+def _term_bytes(term: Node, seen: set) -> int:
+    """Bytes of one term object, with a literal's Python value and language."""
+    size = sys.getsizeof(term)
+    if isinstance(term, Literal):
+        for part in (term.value, term.language):
+            if part is not None and id(part) not in seen:
+                seen.add(id(part))
+                size += sys.getsizeof(part)
+    return size
+
+def graph_memory_usage(graph: Graph) -> Dict[str, Any]:
+    """
+    Estimate the memory held by a graph, by component.
+
+    Store attributes naming namespaces or prefixes count as namespace
+    bindings and all other store attributes as indexes (for the default
+    Memory store: the spo/pos/osp indexes and the triple/context maps).
+    Term objects are counted once per object, so the same URI stored as
+    several objects costs several times; 'unique' counts distinct values.
+    Caches are the NamespaceManager's qname caches and tries. Sizes come
+    from sys.getsizeof and leave out allocator overhead, so they are a
+    lower bound of the process RSS.
+
+    Args:
+        graph: Graph to measure
+
+    Returns:
+        Dict with 'triples', 'store_indexes', 'terms' (per kind 'objects',
+        'unique' and 'bytes', plus the total 'bytes'), 'namespace_bindings',
+        'caches' and 'total' in bytes, and 'bytes_per_triple'
+    """
+    seen = set()
+    terms = {}
+    index_roots, namespace_roots = [], []
+    for name, value in vars(graph.store).items():
+        lowered = name.lower()
+        if 'namespace' in lowered or 'prefix' in lowered:
+            namespace_roots.append(value)
+        elif isinstance(value, (dict, set, list, tuple)):
+            index_roots.append(value)
+
+    store_indexes = _walk(index_roots, seen, terms)
+    index_terms = dict(terms)
+    namespace_bindings = _walk(namespace_roots, seen, terms)
+    caches = _walk(vars(graph.namespace_manager).values(), seen, terms)
+
+    # Terms reachable only from bindings and caches (namespace URIs) stay there
+    usage_terms = {kind: {'objects': 0, 'unique': 0, 'bytes': 0} for kind in TERM_KINDS}
+    unique = {kind: set() for kind in TERM_KINDS}
+    for term in index_terms.values():
+        kind = _term_kind(term)
+        usage_terms[kind]['objects'] += 1
+        usage_terms[kind]['bytes'] += _term_bytes(term, seen)
+        unique[kind].add(term)
+    for kind in TERM_KINDS:
+        usage_terms[kind]['unique'] = len(unique[kind])
+    usage_terms['bytes'] = sum(usage_terms[kind]['bytes'] for kind in TERM_KINDS)
+    for term in terms.values():
+        if id(term) not in index_terms:
+            namespace_bindings += _term_bytes(term, seen)
+
+    triples = len(graph)
+    total = store_indexes + usage_terms['bytes'] + namespace_bindings + caches
+    return {
+        'triples': triples,
+        'store_indexes': store_indexes,
+        'terms': usage_terms,
+        'namespace_bindings': namespace_bindings,
+        'caches': caches,
+        'total': total,
+        'bytes_per_triple': total / triples if triples else None
+    }
+
+def combine_memory_usage(usages: List[Dict[str, Any]],
+                         triples: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Add up the memory usage of several graphs, e.g. the shards of a graph.
+
+    Args:
+        usages: Results of graph_memory_usage
+        triples: Distinct triples across the graphs, if replicated triples
+            should count once in bytes_per_triple (defaults to the sum)
+
+    Returns:
+        Dict[str, Any]: Summed usage in the format of graph_memory_usage
+    """
+    combined = {
+        'triples': triples if triples is not None else sum(u['triples'] for u in usages),
+        'terms': {kind: {'objects': 0, 'unique': 0, 'bytes': 0} for kind in TERM_KINDS}
+    }
+    for key in ('store_indexes', 'namespace_bindings', 'caches', 'total'):
+        combined[key] = sum(u[key] for u in usages)
+    for kind in TERM_KINDS:
+        for field in ('objects', 'unique', 'bytes'):
+            combined['terms'][kind][field] = sum(u['terms'][kind][field] for u in usages)
+    combined['terms']['bytes'] = sum(u['terms']['bytes'] for u in usages)
+    combined['bytes_per_triple'] = (combined['total'] / combined['triples']
+                                    if combined['triples'] else None)
+    return combined
+
+def format_memory_usage(usage: Dict[str, Any]) -> str:
+    """Format a graph_memory_usage result as a small table."""
+    total = usage['total'] or 1
+    rows = [('store indexes', usage['store_indexes'])]
+    rows += [(f"terms: {kind}", usage['terms'][kind]['bytes']) for kind in TERM_KINDS]
+    rows += [('namespace bindings', usage['namespace_bindings']), ('caches', usage['caches'])]
+    lines = [f"{name:<20}{size / (1 << 20):>10.2f} MiB{100.0 * size / total:>7.1f}%"
+             for name, size in rows]
+    lines.append(f"{'total':<20}{usage['total'] / (1 << 20):>10.2f} MiB")
+    per_triple = usage['bytes_per_triple']
+    lines.append(f"{usage['triples']} triples, "
+                 f"{per_triple:.0f} bytes per triple" if per_triple else f"{usage['triples']} triples")
+    for kind in TERM_KINDS:
+        t = usage['terms'][kind]
+        lines.append(f"{kind}: {t['objects']} objects for {t['unique']} distinct values")
+    return '\n'.join(lines)
+
+class AllocationTracker:
+    def __init__(self, targets: Optional[Iterable[Any]] = None, frames: int = 32):
+        """
+        Attribute allocations made while active to builder methods.
+
+        Uses tracemalloc: every allocation still alive when the tracker
+        stops is charged to the innermost frame of its traceback that lies
+        in one of the target methods, or to '<other>' if there is none.
+        Tracing slows the traced code down several times.
+
+        Args:
+            targets: Classes (all of their methods) or functions to attribute
+                to; defaults to PersonalOntologyBuilder and OntologyBuilder
+            frames: Traceback depth recorded per allocation; must reach from
+                the allocation up to the builder method
+        """
+        if targets is None:
+            from .ontology_builder import OntologyBuilder
+            from .personal_ontology_builder import PersonalOntologyBuilder
+            targets = (PersonalOntologyBuilder, OntologyBuilder)
+        self.frames = frames
+        self._lines = self._index_lines(targets)
+        self._started_tracing = False
+        self._baseline = 0
+        self._before = None
+        self._differences = []
+        self.snapshot = None
+        self.peak = None
+
+    @staticmethod
+    def _index_lines(targets: Iterable[Any]) -> Dict[Tuple[str, int], str]:
+        """Map (filename, line) of every target function body to its name."""
+        functions = []
+        for target in targets:
+            if inspect.isclass(target):
+                for klass in target.__mro__:
+                    if klass is object:
+                        continue
+                    for value in vars(klass).values():
+                        if isinstance(value, (staticmethod, classmethod)):
+                            value = value.__func__
+                        if inspect.isfunction(value):
+                            functions.append(value)
+            else:
+                functions.append(target)
+
+        lines = {}
+        for function in functions:
+            function = inspect.unwrap(function)
+            code = function.__code__
+            for _, _, line in code.co_lines():
+                if line is not None:
+                    lines.setdefault((code.co_filename, line), function.__qualname__)
+        return lines
+
+    def start(self) -> 'AllocationTracker':
+        """Start tracing allocations (reusing tracemalloc if already tracing)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        self._before = self._take_snapshot()
+        return self
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def stop(self) -> None:
+        """Compare allocations with those at start, then stop tracing."""
+        self.peak = tracemalloc.get_traced_memory()[1] - self._baseline
+        self.snapshot = self._take_snapshot()
+        self._differences = self.snapshot.compare_to(self._before, 'traceback')
+        self._before = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> 'AllocationTracker':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def by_method(self) -> Dict[str, Dict[str, int]]:
+        """
+        Retained allocations per target method.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Method -> 'bytes' and 'blocks', sorted
+            by bytes, with '<other>' for allocations outside the targets
+        """
+        if self.snapshot is None:
+            raise RuntimeError("The tracker has not been stopped yet")
+        result = {}
+        for difference in self._differences:
+            if not difference.size_diff:
+                continue
+            owner = '<other>'
+            for frame in reversed(difference.traceback):
+                name = self._lines.get((frame.filename, frame.lineno))
+                if name is not None:
+                    owner = name
+                    break
+            entry = result.setdefault(owner, {'bytes': 0, 'blocks': 0})
+            entry['bytes'] += difference.size_diff
+            entry['blocks'] += difference.count_diff
+        return dict(sorted(result.items(), key=lambda item: -item[1]['bytes']))
+
+    def report(self, limit: int = 20) -> str:
+        """Format the retained allocations per method and the peak as text."""
+        methods = self.by_method()
+        total = sum(m['bytes'] for m in methods.values()) or 1
+        lines = [f"{'retained MiB':>12}{'share':>8}{'blocks':>10}  method"]
+        for name, m in list(methods.items())[:limit]:
+            lines.append(f"{m['bytes'] / (1 << 20):>12.2f}{100.0 * m['bytes'] / total:>7.1f}%"
+                         f"{m['blocks']:>10}  {name}")
+        lines.append(f"peak traced during the run: {self.peak / (1 << 20):.2f} MiB")
+        return '\n'.join(lines)
@@ -15,7 +15,7 @@ class OntologyBuilder:
         Args:
             graph_manager (Optional[GraphManager]): Existing GraphManager instance or None to create new
         """
-        self.gm = graph_manager if graph_manager else GraphManager()
+        self.gm = graph_manager if graph_manager is not None else GraphManager()
         
     def create_class(self, class_name: str, label: Optional[str] = None,
                     comment: Optional[str] = None,
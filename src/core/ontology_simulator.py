@@ -4,30 +4,68 @@ Module for simulating data based on custom ontologies.
 
 from rdflib import Graph, URIRef, Literal, Namespace, RDF, RDFS, OWL
 from typing import Dict, List, Any, Optional, Tuple
+from collections import defaultdict, deque
+from itertools import count
+import hashlib
 import random
 import re
+import uuid
 from datetime import datetime
 from .ontology_builder import OntologyBuilder
+from ..utils.schema_cache import SchemaCache, file_digest
+from ..utils.ontology_schema import OntologySchema
 
 class OntologyBasedSimulator:
     def __init__(self, 
                  base_uri: str = "http://example.org/",
-                 custom_ontology_path: Optional[str] = None):
+                 custom_ontology_path: Optional[str] = None,
+                 instance_pool_size: int = 1000,
+                 max_depth: int = 3,
+                 max_fan_out: int = 10,
+                 batch_size: int = 10000,
+                 use_cache: bool = True,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the ontology-based simulator.
         
         Args:
             base_uri: Base URI for the generated data
             custom_ontology_path: Path to custom ontology file (supports various RDF formats)
+            instance_pool_size: Maximum number of instances kept per class for
+                linking object properties; once a pool is full, links reuse it
+            max_depth: Maximum distance from a generated instance at which new
+                related instances are still created
+            max_fan_out: Maximum number of new related instances created per instance
+            batch_size: Number of root instances per bulk insert in simulate_data
+            use_cache: Whether to reuse parsed ontologies and analysis results
+                cached on disk for the same file contents
+            cache_dir: Optional schema cache directory
         """
         self.base_uri = base_uri
         self.ontology_builder = OntologyBuilder()
+        self.instance_pool_size = instance_pool_size
+        self.max_depth = max_depth
+        self.max_fan_out = max_fan_out
+        self.batch_size = batch_size
+        
+        # Generated instances available for linking, and a collision-free id
+        # source; the token keeps ids of simulators sharing a graph apart
+        self.instance_pools = defaultdict(list)  # class URI -> instance URIs
+        self._instance_prefix = f"instance_{uuid.uuid4().hex[:12]}_"
+        self._instance_ids = count()
+        
+        # Content hashes of the loaded ontology files, used as schema cache keys,
+        # and the manager version and graph size right after the last load
+        self.schema_cache = SchemaCache(cache_dir) if use_cache else None
+        self._ontology_digests = []
+        self._loaded_state = self._graph_state()
         
         # Load custom ontology if provided
         if custom_ontology_path:
             self.load_custom_ontology(custom_ontology_path)
             
         # Initialize ontology analysis results
+        self.schema = None  # indexed OntologySchema
         self.classes = {}  # class URI -> properties
         self.properties = {}  # property URI -> range, domain
         self.value_constraints = {}  # property URI -> constraints
@@ -53,9 +91,38 @@ class OntologyBasedSimulator:
         ext = re.search(r'\.[^.]+$', ontology_path)
         format = format_map.get(ext.group() if ext else '', 'xml')
         
-        # Load the ontology
-        self.ontology_builder.get_graph_manager().graph.parse(
-            ontology_path, format=format)
+        graph_manager = self.ontology_builder.get_graph_manager()
+        if self.schema_cache is None:
+            graph_manager.graph.parse(ontology_path, format=format)
+            return
+        if self._graph_state() != self._loaded_state:
+            # Something besides ontology files is in the graph already
+            self._loaded_state = None
+            
+        # Reuse the parsed triples of an identical file if we have them
+        digest = file_digest(ontology_path)
+        kind = f"ontology-triples-{format}"
+        cached = self.schema_cache.load(digest, kind)
+        if cached is None:
+            parsed = Graph()
+            parsed.parse(ontology_path, format=format)
+            cached = {
+                'triples': list(parsed),
+                'namespaces': list(parsed.namespaces())
+            }
+            self.schema_cache.store(digest, kind, cached)
+            
+        for prefix, namespace in cached['namespaces']:
+            graph_manager.graph.bind(prefix, namespace)
+        graph_manager.add_triples(cached['triples'])
+        self._ontology_digests.append(digest)
+        if self._loaded_state is not None:
+            self._loaded_state = self._graph_state()
+            
+    def _graph_state(self) -> Tuple[int, int]:
+        """Version of the graph manager and size of its graph."""
+        graph_manager = self.ontology_builder.get_graph_manager()
+        return graph_manager.version, len(graph_manager.graph)
         
     def analyze_ontology(self) -> None:
         """
@@ -63,102 +130,57 @@ class OntologyBasedSimulator:
         """
         graph = self.ontology_builder.get_graph_manager().graph
         
-        # Get all classes
-        for class_uri in graph.subjects(RDF.type, OWL.Class):
-            self.classes[class_uri] = {
-                'label': self._get_label(class_uri),
-                'properties': [],
-                'subclass_of': list(graph.objects(class_uri, RDFS.subClassOf))
-            }
+        # Results are cached for the loaded files, but only while the graph
+        # holds nothing else: no change was made through the manager since the
+        # last load, and the graph size (covering direct edits) is unchanged
+        cache_key = None
+        schema = None
+        if (self.schema_cache is not None and self._ontology_digests
+                and self._loaded_state == self._graph_state()):
+            cache_key = hashlib.sha256('|'.join(self._ontology_digests).encode()).hexdigest()
+            schema = self.schema_cache.load(cache_key, 'ontology-analysis')
             
-        # Get all properties and their characteristics
-        for prop in graph.subjects(RDF.type, OWL.DatatypeProperty):
-            self._analyze_property(prop, 'datatype')
-            
-        for prop in graph.subjects(RDF.type, OWL.ObjectProperty):
-            self._analyze_property(prop, 'object')
-            
-        # Analyze property constraints
-        self._analyze_constraints()
-        
+        if schema is None:
+            schema = OntologySchema.from_graph(graph)
+            if cache_key is not None:
+                self.schema_cache.store(cache_key, 'ontology-analysis', schema)
+                
+        self._load_schema(schema)
         self.analyzed = True
         
-    def _analyze_property(self, prop_uri: URIRef, prop_type: str) -> None:
+    def _load_schema(self, schema: OntologySchema) -> None:
         """
-        Analyze a property's characteristics.
+        Populate the class, property and constraint tables from an indexed schema.
         
         Args:
-            prop_uri: URI of the property
-            prop_type: Type of property ('datatype' or 'object')
+            schema: Schema of the loaded ontology
         """
-        graph = self.ontology_builder.get_graph_manager().graph
-        
-        domains = list(graph.objects(prop_uri, RDFS.domain))
-        ranges = list(graph.objects(prop_uri, RDFS.range))
+        self.schema = schema
         
-        self.properties[prop_uri] = {
-            'type': prop_type,
-            'label': self._get_label(prop_uri),
-            'domains': domains,
-            'ranges': ranges,
-            'functional': (prop_uri, RDF.type, OWL.FunctionalProperty) in graph
-        }
-        
-        # Add property to its domain classes
-        for domain in domains:
-            if domain in self.classes:
-                self.classes[domain]['properties'].append(prop_uri)
-                
-    def _analyze_constraints(self) -> None:
-        """
-        Analyze property constraints from the ontology.
-        """
-        graph = self.ontology_builder.get_graph_manager().graph
-        
-        # Look for common constraint patterns
-        for prop_uri in self.properties:
+        # Classes list their own and inherited properties
+        for class_uri, class_info in schema.classes.items():
+            self.classes[class_uri] = {
+                'label': class_info['label'],
+                'properties': list(schema.properties_of(class_uri)),
+                'subclass_of': class_info['subclass_of']
+            }
+            
+        for prop_uri, prop_info in schema.properties.items():
+            self.properties[prop_uri] = dict(prop_info)
+            
+        # Value bounds come from datatype facets, falling back to cardinality restrictions
+        for prop_uri, schema_constraints in schema.constraints.items():
             constraints = {
-                'min_value': None,
-                'max_value': None,
-                'allowed_values': set(),
+                'min_value': schema_constraints.get('min', schema_constraints.get('min_cardinality')),
+                'max_value': schema_constraints.get('max', schema_constraints.get('max_cardinality')),
+                'allowed_values': set(schema_constraints.get('has_value', [])) |
+                                  set(schema_constraints.get('values', [])),
                 'pattern': None
             }
-            
-            # Check for XML Schema constraints
-            for restriction in graph.subjects(OWL.onProperty, prop_uri):
-                if (restriction, RDF.type, OWL.Restriction) in graph:
-                    self._extract_restriction_constraints(restriction, constraints)
-                    
             if constraints['min_value'] is not None or \
                constraints['max_value'] is not None or \
-               constraints['allowed_values'] or \
-               constraints['pattern'] is not None:
+               constraints['allowed_values']:
                 self.value_constraints[prop_uri] = constraints
-                
-    def _extract_restriction_constraints(self, 
-                                       restriction: URIRef, 
-                                       constraints: Dict) -> None:
-        """
-        Extract constraints from an OWL restriction.
-        
-        Args:
-            restriction: URI of the restriction
-            constraints: Dictionary to update with found constraints
-        """
-        graph = self.ontology_builder.get_graph_manager().graph
-        
-        # Check for cardinality constraints
-        min_card = graph.value(restriction, OWL.minCardinality)
-        max_card = graph.value(restriction, OWL.maxCardinality)
-        
-        if min_card:
-            constraints['min_value'] = int(min_card)
-        if max_card:
-            constraints['max_value'] = int(max_card)
-            
-        # Check for value constraints
-        for value in graph.objects(restriction, OWL.hasValue):
-            constraints['allowed_values'].add(value)
             
     def _get_label(self, uri: URIRef) -> str:
         """Get label for a URI, falling back to local name if no label exists."""
@@ -169,55 +191,108 @@ class OntologyBasedSimulator:
         return uri.split('#')[-1] if '#' in uri else uri.split('/')[-1]
         
     def generate_instance(self, class_uri: URIRef, 
-                         instance_id: str = None) -> None:
+                         instance_id: str = None) -> URIRef:
         """
         Generate an instance of a class with valid property values.
         
+        Related instances are generated breadth-first within the depth and
+        fan-out budget, or taken from the instance pool of their class.
+        
         Args:
             class_uri: URI of the class to instantiate
             instance_id: Optional identifier for the instance
+            
+        Returns:
+            URIRef: URI of the generated instance
         """
+        self._check_class(class_uri)
+        
+        triples = []
+        instance_uri = self._expand([(class_uri, instance_id)], triples)[0]
+        self.ontology_builder.get_graph_manager().add_triples(triples)
+        return instance_uri
+        
+    def _check_class(self, class_uri: URIRef) -> None:
+        """Analyze the ontology if needed and make sure the class exists."""
         if not self.analyzed:
             self.analyze_ontology()
             
         if class_uri not in self.classes:
             raise ValueError(f"Class {class_uri} not found in ontology")
             
-        # Create instance URI
+    def _allocate_instance(self, class_uri: URIRef, instance_id: Optional[str],
+                           triples: List[Tuple]) -> URIRef:
+        """
+        Create a typed instance URI and register it in its class pool.
+        
+        Args:
+            class_uri: URI of the class to instantiate
+            instance_id: Optional identifier; a counter-based id unique to
+                this simulator is used otherwise
+            triples: Batch to append the type assertion to
+        """
         if instance_id is None:
-            instance_id = f"instance_{random.randint(1000, 9999)}"
+            instance_id = f"{self._instance_prefix}{next(self._instance_ids)}"
         instance_uri = URIRef(f"{self.base_uri}{instance_id}")
+        triples.append((instance_uri, RDF.type, class_uri))
         
-        # Add type assertion
-        self.ontology_builder.get_graph_manager().add_triple(
-            instance_uri, "rdf:type", class_uri)
-            
-        # Generate values for properties
-        for prop_uri in self.classes[class_uri]['properties']:
-            self._generate_property_value(instance_uri, prop_uri)
-            
-    def _generate_property_value(self, 
-                               subject_uri: URIRef, 
-                               prop_uri: URIRef) -> None:
+        pool = self.instance_pools[class_uri]
+        if len(pool) < self.instance_pool_size:
+            pool.append(instance_uri)
+        return instance_uri
+        
+    def _expand(self, roots: List[Tuple[URIRef, Optional[str]]],
+                triples: List[Tuple]) -> List[URIRef]:
         """
-        Generate and add a value for a property.
+        Generate root instances and their neighbourhood breadth-first.
         
         Args:
-            subject_uri: URI of the subject
-            prop_uri: URI of the property
+            roots: (class URI, optional instance id) pairs to instantiate
+            triples: Batch to append the generated triples to
+            
+        Returns:
+            List[URIRef]: URIs of the root instances
         """
-        prop_info = self.properties[prop_uri]
-        constraints = self.value_constraints.get(prop_uri, {})
-        
-        if prop_info['type'] == 'datatype':
-            value = self._generate_datatype_value(prop_info['ranges'][0], constraints)
-            if value is not None:
-                self.ontology_builder.get_graph_manager().add_triple(
-                    subject_uri, prop_uri, value)
-        else:
-            # For object properties, create or reference another instance
-            range_class = prop_info['ranges'][0]
-            self.generate_instance(range_class)
+        queue = deque()
+        created = []
+        for class_uri, instance_id in roots:
+            instance_uri = self._allocate_instance(class_uri, instance_id, triples)
+            created.append(instance_uri)
+            queue.append((instance_uri, class_uri, 0))
+            
+        while queue:
+            subject_uri, class_uri, depth = queue.popleft()
+            new_neighbors = 0
+            
+            for prop_uri in self.classes[class_uri]['properties']:
+                prop_info = self.properties[prop_uri]
+                if not prop_info['ranges']:
+                    continue
+                    
+                if prop_info['type'] == 'datatype':
+                    value = self._generate_datatype_value(
+                        prop_info['ranges'][0], self.value_constraints.get(prop_uri, {}))
+                    if value is not None:
+                        triples.append((subject_uri, prop_uri, value))
+                    continue
+                    
+                # For object properties, create a new related instance while the
+                # budgets allow it, otherwise link to an existing one
+                range_class = prop_info['ranges'][0]
+                pool = self.instance_pools[range_class]
+                if depth < self.max_depth and new_neighbors < self.max_fan_out and \
+                   len(pool) < self.instance_pool_size:
+                    target_uri = self._allocate_instance(range_class, None, triples)
+                    new_neighbors += 1
+                    if range_class in self.classes:
+                        queue.append((target_uri, range_class, depth + 1))
+                elif pool:
+                    target_uri = random.choice(pool)
+                else:
+                    continue
+                triples.append((subject_uri, prop_uri, target_uri))
+                
+        return created
             
     def _generate_datatype_value(self, 
                                 datatype: URIRef, 
@@ -235,11 +310,13 @@ class OntologyBasedSimulator:
         if constraints.get('allowed_values'):
             return random.choice(list(constraints['allowed_values']))
             
-        min_val = constraints.get('min_value', 0)
-        max_val = constraints.get('max_value', 100)
+        min_val = constraints.get('min_value')
+        max_val = constraints.get('max_value')
+        min_val = 0 if min_val is None else min_val
+        max_val = 100 if max_val is None else max_val
         
         if 'integer' in str(datatype).lower():
-            return Literal(random.randint(min_val, max_val))
+            return Literal(random.randint(int(min_val), int(max_val)))
         elif 'float' in str(datatype).lower() or 'decimal' in str(datatype).lower():
             return Literal(random.uniform(min_val, max_val))
         elif 'string' in str(datatype).lower():
@@ -261,9 +338,16 @@ class OntologyBasedSimulator:
             num_instances: Number of instances to generate
             base_id: Base identifier for generated instances
         """
-        for i in range(num_instances):
-            instance_id = f"{base_id}_{i}" if base_id else None
-            self.generate_instance(class_uri, instance_id)
+        self._check_class(class_uri)
+        graph_manager = self.ontology_builder.get_graph_manager()
+        
+        for start in range(0, num_instances, self.batch_size):
+            stop = min(start + self.batch_size, num_instances)
+            roots = [(class_uri, f"{base_id}_{i}" if base_id else None)
+                     for i in range(start, stop)]
+            triples = []
+            self._expand(roots, triples)
+            graph_manager.add_triples(triples)
             
     def export_generated_data(self, 
                             format: str = 'turtle', 
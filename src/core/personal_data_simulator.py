@@ -6,8 +6,11 @@ from datetime import datetime, timedelta
 import random
 from typing import Optional
 from ..utils.data_simulator import PersonalDataSimulator
+from ..utils.columnar_export import ColumnarRecordWriter
+from .graph_manager import GraphManager
 from .personal_ontology_builder import PersonalOntologyBuilder
 from enum import Enum, auto
+from ..utils.profiling import profiled
 
 class DataType(Enum):
     HEALTH_ONLY = auto()
@@ -17,7 +20,10 @@ class DataType(Enum):
 
 class PersonalDataKnowledgeSimulator:
     def __init__(self, person_id: str, start_date: Optional[datetime] = None,
-                 base_uri: str = "http://example.org/personal/"):
+                 base_uri: str = "http://example.org/personal/",
+                 columnar_writer: Optional[ColumnarRecordWriter] = None,
+                 write_graph: bool = True,
+                 graph_manager: Optional[GraphManager] = None):
         """
         Initialize the personal data knowledge simulator.
         
@@ -25,13 +31,21 @@ class PersonalDataKnowledgeSimulator:
             person_id: Identifier for the person
             start_date: Starting date for the simulation
             base_uri: Base URI for the ontology
+            columnar_writer: Optional writer that also receives the raw health
+                and travel records as columns
+            write_graph: Whether generated records are added to the RDF graph
+            graph_manager: Optional manager to build into, e.g. a
+                ShardedGraphManager shared by several simulated persons
         """
         self.person_id = person_id
+        self.columnar_writer = columnar_writer
+        self.write_graph = write_graph
         self.data_simulator = PersonalDataSimulator(start_date)
-        self.ontology_builder = PersonalOntologyBuilder(base_uri)
+        self.ontology_builder = PersonalOntologyBuilder(base_uri, graph_manager)
         self.travel_probability = 0.1  # 10% chance of travel booking per day
         self.health_probability = 0.5  # 50% chance of health data per day
         
+    @profiled('simulation')
     def simulate_day(self) -> DataType:
         """
         Simulate one day of personal data and add it to the ontology.
@@ -50,18 +64,18 @@ class PersonalDataKnowledgeSimulator:
         if generate_travel and generate_health:
             travel_data = self.data_simulator.generate_travel_booking()
             health_data = self.data_simulator.generate_daily_health_data()
-            self.ontology_builder.add_travel_booking(travel_data, self.person_id)
-            self.ontology_builder.add_health_data(health_data, self.person_id)
+            self._add_travel(travel_data)
+            self._add_health(health_data)
             data_type = DataType.HEALTH_AND_TRAVEL
         elif generate_travel:
             travel_data = self.data_simulator.generate_travel_booking()
-            self.ontology_builder.add_travel_booking(travel_data, self.person_id)
+            self._add_travel(travel_data)
             data_type = DataType.TRAVEL_ONLY
         elif generate_health:
             health_data = self.data_simulator.generate_daily_health_data()
-            self.ontology_builder.add_health_data(health_data, self.person_id)
+            self._add_health(health_data)
             data_type = DataType.HEALTH_ONLY
-        else:
+        elif self.write_graph:
             date = self.data_simulator.current_date.isoformat()
             self.ontology_builder.add_general_activity(self.person_id, date)
             
@@ -69,6 +83,22 @@ class PersonalDataKnowledgeSimulator:
         self.data_simulator.advance_day()
         
         return data_type
+    
+    def _add_health(self, health_data: dict) -> None:
+        """Send a health record to the graph and/or the columnar writer."""
+        if self.write_graph:
+            self.ontology_builder.add_health_data(health_data, self.person_id)
+        if self.columnar_writer is not None:
+            self.columnar_writer.add_health(health_data, self.person_id)
+            
+    def _add_travel(self, travel_data: dict) -> None:
+        """Send a travel booking to the graph and/or the columnar writer."""
+        if self.write_graph:
+            self.ontology_builder.add_travel_booking(travel_data, self.person_id)
+        if self.columnar_writer is not None:
+            self.columnar_writer.add_travel(travel_data, self.person_id)
+            
+    @profiled('simulation')
     def simulate_period(self, days: int) -> None:
         """
         Simulate personal data for a specified number of days.
@@ -78,6 +108,8 @@ class PersonalDataKnowledgeSimulator:
         """
         for _ in range(days):
             self.simulate_day()
+        if self.columnar_writer is not None:
+            self.columnar_writer.flush()
     
     def export_ontology(self, format: str = 'turtle', file_path: Optional[str] = None) -> Optional[str]:
         """
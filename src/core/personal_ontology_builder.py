@@ -3,17 +3,33 @@ Specialized ontology builder for personal health and travel data.
 """
 
 from rdflib import Namespace, URIRef, Literal, XSD, RDF
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from .graph_manager import GraphManager
 from .ontology_builder import OntologyBuilder
 from datetime import datetime
+from functools import lru_cache
 import urllib.parse
+from ..utils.profiling import profiled
+
+
+@lru_cache(maxsize=4096)
+def _date_timestamp(date: str) -> int:
+    """Parse an ISO date string into the integer epoch used in instance ids."""
+    return int(datetime.fromisoformat(date).timestamp())
+
 
 class PersonalOntologyBuilder(OntologyBuilder):
-    def __init__(self, base_uri: str = "http://example.org/personal/"):
+    def __init__(self, base_uri: str = "http://example.org/personal/",
+                 graph_manager: Optional[GraphManager] = None):
         """
         Initialize PersonalOntologyBuilder with specific namespaces for personal data.
+        
+        Args:
+            base_uri (str): Base URI for the ontology
+            graph_manager (Optional[GraphManager]): Existing manager (e.g. a
+                ShardedGraphManager) or None to create a new one
         """
-        super().__init__()
+        super().__init__(graph_manager)
         
         # Define specific namespaces
         self.health = Namespace(base_uri + "health/")
@@ -32,6 +48,7 @@ class PersonalOntologyBuilder(OntologyBuilder):
         self.gm.graph.bind('person', self.person)
         # Initialize ontology structure
         self._initialize_ontology()
+        self._compile_templates()
         
     def _initialize_ontology(self):
         """Initialize the basic ontology structure with classes and properties."""
@@ -43,9 +60,12 @@ class PersonalOntologyBuilder(OntologyBuilder):
 
         # Health-related classes
         self.create_class(self.health.HealthMetric, label="Health Metric")
-        self.create_class(self.health.PhysicalActivity, label="Physical Activity")
-        self.create_class(self.health.VitalSigns, label="Vital Signs")
-        self.create_class(self.health.Sleep, label="Sleep")
+        self.create_class(self.health.PhysicalActivity, label="Physical Activity",
+                          superclass=self.health.HealthMetric)
+        self.create_class(self.health.VitalSigns, label="Vital Signs",
+                          superclass=self.health.HealthMetric)
+        self.create_class(self.health.Sleep, label="Sleep",
+                          superclass=self.health.HealthMetric)
         
         # Travel-related classes
         self.create_class(self.travel.Booking, label="Travel Booking")
@@ -54,6 +74,8 @@ class PersonalOntologyBuilder(OntologyBuilder):
         self.create_class(self.location.Airport, label="Airport")
         self.create_class(self.location.City, label="City")
         self.create_class(self.travel.Place, label="Travel Place")
+        self.create_class(self.travel.Airline, label="Airline")
+        self.create_class(self.travel.HotelBooking, label="Hotel Booking")
 
         # Properties for person
         self.create_property(self.person.hasHealthData, "ObjectProperty",
@@ -110,7 +132,156 @@ class PersonalOntologyBuilder(OntologyBuilder):
         self.create_property(self.travel.placeInfo, "DatatypeProperty",
                             domain=self.travel.Place,
                            range_=XSD.string)
+        self.create_property(self.travel.placeCity, "ObjectProperty",
+                           domain=self.travel.Place,
+                           range_=self.location.City)
+        self.create_property(self.travel.operatedBy, "ObjectProperty",
+                           domain=self.travel.Flight,
+                           range_=self.travel.Airline)
+        self.create_property(self.travel.airlineName, "DatatypeProperty",
+                           domain=self.travel.Airline,
+                           range_=XSD.string)
+        self.create_property(self.travel.hotel, "ObjectProperty",
+                           domain=self.travel.HotelBooking,
+                           range_=self.travel.Hotel)
+        self.create_property(self.travel.locatedIn, "ObjectProperty",
+                           domain=self.travel.Hotel,
+                           range_=self.location.City)
+        
+        # Properties for shared location entities
+        self.create_property(self.location.airportCode, "DatatypeProperty",
+                           domain=self.location.Airport,
+                           range_=XSD.string)
+        self.create_property(self.location.inCity, "ObjectProperty",
+                           domain=self.location.Airport,
+                           range_=self.location.City)
+        self.create_property(self.location.cityName, "DatatypeProperty",
+                           domain=self.location.City,
+                           range_=XSD.string)
+        self.create_property(self.location.country, "DatatypeProperty",
+                           domain=self.location.City,
+                           range_=XSD.string)
+        
+    def _compile_templates(self):
+        """
+        Resolve predicates and datatypes used by the add_* methods once.
+        
+        Each template is a sequence of (predicate, key path, datatype) entries
+        describing how a field of the simulator's record dict becomes a triple.
+        """
+        # Persons and shared reference entities whose describing triples
+        # have been inserted, and those described in the batch being built;
+        # only an insert moves entities into the first two sets, so a batch
+        # that is built but never inserted does not suppress them
+        self._known_persons = set()
+        self._reference_entities = set()
+        self._batch_entities = set()
+        self._reference_classes = {self.location.City, self.location.Airport,
+                                   self.travel.Airline, self.travel.Hotel}
+        
+        self._health_templates = (
+            ('activity', self.health.PhysicalActivity, (
+                (self.health.hasSteps, ('steps',), XSD.integer),
+                (self.health.hasCaloriesBurned, ('calories_burned',), XSD.integer),
+            )),
+            ('vitals', self.health.VitalSigns, (
+                (self.health.hasHeartRate, ('heart_rate', 'average'), XSD.integer),
+                (self.health.hasBloodPressureSystolic, ('blood_pressure', 'systolic'), XSD.integer),
+                (self.health.hasBloodPressureDiastolic, ('blood_pressure', 'diastolic'), XSD.integer),
+            )),
+            ('sleep', self.health.Sleep, (
+                (self.health.hasDuration, ('sleep', 'duration'), XSD.double),
+                (self.health.hasDeepSleep, ('sleep', 'deep_sleep'), XSD.double),
+                (self.health.hasREMSleep, ('sleep', 'rem_sleep'), XSD.double),
+            )),
+        )
+        
+        # Airports, cities, airlines and hotels are shared reference entities
+        # linked by URI (see _airport_uri and friends), so only per-booking
+        # values remain in the flight and hotel templates.
+        self._flight_template = (
+            (self.travel.flightNumber, ('flight_number',), None),
+            (self.travel.departureDateTime, ('departure', 'datetime'), XSD.dateTime),
+            (self.travel.arrivalDateTime, ('arrival', 'datetime'), XSD.dateTime),
+        )
+        
+        self._hotel_template = (
+            (self.travel.checkInDate, ('check_in',), XSD.dateTime),
+            (self.travel.checkOutDate, ('check_out',), XSD.dateTime),
+            (self.travel.roomType, ('room_type',), None),
+            (self.travel.bookingReference, ('booking_reference',), None),
+        )
+        
+    @staticmethod
+    def _emit_fields(triples: List[Tuple], subject: URIRef,
+                     record: Dict[str, Any], template: Tuple) -> None:
+        """Append the triples described by a field template to a batch."""
+        for predicate, path, datatype in template:
+            value = record
+            for key in path:
+                value = value[key]
+            triples.append((subject, predicate, Literal(value, datatype=datatype)))
+            
+    def _person_uri(self, person_id: str, triples: List[Tuple]) -> URIRef:
+        """
+        Get the URI for a person, adding its type assertion to the batch
+        until the person has been inserted.
+        """
+        person_uri = self.person[f"person_{person_id}"]
+        if self._is_new(person_uri, self._known_persons):
+            triples.append((person_uri, RDF.type, self.person.Person))
+        return person_uri
+        
+    def _is_new(self, uri: URIRef, inserted: set) -> bool:
+        """Whether an entity still needs describing in the batch being built."""
+        if uri in inserted or uri in self._batch_entities:
+            return False
+        self._batch_entities.add(uri)
+        return True
+        
+    @staticmethod
+    def _slug(value: str) -> str:
+        """Turn a display name into a URI-safe local name."""
+        return urllib.parse.quote(value.replace(' ', '_'), safe='')
+        
+    def _city_uri(self, city: str, country: str, triples: List[Tuple]) -> URIRef:
+        """Get the shared location:City node, allocating it on first use."""
+        city_uri = self.location[f"city_{self._slug(country)}_{self._slug(city)}"]
+        if self._is_new(city_uri, self._reference_entities):
+            triples.append((city_uri, RDF.type, self.location.City))
+            triples.append((city_uri, self.location.cityName, Literal(city)))
+            triples.append((city_uri, self.location.country, Literal(country)))
+        return city_uri
         
+    def _airport_uri(self, stop: Dict[str, Any], triples: List[Tuple]) -> URIRef:
+        """Get the shared location:Airport node for a flight's departure or arrival."""
+        airport_uri = self.location[f"airport_{self._slug(stop['airport'])}"]
+        if self._is_new(airport_uri, self._reference_entities):
+            city_uri = self._city_uri(stop['city'], stop['country'], triples)
+            triples.append((airport_uri, RDF.type, self.location.Airport))
+            triples.append((airport_uri, self.location.airportCode, Literal(stop['airport'])))
+            triples.append((airport_uri, self.location.inCity, city_uri))
+        return airport_uri
+        
+    def _airline_uri(self, airline: str, triples: List[Tuple]) -> URIRef:
+        """Get the shared travel:Airline node, allocating it on first use."""
+        airline_uri = self.travel[f"airline_{self._slug(airline)}"]
+        if self._is_new(airline_uri, self._reference_entities):
+            triples.append((airline_uri, RDF.type, self.travel.Airline))
+            triples.append((airline_uri, self.travel.airlineName, Literal(airline)))
+        return airline_uri
+        
+    def _hotel_uri(self, hotel: Dict[str, Any], triples: List[Tuple]) -> URIRef:
+        """Get the shared travel:Hotel node for a hotel chain in a city."""
+        city_uri = self._city_uri(hotel['city'], hotel['country'], triples)
+        hotel_uri = self.travel[f"hotel_{self._slug(hotel['name'])}_{self._slug(hotel['city'])}"]
+        if self._is_new(hotel_uri, self._reference_entities):
+            triples.append((hotel_uri, RDF.type, self.travel.Hotel))
+            triples.append((hotel_uri, self.travel.hasName, Literal(hotel['name'])))
+            triples.append((hotel_uri, self.travel.locatedIn, city_uri))
+        return hotel_uri
+        
+    @profiled('build')
     def add_general_activity(self, person_id: str, date: str):
         """
         Add general activity data to the ontology.
@@ -118,18 +289,25 @@ class PersonalOntologyBuilder(OntologyBuilder):
         Args:
             activity: Currently "general:None" is the only option
         """
-        # Create person instance if not exists
-        person_uri = self.person[f"person_{person_id}"]
-        self.gm.add_triple(person_uri, RDF.type, self.person.Person)
+        self.insert_triples(self.general_activity_triples(person_id, date), person_id)
 
-        timestamp = int(datetime.fromisoformat(date).timestamp())
-        activity_id = self.general[f"activity_{timestamp}"]
-        self.gm.add_triple(activity_id, RDF.type, self.general.Others)
-        self.gm.add_triple(activity_id, self.general.hasActivity, self.general.OtherActivity)
+    @profiled('build')
+    def general_activity_triples(self, person_id: str, date: str) -> List[Tuple]:
+        """Build the triples for a general activity without adding them."""
+        triples = []
+        self._batch_entities = set()
+        person_uri = self._person_uri(person_id, triples)
+
+        timestamp = _date_timestamp(date)
+        activity_id = self.general[f"activity_{person_id}_{timestamp}"]
+        triples.append((activity_id, RDF.type, self.general.Others))
+        triples.append((activity_id, self.general.hasActivity, self.general.OtherActivity))
         
         # Link activity to person
-        self.gm.add_triple(person_uri, self.person.hasActivity, activity_id)
+        triples.append((person_uri, self.person.hasActivity, activity_id))
+        return triples
 
+    @profiled('build')
     def add_health_data(self, data: Dict[str, Any], person_id: str):
         """
         Add daily health data to the ontology.
@@ -138,129 +316,125 @@ class PersonalOntologyBuilder(OntologyBuilder):
             data: Dictionary containing health metrics
             person_id: Identifier for the person
         """
-        # Create person instance if not exists
-        person_uri = self.person[f"person_{person_id}"]
-        self.gm.add_triple(person_uri, RDF.type, self.person.Person)
+        self.insert_triples(self.health_triples(data, person_id), person_id)
 
-        date = data['date'] 
-        timestamp = int(datetime.fromisoformat(date).timestamp())
-        metrics_id = self.health[f"metrics_{timestamp}"]
-        
-        # Add physical activity
-        activity_id = self.health[f"activity_{timestamp}"]
-        self.gm.add_triple(activity_id, RDF.type, self.health.PhysicalActivity)
-        self.gm.add_triple(activity_id, self.health.hasSteps, data['steps'])
-        self.gm.add_triple(activity_id, self.health.hasCaloriesBurned, data['calories_burned'])
-        self.gm.add_triple(activity_id, self.health.timestamp, date, XSD.dateTime.toPython())
-        
-        # Add vital signs
-        vitals_id = self.health[f"vitals_{timestamp}"]
-        self.gm.add_triple(vitals_id, RDF.type, self.health.VitalSigns)
-        self.gm.add_triple(vitals_id, self.health.hasHeartRate, data['heart_rate']['average'])
-        self.gm.add_triple(vitals_id, self.health.hasBloodPressureSystolic,
-                          data['blood_pressure']['systolic'])
-        self.gm.add_triple(vitals_id, self.health.hasBloodPressureDiastolic,
-                          data['blood_pressure']['diastolic'])
-        self.gm.add_triple(vitals_id, self.health.timestamp, date, XSD.dateTime.toPython())
-        
-        # Add sleep data
-        sleep_id = self.health[f"sleep_{timestamp}"]
-        self.gm.add_triple(sleep_id, RDF.type, self.health.Sleep)
-        self.gm.add_triple(sleep_id, self.health.hasDuration, data['sleep']['duration'])
-        self.gm.add_triple(sleep_id, self.health.hasDeepSleep, data['sleep']['deep_sleep'])
-        self.gm.add_triple(sleep_id, self.health.hasREMSleep, data['sleep']['rem_sleep'])
-        self.gm.add_triple(sleep_id, self.health.timestamp, date, XSD.dateTime.toPython())
+    @profiled('build')
+    def health_triples(self, data: Dict[str, Any], person_id: str) -> List[Tuple]:
+        """Build the triples for a daily health record without adding them."""
+        triples = []
+        self._batch_entities = set()
+        person_uri = self._person_uri(person_id, triples)
 
-        # Link all health data to person
-        self.gm.add_triple(person_uri, self.person.hasHealthData, activity_id)
-        self.gm.add_triple(person_uri, self.person.hasHealthData, vitals_id)
-        self.gm.add_triple(person_uri, self.person.hasHealthData, sleep_id)
+        date = data['date'] 
+        timestamp = _date_timestamp(date)
+        date_literal = Literal(date, datatype=XSD.dateTime)
+        
+        # Add physical activity, vital signs and sleep data, each linked to the person
+        for prefix, class_uri, template in self._health_templates:
+            metric_id = self.health[f"{prefix}_{person_id}_{timestamp}"]
+            triples.append((metric_id, RDF.type, class_uri))
+            self._emit_fields(triples, metric_id, data, template)
+            triples.append((metric_id, self.health.timestamp, date_literal))
+            triples.append((person_uri, self.person.hasHealthData, metric_id))
+            
+        return triples
 
+    @profiled('build')
     def add_travel_booking(self, booking_data: Dict[str, Any], person_id: str) -> None:
         """Add travel booking data to the ontology."""
-        # Create booking instance
-        # print(booking_data)
-        person_uri = self.person[f"person_{person_id}"]
-        self.gm.add_triple(person_uri, RDF.type, self.person.Person)
+        self.insert_triples(self.travel_triples(booking_data, person_id), person_id)
+        
+    def insert_triples(self, triples: List[Tuple], person_id: str) -> None:
+        """
+        Insert a batch built by the *_triples methods for one person.
         
+        Triples describing shared reference entities (airports, cities,
+        airlines, hotels) are broadcast, the rest is added with the person
+        as partition key. Only once the batch is in the graph are its person
+        and reference entities marked as inserted, so later batches stop
+        repeating their describing triples.
+        
+        Args:
+            triples: Batch from health_triples, travel_triples or
+                general_activity_triples (or a concatenation of them)
+            person_id: Identifier for the person the batch belongs to
+        """
+        persons, entities = set(), set()
+        for s, p, o in triples:
+            if p == RDF.type:
+                if o == self.person.Person:
+                    persons.add(s)
+                elif o in self._reference_classes:
+                    entities.add(s)
+        
+        # Shared reference entities are not owned by the person; only newly
+        # described ones have triples of their own in a batch
+        shared = [t for t in triples if t[0] in entities]
+        if shared:
+            self.gm.add_triples(shared, broadcast=True)
+            triples = [t for t in triples if t[0] not in entities]
+        self.gm.add_triples(triples, partition_key=person_id)
+        
+        self._known_persons |= persons
+        self._reference_entities |= entities
+
+    @profiled('build')
+    def travel_triples(self, booking_data: Dict[str, Any], person_id: str) -> List[Tuple]:
+        """Build the triples for a travel booking without adding them."""
+        triples = []
+        self._batch_entities = set()
+        person_uri = self._person_uri(person_id, triples)
+        
+        # Create booking instance
         booking_id = booking_data['booking_id']
         booking_uri = self.travel[f"booking_{booking_id}"]
-        self.gm.add_triple(booking_uri, RDF.type, self.travel.Booking)
-        self.gm.add_triple(booking_uri, self.travel.bookingId, Literal(booking_id))
-        self.gm.add_triple(booking_uri, self.travel.bookingDate, Literal(booking_data['booking_date'], datatype=XSD.dateTime))
+        triples.append((booking_uri, RDF.type, self.travel.Booking))
+        triples.append((booking_uri, self.travel.bookingId, Literal(booking_id)))
+        triples.append((booking_uri, self.travel.bookingDate,
+                        Literal(booking_data['booking_date'], datatype=XSD.dateTime)))
         
         # Link booking to person
-        self.gm.add_triple(person_uri, self.person.hasTravelBooking, booking_uri)
-        
-        # Add outbound flight details
-        outbound_flight_uri = self.travel[f"flight_{booking_data['flight']['flight_number']}"]
-        self.gm.add_triple(outbound_flight_uri, RDF.type, self.travel.Flight)
-        self.gm.add_triple(outbound_flight_uri, self.travel.flightNumber, Literal(booking_data['flight']['flight_number']))
-        self.gm.add_triple(outbound_flight_uri, self.travel.airline, Literal(booking_data['flight']['airline']))
-        
-        # Add departure details
-        departure = booking_data['flight']['departure']
-        self.gm.add_triple(outbound_flight_uri, self.travel.departureAirport, Literal(departure['airport']))
-        self.gm.add_triple(outbound_flight_uri, self.travel.departureCity, Literal(departure['city']))
-        self.gm.add_triple(outbound_flight_uri, self.travel.departureCountry, Literal(departure['country']))
-        self.gm.add_triple(outbound_flight_uri, self.travel.departureDateTime, Literal(departure['datetime'], datatype=XSD.dateTime))
-        
-        # Add arrival details
-        arrival = booking_data['flight']['arrival']
-        self.gm.add_triple(outbound_flight_uri, self.travel.arrivalAirport, Literal(arrival['airport']))
-        self.gm.add_triple(outbound_flight_uri, self.travel.arrivalCity, Literal(arrival['city']))
-        self.gm.add_triple(outbound_flight_uri, self.travel.arrivalCountry, Literal(arrival['country']))
-        self.gm.add_triple(outbound_flight_uri, self.travel.arrivalDateTime, Literal(arrival['datetime'], datatype=XSD.dateTime))
-        
-        # Link outbound flight to booking
-        self.gm.add_triple(booking_uri, self.travel.hasOutboundFlight, outbound_flight_uri)
-        
-        # Add return flight details if present
-        if 'return_flight' in booking_data:
-            return_flight_uri = self.travel[f"flight_{booking_data['return_flight']['flight_number']}"]
-            self.gm.add_triple(return_flight_uri, RDF.type, self.travel.Flight)
-            self.gm.add_triple(return_flight_uri, self.travel.flightNumber, Literal(booking_data['return_flight']['flight_number']))
-            self.gm.add_triple(return_flight_uri, self.travel.airline, Literal(booking_data['return_flight']['airline']))
-            
-            # Add return departure details
-            return_departure = booking_data['return_flight']['departure']
-            self.gm.add_triple(return_flight_uri, self.travel.departureAirport, Literal(return_departure['airport']))
-            self.gm.add_triple(return_flight_uri, self.travel.departureCity, Literal(return_departure['city']))
-            self.gm.add_triple(return_flight_uri, self.travel.departureCountry, Literal(return_departure['country']))
-            self.gm.add_triple(return_flight_uri, self.travel.departureDateTime, Literal(return_departure['datetime'], datatype=XSD.dateTime))
-            
-            # Add return arrival details
-            return_arrival = booking_data['return_flight']['arrival']
-            self.gm.add_triple(return_flight_uri, self.travel.arrivalAirport, Literal(return_arrival['airport']))
-            self.gm.add_triple(return_flight_uri, self.travel.arrivalCity, Literal(return_arrival['city']))
-            self.gm.add_triple(return_flight_uri, self.travel.arrivalCountry, Literal(return_arrival['country']))
-            self.gm.add_triple(return_flight_uri, self.travel.arrivalDateTime, Literal(return_arrival['datetime'], datatype=XSD.dateTime))
-            
-            # Link return flight to booking
-            self.gm.add_triple(booking_uri, self.travel.hasReturnFlight, return_flight_uri)
+        triples.append((person_uri, self.person.hasTravelBooking, booking_uri))
+        
+        # Add outbound and (if present) return flight details. Flight numbers
+        # repeat across bookings, so flight instances are keyed by booking.
+        for key, leg, link in (('flight', 'outbound', self.travel.hasOutboundFlight),
+                               ('return_flight', 'return', self.travel.hasReturnFlight)):
+            flight = booking_data.get(key)
+            if flight is None:
+                continue
+            flight_uri = self.travel[f"flight_{booking_id}_{leg}"]
+            triples.append((flight_uri, RDF.type, self.travel.Flight))
+            self._emit_fields(triples, flight_uri, flight, self._flight_template)
+            triples.append((flight_uri, self.travel.operatedBy,
+                            self._airline_uri(flight['airline'], triples)))
+            triples.append((flight_uri, self.travel.hasDeparture,
+                            self._airport_uri(flight['departure'], triples)))
+            triples.append((flight_uri, self.travel.hasArrival,
+                            self._airport_uri(flight['arrival'], triples)))
+            triples.append((booking_uri, link, flight_uri))
         
         # Add hotel details
         hotel = booking_data['hotel']
-        hotel_uri = self.travel[f"hotel_booking_{booking_id}"]
-        self.gm.add_triple(hotel_uri, RDF.type, self.travel.HotelBooking)
-        self.gm.add_triple(hotel_uri, self.travel.hotelName, Literal(hotel['name']))
-        self.gm.add_triple(hotel_uri, self.travel.checkInDate, Literal(hotel['check_in'], datatype=XSD.dateTime))
-        self.gm.add_triple(hotel_uri, self.travel.checkOutDate, Literal(hotel['check_out'], datatype=XSD.dateTime))
-        self.gm.add_triple(hotel_uri, self.travel.city, Literal(hotel['city']))
-        self.gm.add_triple(hotel_uri, self.travel.country, Literal(hotel['country']))
-        self.gm.add_triple(hotel_uri, self.travel.roomType, Literal(hotel['room_type']))
-        self.gm.add_triple(hotel_uri, self.travel.bookingReference, Literal(hotel['booking_reference']))
+        hotel_booking_uri = self.travel[f"hotel_booking_{booking_id}"]
+        triples.append((hotel_booking_uri, RDF.type, self.travel.HotelBooking))
+        self._emit_fields(triples, hotel_booking_uri, hotel, self._hotel_template)
+        triples.append((hotel_booking_uri, self.travel.hotel, self._hotel_uri(hotel, triples)))
         
         # Link hotel booking to travel booking
-        self.gm.add_triple(booking_uri, self.travel.hasHotelBooking, hotel_uri)
+        triples.append((booking_uri, self.travel.hasHotelBooking, hotel_booking_uri))
 
         # Add Place information
+        arrival = booking_data['flight']['arrival']
         place_id = self.travel[f"place_{booking_id}"]
-        self.gm.add_triple(place_id, RDF.type, self.travel.Place)
-        self.gm.add_triple(place_id, self.travel.placeName, 
-                          Literal(booking_data['flight']['arrival']['city'], datatype=XSD.string))
-        self.gm.add_triple(place_id, self.travel.placeTime,
-                          booking_data['flight']['arrival']['datetime'], XSD.dateTime.toPython())
+        triples.append((place_id, RDF.type, self.travel.Place))
+        triples.append((place_id, self.travel.placeName,
+                        Literal(arrival['city'], datatype=XSD.string)))
+        triples.append((place_id, self.travel.placeTime,
+                        Literal(arrival['datetime'], datatype=XSD.dateTime)))
+        triples.append((place_id, self.travel.placeCity,
+                        self._city_uri(arrival['city'], arrival['country'], triples)))
         
         # Link Place to Person
-        self.gm.add_triple(person_uri, self.person.travelTo, place_id)
\ No newline at end of file
+        triples.append((person_uri, self.person.travelTo, place_id))
+        return triples
@@ -3,15 +3,35 @@ Query manager for retrieving temporal data from the knowledge graph.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
 from rdflib import Graph, Namespace, URIRef, Literal, XSD
 from rdflib.namespace import RDF, RDFS
+from ..utils.profiling import profiled
+
+# Health property local name -> metric name used by the simulators
+HEALTH_PROPERTY_METRICS = {
+    'hasSteps': 'steps',
+    'hasCaloriesBurned': 'calories_burned',
+    'hasHeartRate': 'heart_rate_average',
+    'hasBloodPressureSystolic': 'blood_pressure_systolic',
+    'hasBloodPressureDiastolic': 'blood_pressure_diastolic',
+    'hasDuration': 'sleep_duration',
+    'hasDeepSleep': 'deep_sleep',
+    'hasREMSleep': 'rem_sleep'
+}
+
+# Up to this many persons, get_health_arrays looks up each person's records
+# instead of scanning every health property across the graph
+PERSON_LOOKUP_MAX = 32
 
 class QueryManager:
     def __init__(self, graph):
         """Initialize the query manager with an RDF graph."""
         self.graph = graph
         self.base_uri = "http://example.org/personal/"
+        self.health = Namespace(self.base_uri + "health/")
+        self.person = Namespace(self.base_uri + "person/")
         self.prefixes = """
             PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
             PREFIX person: <http://example.org/personal/person/>
@@ -21,6 +41,7 @@ class QueryManager:
             PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
         """
 
+    @profiled('query')
     def get_health_data(self, start_date: datetime, end_date: datetime, person_uri: str) -> List[Dict[str, any]]:
         """Query health data for a person within a date range."""
         # First, let's just get all health data for the person
@@ -49,6 +70,7 @@ class QueryManager:
             })
         return results
 
+    @profiled('query')
     def get_travel_data(self, start_date: datetime, end_date: datetime, person_uri: str) -> List[Dict[str, any]]:
         """Query travel bookings for a person within a date range."""
         # First, let's just get all travel bookings for the person
@@ -76,6 +98,7 @@ class QueryManager:
             })
         return results
 
+    @profiled('query')
     def get_combined_timeline(self, start_date: datetime, end_date: datetime, person_uri: str) -> List[Dict[str, any]]:
         """Get a combined timeline of health and travel events."""
         health_data = self.get_health_data(start_date, end_date, person_uri)
@@ -101,4 +124,133 @@ class QueryManager:
             
         # Sort by date
         timeline.sort(key=lambda x: x['timestamp'])
-        return timeline 
\ No newline at end of file
+        return timeline 
+
+    def _person_uri(self, person: str) -> URIRef:
+        """Accept a person URI or a simulator person id."""
+        if person.startswith('http'):
+            return URIRef(person)
+        return self.person[f"person_{person}"]
+
+    @profiled('query')
+    def get_health_arrays(self, persons: Union[str, Sequence[str]],
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          metrics: Optional[Sequence[str]] = None) -> Dict[str, any]:
+        """
+        Extract health metrics as NumPy arrays aligned on a daily date axis.
+
+        Walks the typed-literal triples directly and converts the lexical
+        values in bulk instead of going through SPARQL rows. For up to
+        PERSON_LOOKUP_MAX persons the walk starts from each person's health
+        records, so its cost follows their data rather than the graph size;
+        for more, one triple pattern per health property covers all
+        requested persons together.
+
+        Args:
+            persons: Person URI or simulator person id, or a sequence of them
+            start_date: First day of the date axis (defaults to the first observed day)
+            end_date: Last day of the date axis (defaults to the last observed day)
+            metrics: Metric names to extract (defaults to all of HEALTH_PROPERTY_METRICS)
+
+        Returns:
+            Dict with 'persons' (URIs), 'dates' (datetime64[D] array) and
+            'metrics' mapping each metric to a float array of shape
+            (persons, days), NaN where nothing was recorded. For a single
+            person given as a string, metric arrays have shape (days,).
+        """
+        single = isinstance(persons, str)
+        person_uris = [self._person_uri(p) for p in ([persons] if single else persons)]
+        row_of = {uri: i for i, uri in enumerate(person_uris)}
+        wanted = list(metrics) if metrics is not None else list(HEALTH_PROPERTY_METRICS.values())
+        properties = {self.health[name]: metric for name, metric in HEALTH_PROPERTY_METRICS.items()
+                      if metric in wanted}
+        unknown = set(wanted) - set(properties.values())
+        if unknown:
+            raise ValueError(f"Unknown health metrics: {sorted(unknown)}")
+
+        if len(row_of) <= PERSON_LOOKUP_MAX:
+            node_row, node_day, found = self._health_values_by_person(row_of, properties)
+        else:
+            node_row, node_day, found = self._health_values_by_property(row_of, properties)
+
+        nodes = list(node_day)
+        days = np.array([node_day[n] for n in nodes], dtype='datetime64[D]')
+        first = np.datetime64(start_date.date(), 'D') if start_date else (days.min() if len(days) else None)
+        last = np.datetime64(end_date.date(), 'D') if end_date else (days.max() if len(days) else None)
+        if first is None or last is None:
+            dates = np.array([], dtype='datetime64[D]')
+        else:
+            dates = np.arange(first, last + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+        num_days = len(dates)
+
+        node_index = {n: i for i, n in enumerate(nodes)}
+        node_rows = np.array([node_row[n] for n in nodes], dtype=np.int64)
+        node_cols = (days - first).astype(np.int64) if num_days else np.zeros(len(nodes), dtype=np.int64)
+
+        arrays = {}
+        for prop, metric in properties.items():
+            value_nodes, lexicals = found[prop]
+            array = np.full((len(person_uris), num_days), np.nan)
+            if value_nodes:
+                positions = np.array([node_index[n] for n in value_nodes], dtype=np.int64)
+                rows, cols = node_rows[positions], node_cols[positions]
+                inside = (cols >= 0) & (cols < num_days)
+                values = np.array(lexicals, dtype=float)
+                array[rows[inside], cols[inside]] = values[inside]
+            arrays[metric] = array[0] if single else array
+
+        return {
+            'persons': [str(uri) for uri in person_uris],
+            'dates': dates,
+            'metrics': arrays
+        }
+
+    def _health_values_by_person(self, row_of: Dict[URIRef, int],
+                                 properties: Dict[URIRef, str]) -> Tuple[Dict, Dict, Dict]:
+        """
+        Collect health record values starting from the requested persons.
+
+        Returns:
+            Tuple[Dict, Dict, Dict]: Health record node -> person row, node ->
+            day (YYYY-MM-DD), and property -> (record nodes, lexical values)
+        """
+        node_row, node_day = {}, {}
+        found = {prop: ([], []) for prop in properties}
+        for person, row in row_of.items():
+            for _, _, node in self.graph.triples((person, self.person.hasHealthData, None)):
+                values = []
+                for _, prop, value in self.graph.triples((node, None, None)):
+                    if prop == self.health.timestamp:
+                        node_day[node] = str(value)[:10]
+                    elif prop in found:
+                        values.append((prop, str(value)))
+                if node not in node_day:
+                    continue
+                node_row[node] = row
+                for prop, lexical in values:
+                    found[prop][0].append(node)
+                    found[prop][1].append(lexical)
+        return node_row, node_day, found
+
+    def _health_values_by_property(self, row_of: Dict[URIRef, int],
+                                   properties: Dict[URIRef, str]) -> Tuple[Dict, Dict, Dict]:
+        """Like _health_values_by_person, with one graph-wide pattern per predicate."""
+        node_row = {}
+        for person, _, node in self.graph.triples((None, self.person.hasHealthData, None)):
+            if person in row_of:
+                node_row[node] = row_of[person]
+        node_day = {}
+        for node, _, timestamp in self.graph.triples((None, self.health.timestamp, None)):
+            if node in node_row:
+                node_day[node] = str(timestamp)[:10]
+
+        found = {}
+        for prop in properties:
+            value_nodes, lexicals = [], []
+            for node, _, value in self.graph.triples((None, prop, None)):
+                if node in node_day:
+                    value_nodes.append(node)
+                    lexicals.append(str(value))
+            found[prop] = (value_nodes, lexicals)
+        return node_row, node_day, found
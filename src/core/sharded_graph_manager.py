@@ -0,0 +1,453 @@
+"""
+Process-sharded GraphManager that partitions triples across worker processes.
+"""
+
+import heapq
+import multiprocessing
+import re
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from rdflib import Graph, Variable
+from rdflib.namespace import RDF, RDFS, OWL
+from rdflib.query import ResultRow
+from rdflib.term import Node
+from .graph_manager import GraphManager
+from .memory import combine_memory_usage, graph_memory_usage
+from ..utils.profiling import profiled
+
+Triple = Tuple[Node, Node, Node]
+
+# Triples with these predicates describe the ontology and are replicated to
+# every shard, so schema joins never cross shard boundaries
+SCHEMA_PREDICATES = {
+    RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, RDFS.range,
+    OWL.equivalentClass, OWL.inverseOf, OWL.onProperty
+}
+SCHEMA_TYPES = {
+    OWL.Class, RDFS.Class, OWL.ObjectProperty, OWL.DatatypeProperty,
+    OWL.FunctionalProperty, OWL.SymmetricProperty, OWL.TransitiveProperty,
+    OWL.Restriction, RDF.Property
+}
+
+_AGGREGATE = re.compile(r'\bGROUP\s+BY\b|\b(COUNT|SUM|AVG|MIN|MAX|SAMPLE|GROUP_CONCAT)\s*\(',
+                        re.IGNORECASE)
+_ORDER_BY = re.compile(r'\bORDER\s+BY\b(.*?)(?=\bLIMIT\b|\bOFFSET\b|$)',
+                       re.IGNORECASE | re.DOTALL)
+_ORDER_TERM = re.compile(r'(?:(ASC|DESC)\s*\(\s*\?(\w+)\s*\)|\?(\w+))', re.IGNORECASE)
+_LIMIT = re.compile(r'\bLIMIT\s+(\d+)', re.IGNORECASE)
+_OFFSET = re.compile(r'\bOFFSET\s+(\d+)', re.IGNORECASE)
+_DISTINCT = re.compile(r'\bSELECT\s+(DISTINCT|REDUCED)\b', re.IGNORECASE)
+
+def _shard_worker(conn) -> None:
+    """Serve one shard: an in-memory graph driven by commands over a pipe."""
+    graph = Graph()
+    while True:
+        command, payload = conn.recv()
+        if command == 'stop':
+            conn.close()
+            return
+        if command == 'add':
+            graph.addN((s, p, o, graph) for s, p, o in payload)
+            continue
+        if command == 'remove':
+            for triple in payload:
+                graph.remove(triple)
+            continue
+
+        # Commands below answer with ('ok', result) or ('error', message)
+        try:
+            if command == 'query':
+                result = graph.query(payload)
+                if result.type != 'SELECT':
+                    raise ValueError("Only SELECT queries can be sharded")
+                reply = ([str(v) for v in result.vars], [tuple(row) for row in result])
+            elif command == 'triples':
+                reply = list(graph.triples(payload))
+            elif command == 'len':
+                reply = len(graph)
+            elif command == 'dump':
+                reply = list(graph)
+            elif command == 'memory':
+                reply = graph_memory_usage(graph)
+            else:
+                raise ValueError(f"Unknown shard command: {command}")
+            conn.send(('ok', reply))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+class ShardedGraphManager(GraphManager):
+    def __init__(self, base_uri: str = "http://example.org/", num_shards: int = 4):
+        """
+        Initialize a GraphManager whose triples live in worker processes.
+
+        Each shard is a separate process holding its own rdflib Graph. Batches
+        added with a partition_key (e.g. a person id) go to the shard owning
+        that key, so all of a person's data stays together; other triples are
+        routed by a hash of their subject, and ontology schema triples as well
+        as batches flagged with broadcast=True are replicated to every shard.
+
+        SELECT queries are sent to every shard and run in parallel; partial
+        results are concatenated, de-duplicated for DISTINCT queries, and
+        k-way merged for ORDER BY on plain variables. A query is only complete
+        if each solution can be found within a single shard, which holds for
+        the per-person queries in QueryManager. Aggregates and GROUP BY cannot
+        be merged and are rejected.
+
+        self.graph is kept for namespace bindings only and holds no data.
+        Listeners are not supported, since novelty of a triple is only known
+        inside its shard; InformationGainAnalyzer, ConstraintValidator and
+        RDFSMaterializer therefore reject a sharded manager. memory_usage
+        gathers the accounting of every shard, while track_allocations only
+        sees this process, i.e. the building of triples but not the shard
+        stores.
+
+        Args:
+            base_uri (str): Base URI for the knowledge graph
+            num_shards (int): Number of worker processes
+        """
+        super().__init__(base_uri)
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+
+        self.num_shards = num_shards
+        self._connections = []
+        self._processes = []
+        for _ in range(num_shards):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    def shard_of(self, key: Node) -> int:
+        """
+        Shard owning a partition key or subject.
+
+        Uses CRC32 rather than hash() so routing is stable across processes
+        and interpreter runs.
+
+        Args:
+            key: Partition key or subject term
+
+        Returns:
+            int: Shard index
+        """
+        return zlib.crc32(str(key).encode('utf-8')) % self.num_shards
+
+    @staticmethod
+    def _is_schema(triple: Triple) -> bool:
+        s, p, o = triple
+        return p in SCHEMA_PREDICATES or (p == RDF.type and o in SCHEMA_TYPES)
+
+    def add_listener(self, listener) -> None:
+        """Reject listeners; see the class documentation."""
+        raise TypeError("Listeners are not supported on a sharded graph")
+
+    @profiled('insert')
+    def add_triple(self, subject: str, predicate: str, obj, datatype: Optional[str] = None) -> None:
+        """
+        Add a triple, routed like a single-triple add_triples batch.
+
+        Args:
+            subject (str): Subject of the triple
+            predicate (str): Predicate of the triple
+            obj: Object of the triple
+            datatype (Optional[str]): XSD datatype for literal values
+        """
+        self.add_triples([self._coerce_triple(subject, predicate, obj, datatype)])
+
+    @profiled('insert')
+    def add_triples(self, triples: Iterable[Triple],
+                    partition_key: Optional[str] = None,
+                    broadcast: bool = False) -> None:
+        """
+        Route a batch of triples to their shards.
+
+        Adds are not acknowledged; a later query on the same shard is
+        processed after them, so reads always see earlier writes.
+
+        Args:
+            triples (Iterable[Triple]): Triples to add
+            partition_key (Optional[str]): Owner of the whole batch; if omitted
+                each triple is routed by its subject
+            broadcast (bool): Replicate the batch to every shard
+        """
+        triples = list(triples)
+        if not triples:
+            return
+        self.version += 1
+        if broadcast:
+            self._broadcast(('add', triples))
+            return
+
+        batches = [[] for _ in range(self.num_shards)]
+        shared = []
+        owner = self.shard_of(partition_key) if partition_key is not None else None
+        for triple in triples:
+            if self._is_schema(triple):
+                shared.append(triple)
+            elif owner is not None:
+                batches[owner].append(triple)
+            else:
+                batches[self.shard_of(triple[0])].append(triple)
+
+        if shared:
+            self._broadcast(('add', shared))
+        for conn, batch in zip(self._connections, batches):
+            if batch:
+                conn.send(('add', batch))
+
+    @profiled('insert')
+    def remove_triples(self, triples: Iterable[Triple]) -> None:
+        """
+        Remove triples from every shard that may hold them.
+
+        Since the partition key of the original batch is not known, removals
+        are sent to all shards.
+
+        Args:
+            triples (Iterable[Triple]): Triples to remove
+        """
+        triples = list(triples)
+        if triples:
+            self.version += 1
+            self._broadcast(('remove', triples))
+
+    def _broadcast(self, message: Tuple) -> None:
+        for conn in self._connections:
+            conn.send(message)
+
+    def _scatter(self, command: str, payload=None) -> List:
+        """Send a command to all shards, then gather their replies in shard order."""
+        self._broadcast((command, payload))
+        replies = [conn.recv() for conn in self._connections]
+        errors = [message for status, message in replies if status == 'error']
+        if errors:
+            raise RuntimeError(f"Shard query failed: {errors[0]}")
+        return [result for _, result in replies]
+
+    @profiled('query')
+    def query(self, sparql_query: str) -> List[ResultRow]:
+        """
+        Scatter a SELECT query to all shards and merge the results.
+
+        Rows support attribute access (row.date) like rdflib query results,
+        so the manager can be handed to QueryManager in place of a Graph.
+
+        Args:
+            sparql_query (str): SPARQL SELECT query
+
+        Returns:
+            List[ResultRow]: Merged result rows
+        """
+        if _AGGREGATE.search(sparql_query):
+            raise ValueError("Aggregates and GROUP BY cannot be merged across shards")
+
+        order = _order_spec(sparql_query)
+        limit = _LIMIT.search(sparql_query)
+        offset = _OFFSET.search(sparql_query)
+        limit = int(limit.group(1)) if limit else None
+        offset = int(offset.group(1)) if offset else 0
+
+        # Each shard must return enough rows to cover the global window
+        shard_query = _OFFSET.sub('', sparql_query)
+        if limit is not None:
+            shard_query = _LIMIT.sub(f'LIMIT {limit + offset}', shard_query)
+
+        partials = self._scatter('query', shard_query)
+        names = partials[0][0]
+
+        if order:
+            positions = [(names.index(var), descending) for var, descending in order]
+            rows = heapq.merge(*(rows for _, rows in partials),
+                               key=lambda row: _SortKey(row, positions))
+        else:
+            rows = (row for _, shard_rows in partials for row in shard_rows)
+        if _DISTINCT.search(sparql_query):
+            rows = dict.fromkeys(rows)
+
+        rows = list(rows)
+        end = offset + limit if limit is not None else None
+        rows = rows[offset:end]
+
+        labels = [Variable(name) for name in names]
+        return [ResultRow(dict(zip(labels, row)), labels) for row in rows]
+
+    @profiled('query')
+    def query_graph(self, sparql_query: str) -> List[Dict]:
+        """
+        Query all shards using SPARQL.
+
+        Args:
+            sparql_query (str): SPARQL SELECT query string
+
+        Returns:
+            List[Dict]: Query results as a list of dictionaries
+        """
+        results = []
+        for row in self.query(sparql_query):
+            results.append({Variable(var).toPython(): value.toPython()
+                            for var, value in row.asdict().items()})
+        return results
+
+    def triples(self, pattern: Tuple[Optional[Node], Optional[Node], Optional[Node]]) -> Iterator[Triple]:
+        """
+        Match a triple pattern on all shards.
+
+        Replicated triples are reported once.
+
+        Args:
+            pattern: (subject, predicate, object), None acting as a wildcard
+
+        Returns:
+            Iterator[Triple]: Matching triples
+        """
+        seen = set()
+        for shard_triples in self._scatter('triples', pattern):
+            for triple in shard_triples:
+                if triple not in seen:
+                    seen.add(triple)
+                    yield triple
+
+    def shard_sizes(self) -> List[int]:
+        """Number of triples held by each shard, replicated ones included."""
+        return self._scatter('len')
+
+    def memory_usage(self) -> Dict:
+        """
+        Estimate the memory held by all shards, by component.
+
+        Replicated triples are stored, and counted, once per shard; bytes
+        per triple are relative to the distinct triples.
+
+        Returns:
+            Dict: Summed usage (see memory.graph_memory_usage), with the
+            per-shard usages under 'shards'
+        """
+        shards = self._scatter('memory')
+        usage = combine_memory_usage(shards, len(self))
+        usage['shards'] = shards
+        return usage
+
+    def __len__(self) -> int:
+        return len(set(self.triples((None, None, None))))
+
+    def to_graph(self) -> Graph:
+        """
+        Gather all shards into one local Graph.
+
+        Returns:
+            Graph: Union of the shards, with this manager's namespace bindings
+        """
+        graph = Graph()
+        for prefix, namespace in self.graph.namespaces():
+            graph.bind(prefix, namespace)
+        for shard_triples in self._scatter('dump'):
+            graph.addN((s, p, o, graph) for s, p, o in shard_triples)
+        return graph
+
+    @profiled('serialization')
+    def export_graph(self, format: str = 'turtle', file_path: Optional[str] = None) -> Optional[str]:
+        """
+        Export the union of all shards in the specified format.
+
+        Args:
+            format (str): Format to export (turtle, xml, n3, etc.)
+            file_path (Optional[str]): Path to save the exported graph
+
+        Returns:
+            Optional[str]: String representation of the graph if no file_path is provided
+        """
+        graph = self.to_graph()
+        if file_path:
+            graph.serialize(destination=file_path, format=format)
+            return None
+        return graph.serialize(format=format)
+
+    @profiled('serialization')
+    def import_graph(self, file_path: str, format: str = 'turtle') -> None:
+        """
+        Import a graph from a file, routing its triples by subject.
+
+        Args:
+            file_path (str): Path to the file to import
+            format (str): Format of the input file
+        """
+        graph = Graph()
+        graph.parse(file_path, format=format)
+        self.add_triples(graph)
+
+    def get_all_triples(self) -> List[Tuple[str, str, str]]:
+        """
+        Get all triples from all shards.
+
+        Returns:
+            List[Tuple[str, str, str]]: List of all triples
+        """
+        return [(str(s), str(p), str(o)) for s, p, o in self.triples((None, None, None))]
+
+    def close(self) -> None:
+        """Stop the worker processes; the manager is unusable afterwards."""
+        for conn, process in zip(self._connections, self._processes):
+            try:
+                conn.send(('stop', None))
+                conn.close()
+            except (OSError, ValueError):
+                pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def _order_spec(sparql_query: str) -> List[Tuple[str, bool]]:
+    """
+    Parse the ORDER BY clause into (variable, descending) pairs.
+
+    Only plain variables, optionally wrapped in ASC()/DESC(), can be merged.
+    """
+    match = _ORDER_BY.search(sparql_query)
+    if not match:
+        return []
+    clause = match.group(1).strip()
+    spec = []
+    for direction, wrapped, plain in _ORDER_TERM.findall(clause):
+        spec.append((wrapped or plain, direction.upper() == 'DESC'))
+    if not spec or _ORDER_TERM.sub('', clause).strip(' \t\n}'):
+        raise ValueError(f"Cannot merge ORDER BY expression across shards: {clause}")
+    return spec
+
+def _term_key(term: Optional[Node]) -> Tuple:
+    """Sort key approximating SPARQL ordering: unbound first, then by value."""
+    if term is None:
+        return (0,)
+    value = term.toPython()
+    if isinstance(value, Node):
+        value = str(value)
+    return (1, value)
+
+class _SortKey:
+    """Row key for heapq.merge honouring per-variable ASC/DESC."""
+    __slots__ = ('keys', 'directions')
+
+    def __init__(self, row: Tuple, positions: List[Tuple[int, bool]]):
+        self.keys = [_term_key(row[i]) for i, _ in positions]
+        self.directions = [descending for _, descending in positions]
+
+    def __lt__(self, other: '_SortKey') -> bool:
+        for a, b, descending in zip(self.keys, other.keys, self.directions):
+            if a == b:
+                continue
+            try:
+                less = a < b
+            except TypeError:
+                less = str(a) < str(b)
+            return not less if descending else less
+        return False
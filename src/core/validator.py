@@ -0,0 +1,294 @@
+"""
+Streaming validation of ontology value constraints at ingest time.
+"""
+
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from rdflib import Literal
+from rdflib.namespace import RDF
+from rdflib.term import Node
+from .graph_manager import GraphManager
+from .sharded_graph_manager import ShardedGraphManager
+from ..utils.ontology_schema import OntologySchema
+
+Triple = Tuple[Node, Node, Node]
+
+class ViolationReport:
+    def __init__(self, max_entries: int = 1000):
+        """
+        Bounded record of constraint violations.
+
+        Only the most recent max_entries violations are kept, while the
+        per-constraint totals count every violation seen.
+
+        Args:
+            max_entries: Maximum number of violations kept in detail
+        """
+        self.entries = deque(maxlen=max_entries)
+        self.counts = Counter()
+
+    def add(self, constraint: str, triple: Triple, message: str) -> None:
+        """Record one violation."""
+        self.counts[constraint] += 1
+        self.entries.append({
+            'constraint': constraint,
+            'triple': triple,
+            'message': message
+        })
+
+    @property
+    def total(self) -> int:
+        """Total number of violations seen."""
+        return sum(self.counts.values())
+
+    def summary(self) -> Dict[str, int]:
+        """Violation totals per constraint kind."""
+        return dict(self.counts)
+
+    def clear(self) -> None:
+        """Forget all recorded violations."""
+        self.entries.clear()
+        self.counts.clear()
+
+class ConstraintValidator:
+    def __init__(self, graph_manager: GraphManager,
+                 schema: Optional[OntologySchema] = None,
+                 max_violations: int = 1000):
+        """
+        Validate triples against ontology constraints as they are added.
+
+        The validator registers itself as a GraphManager listener. Numeric
+        bounds are checked per predicate for the whole batch with NumPy, while
+        enumerations and max cardinality use set and counter lookups.
+
+        Cardinality and hasValue come from OWL restrictions and only apply to
+        instances of the restricted classes (and their subclasses). Max
+        cardinality is checked when a value or a type is added; values
+        already in the graph count towards it, but are not validated
+        themselves. Missing values cannot be seen in a single triple, so min
+        cardinality and hasValue are checked on demand. A
+        ShardedGraphManager is rejected, since its triples live in the shard
+        processes and are not reported.
+
+        Args:
+            graph_manager: Manager whose additions are validated
+            schema: Schema providing the constraints (built from the
+                manager's graph if omitted)
+            max_violations: Size of the bounded violation report
+        """
+        if isinstance(graph_manager, ShardedGraphManager):
+            raise ValueError("Cannot validate a sharded graph as it is ingested; "
+                             "validate through a GraphManager instead")
+        self.gm = graph_manager
+        self.schema = schema if schema is not None else OntologySchema.from_graph(graph_manager.graph)
+        self.report = ViolationReport(max_violations)
+        self._rules = self._compile(self.schema)
+        self._restrictions = self._compile_restrictions(self.schema)
+
+        # Restricted class (or subclass) -> (property, restriction) with a max cardinality
+        self._class_limits = defaultdict(list)
+        for prop, restrictions in self._restrictions.items():
+            for restriction in restrictions:
+                if 'max_cardinality' in restriction:
+                    for class_uri in restriction['classes']:
+                        self._class_limits[class_uri].append((prop, restriction))
+
+        # (subject, predicate) -> number of values, for max-cardinality properties
+        self._value_counts = defaultdict(int)
+        for prop, restrictions in self._restrictions.items():
+            if any('max_cardinality' in r for r in restrictions):
+                for subject, _, _ in graph_manager.graph.triples((None, prop, None)):
+                    self._value_counts[(subject, prop)] += 1
+
+        self.gm.add_listener(self)
+
+    @staticmethod
+    def _compile(schema: OntologySchema) -> Dict[Node, Dict]:
+        """Turn schema facet and enumeration constraints into per-predicate checks."""
+        rules = {}
+        for prop, constraints in schema.constraints.items():
+            rule = {}
+            if 'min' in constraints:
+                rule['min'] = constraints['min']
+            if 'max' in constraints:
+                rule['max'] = constraints['max']
+            if constraints.get('values'):
+                rule['values'] = {str(v) for v in constraints['values']}
+            if rule:
+                rules[prop] = rule
+        return rules
+
+    @staticmethod
+    def _compile_restrictions(schema: OntologySchema) -> Dict[Node, List[Dict]]:
+        """Expand the classes of each OWL restriction to their subclasses."""
+        compiled = {}
+        for prop, restrictions in schema.restrictions.items():
+            for restriction in restrictions:
+                entry = dict(restriction)
+                entry['classes'] = frozenset(c for class_uri in restriction['classes']
+                                             for c in schema.descendants(class_uri))
+                if 'has_value' in entry:
+                    entry['has_value'] = {str(v) for v in entry['has_value']}
+                compiled.setdefault(prop, []).append(entry)
+        return compiled
+
+    def detach(self) -> None:
+        """Stop validating new triples."""
+        self.gm.remove_listener(self)
+
+    def on_add(self, triples: List[Triple]) -> None:
+        """Check a batch of newly added triples."""
+        by_predicate = defaultdict(list)
+        new_types = defaultdict(set)
+        for triple in triples:
+            if triple[1] in self._rules or triple[1] in self._restrictions:
+                by_predicate[triple[1]].append(triple)
+            if triple[1] == RDF.type and triple[2] in self._class_limits:
+                new_types[triple[0]].add(triple[2])
+
+        # Subjects becoming instances of a restricted class, with the values
+        # they had before this batch
+        for subject, classes in new_types.items():
+            self._check_new_types(subject, classes)
+
+        for predicate, group in by_predicate.items():
+            rule = self._rules.get(predicate, {})
+            if 'min' in rule or 'max' in rule:
+                self._check_bounds(group, rule)
+            if 'values' in rule:
+                allowed = rule['values']
+                for triple in group:
+                    if str(triple[2]) not in allowed:
+                        self.report.add('values', triple,
+                                        f"{triple[2]} is not an allowed value of {predicate}")
+            limits = [r for r in self._restrictions.get(predicate, ())
+                      if 'max_cardinality' in r]
+            if limits:
+                self._check_max_cardinality(group, limits)
+
+    def _types(self, subject: Node) -> set:
+        return set(self.gm.graph.objects(subject, RDF.type))
+
+    def _check_max_cardinality(self, group: List[Triple], limits: List[Dict]) -> None:
+        """Count new values and flag those exceeding a restriction on their subject."""
+        types = {}
+        for triple in group:
+            subject, predicate = triple[0], triple[1]
+            key = (subject, predicate)
+            self._value_counts[key] += 1
+            count = self._value_counts[key]
+            for restriction in limits:
+                limit = restriction['max_cardinality']
+                if count <= limit:
+                    continue
+                if subject not in types:
+                    types[subject] = self._types(subject)
+                if types[subject] & restriction['classes']:
+                    self.report.add('max_cardinality', triple,
+                                    f"{subject} has more than {limit} values for {predicate}")
+
+    def _check_new_types(self, subject: Node, classes: set) -> None:
+        """Flag values a subject already had that exceed the limits of its new classes."""
+        previous = self._types(subject) - classes
+        checked = set()
+        for class_uri in classes:
+            for prop, restriction in self._class_limits[class_uri]:
+                if id(restriction) in checked or previous & restriction['classes']:
+                    continue
+                checked.add(id(restriction))
+                limit = restriction['max_cardinality']
+                if self._value_counts.get((subject, prop), 0) > limit:
+                    self.report.add('max_cardinality', (subject, prop, None),
+                                    f"{subject} has more than {limit} values for {prop}")
+
+    def on_remove(self, triples: List[Triple]) -> None:
+        """Keep cardinality counts in step with removals."""
+        for s, p, o in triples:
+            key = (s, p)
+            if key in self._value_counts:
+                self._value_counts[key] -= 1
+                if self._value_counts[key] <= 0:
+                    del self._value_counts[key]
+
+    def _check_bounds(self, group: List[Triple], rule: Dict) -> None:
+        """Vectorized min/max check for all values of one predicate in a batch."""
+        values = np.array([_numeric(o) for _, _, o in group], dtype=float)
+        not_numeric = np.isnan(values)
+        low = values < rule['min'] if 'min' in rule else np.zeros(len(values), dtype=bool)
+        high = values > rule['max'] if 'max' in rule else np.zeros(len(values), dtype=bool)
+
+        for i in np.flatnonzero(not_numeric):
+            self.report.add('datatype', group[i], f"{group[i][2]} is not numeric")
+        for i in np.flatnonzero(low):
+            self.report.add('min', group[i], f"{group[i][2]} is below {rule['min']}")
+        for i in np.flatnonzero(high):
+            self.report.add('max', group[i], f"{group[i][2]} is above {rule['max']}")
+
+    def _instances(self, restriction: Dict) -> set:
+        """Subjects typed with a restricted class, each once."""
+        graph = self.gm.graph
+        subjects = set()
+        for class_uri in restriction['classes']:
+            subjects.update(graph.subjects(RDF.type, class_uri))
+        return subjects
+
+    def check_min_cardinality(self) -> int:
+        """
+        Check minimum cardinalities for instances of each restricted class.
+
+        A missing value cannot be detected from a single triple, so this runs
+        on demand (e.g. after an import) using the graph's type index.
+
+        Returns:
+            int: Number of violations found
+        """
+        graph = self.gm.graph
+        found = 0
+        for prop, restrictions in self._restrictions.items():
+            for restriction in restrictions:
+                minimum = restriction.get('min_cardinality')
+                if not minimum:
+                    continue
+                for subject in self._instances(restriction):
+                    count = sum(1 for _ in graph.objects(subject, prop))
+                    if count < minimum:
+                        found += 1
+                        self.report.add('min_cardinality', (subject, prop, None),
+                                        f"{subject} has fewer than {minimum} values for {prop}")
+        return found
+
+    def check_has_value(self) -> int:
+        """
+        Check that instances of each restricted class carry the required values.
+
+        owl:hasValue requires the value to be among the subject's values for
+        the property; other values remain allowed. Runs on demand like
+        check_min_cardinality.
+
+        Returns:
+            int: Number of violations found
+        """
+        graph = self.gm.graph
+        found = 0
+        for prop, restrictions in self._restrictions.items():
+            for restriction in restrictions:
+                required = restriction.get('has_value')
+                if not required:
+                    continue
+                for subject in self._instances(restriction):
+                    values = {str(o) for o in graph.objects(subject, prop)}
+                    for value in required - values:
+                        found += 1
+                        self.report.add('has_value', (subject, prop, None),
+                                        f"{subject} lacks the required value {value} for {prop}")
+        return found
+
+def _numeric(value: Node) -> float:
+    """Numeric value of a literal, or NaN if it has none."""
+    if not isinstance(value, Literal):
+        return float('nan')
+    try:
+        return float(value.toPython())
+    except (TypeError, ValueError):
+        return float('nan')
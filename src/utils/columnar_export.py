@@ -0,0 +1,257 @@
+"""
+Columnar export of simulated health and travel records to NPZ or Parquet.
+
+Records are buffered per (person, date partition) and written in batches as
+hive-style partitions, e.g.
+
+    <output_dir>/health/person=person123/date=2024-03/part-00000-<writer>.npz
+
+so analytics can load flat numeric columns without going through SPARQL.
+<writer> is unique per writer instance, so concurrent writers never clobber
+each other's files. By default a writer replaces the parts of every
+partition it writes to, so rerunning an export does not duplicate rows;
+writers in mode='append' add parts next to the existing ones instead.
+Parquet output requires the optional pyarrow package.
+"""
+
+import glob
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from .data_simulator import HEALTH_METRIC_PATHS
+from .profiling import profiled
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+# Travel column name -> key path into a generate_travel_booking record; a
+# booking without a return flight gets empty strings (NaT for datetimes)
+TRAVEL_COLUMN_PATHS = {
+    'booking_id': ('booking_id',),
+    'booking_date': ('booking_date',),
+    'departure_airport': ('flight', 'departure', 'airport'),
+    'departure_city': ('flight', 'departure', 'city'),
+    'departure_country': ('flight', 'departure', 'country'),
+    'departure_datetime': ('flight', 'departure', 'datetime'),
+    'arrival_airport': ('flight', 'arrival', 'airport'),
+    'arrival_city': ('flight', 'arrival', 'city'),
+    'arrival_country': ('flight', 'arrival', 'country'),
+    'arrival_datetime': ('flight', 'arrival', 'datetime'),
+    'airline': ('flight', 'airline'),
+    'flight_number': ('flight', 'flight_number'),
+    'return_departure_airport': ('return_flight', 'departure', 'airport'),
+    'return_departure_datetime': ('return_flight', 'departure', 'datetime'),
+    'return_arrival_airport': ('return_flight', 'arrival', 'airport'),
+    'return_arrival_datetime': ('return_flight', 'arrival', 'datetime'),
+    'return_airline': ('return_flight', 'airline'),
+    'return_flight_number': ('return_flight', 'flight_number'),
+    'hotel_name': ('hotel', 'name'),
+    'check_in': ('hotel', 'check_in'),
+    'check_out': ('hotel', 'check_out'),
+    'room_type': ('hotel', 'room_type'),
+    'booking_reference': ('hotel', 'booking_reference')
+}
+
+TRAVEL_DATETIME_COLUMNS = {'booking_date', 'departure_datetime', 'arrival_datetime',
+                           'return_departure_datetime', 'return_arrival_datetime',
+                           'check_in', 'check_out'}
+
+WRITE_MODES = ('overwrite', 'append')
+
+DATE_PARTITION_FORMATS = {
+    'day': '%Y-%m-%d',
+    'month': '%Y-%m',
+    'year': '%Y'
+}
+
+def _lookup(record: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    for key in path:
+        record = record[key]
+    return record
+
+def _lookup_optional(record: Dict[str, Any], path: Tuple[str, ...], default: Any = '') -> Any:
+    """Like _lookup, but returns default when a section such as the return flight is absent."""
+    for key in path:
+        record = record.get(key) if record is not None else None
+    return default if record is None else record
+
+class ColumnarRecordWriter:
+    def __init__(self, output_dir: str, format: str = 'npz',
+                 batch_size: int = 1024, date_partition: str = 'month',
+                 mode: str = 'overwrite'):
+        """
+        Initialize the columnar writer.
+
+        Args:
+            output_dir: Root directory of the partitioned dataset
+            format: Output format ('npz' or 'parquet')
+            batch_size: Rows buffered per partition before a part file is written
+            date_partition: Date partition granularity ('day', 'month' or 'year')
+            mode: 'overwrite' deletes the existing parts of a partition when
+                this writer first writes to it, leaving other partitions
+                alone; 'append' keeps them, e.g. for several writers sharing
+                partitions
+        """
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode: {mode}")
+        if format not in ('npz', 'parquet'):
+            raise ValueError(f"Unsupported columnar format: {format}")
+        if format == 'parquet' and pa is None:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        if date_partition not in DATE_PARTITION_FORMATS:
+            raise ValueError(f"Unsupported date partition: {date_partition}")
+
+        self.output_dir = output_dir
+        self.format = format
+        self.batch_size = batch_size
+        self.date_format = DATE_PARTITION_FORMATS[date_partition]
+        self.mode = mode
+
+        # (kind, person_id, date partition) -> column name -> list of values
+        self._buffers = defaultdict(lambda: defaultdict(list))
+        self._part_counts = defaultdict(int)
+        # Distinguishes this writer's part files from those of other writers
+        self._token = uuid.uuid4().hex[:12]
+        # Partition directories this writer has written to
+        self._owned = set()
+
+    def add_health(self, data: Dict[str, Any], person_id: str) -> None:
+        """
+        Buffer a daily health record.
+
+        Args:
+            data: Record as returned by PersonalDataSimulator.generate_daily_health_data
+            person_id: Identifier for the person
+        """
+        buffer = self._buffer('health', person_id, data['date'])
+        buffer['date'].append(data['date'])
+        for metric, path in HEALTH_METRIC_PATHS.items():
+            buffer[metric].append(_lookup(data, path))
+        self._maybe_flush('health', person_id, data['date'], buffer)
+
+    def add_travel(self, booking: Dict[str, Any], person_id: str) -> None:
+        """
+        Buffer a travel booking.
+
+        Args:
+            booking: Record as returned by PersonalDataSimulator.generate_travel_booking
+            person_id: Identifier for the person
+        """
+        buffer = self._buffer('travel', person_id, booking['booking_date'])
+        for column, path in TRAVEL_COLUMN_PATHS.items():
+            buffer[column].append(_lookup_optional(booking, path))
+        self._maybe_flush('travel', person_id, booking['booking_date'], buffer)
+
+    def add_day_record(self, record: Dict[str, Any], person_id: str) -> None:
+        """Buffer the health and travel parts of a PersonalDataSimulator.iter_days record."""
+        if record.get('health') is not None:
+            self.add_health(record['health'], person_id)
+        if record.get('travel') is not None:
+            self.add_travel(record['travel'], person_id)
+
+    def _partition(self, date: str) -> str:
+        return datetime.fromisoformat(date).strftime(self.date_format)
+
+    def _buffer(self, kind: str, person_id: str, date: str) -> Dict[str, List]:
+        return self._buffers[(kind, person_id, self._partition(date))]
+
+    def _maybe_flush(self, kind: str, person_id: str, date: str,
+                     buffer: Dict[str, List]) -> None:
+        first_column = next(iter(buffer.values()))
+        if len(first_column) >= self.batch_size:
+            self._write((kind, person_id, self._partition(date)))
+
+    def _columns(self, kind: str, buffer: Dict[str, List]) -> Dict[str, np.ndarray]:
+        """Convert a row buffer into typed NumPy columns."""
+        columns = {}
+        for name, values in buffer.items():
+            if name == 'date' or (kind == 'travel' and name in TRAVEL_DATETIME_COLUMNS):
+                columns[name] = np.array(values, dtype='datetime64[s]')
+            else:
+                columns[name] = np.asarray(values)
+        return columns
+
+    @profiled('serialization')
+    def _write(self, key: Tuple[str, str, str]) -> None:
+        buffer = self._buffers.pop(key, None)
+        if not buffer:
+            return
+        kind, person_id, partition = key
+        directory = os.path.join(self.output_dir, kind,
+                                 f"person={person_id}", f"date={partition}")
+        os.makedirs(directory, exist_ok=True)
+        if directory not in self._owned:
+            self._owned.add(directory)
+            if self.mode == 'overwrite':
+                for old in glob.glob(os.path.join(directory, "part-*")):
+                    os.remove(old)
+        path = os.path.join(directory, f"part-{self._part_counts[key]:05d}-{self._token}.{self.format}")
+        self._part_counts[key] += 1
+
+        columns = self._columns(kind, buffer)
+        if self.format == 'npz':
+            np.savez(path, **columns)
+        else:
+            pq.write_table(pa.table(columns), path)
+
+    def flush(self) -> None:
+        """Write all buffered rows."""
+        for key in list(self._buffers):
+            self._write(key)
+
+    def close(self) -> None:
+        """Flush remaining rows; the writer can still be reused afterwards."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def read_columns(output_dir: str, kind: str = 'health',
+                 person_id: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Load a partitioned dataset written by ColumnarRecordWriter.
+
+    Args:
+        output_dir: Root directory of the dataset
+        kind: 'health' or 'travel'
+        person_id: Optional person to restrict the scan to
+
+    Returns:
+        Dict mapping column name to a concatenated array, plus a 'person_id'
+        column, sorted by person and date
+    """
+    person_dir = f"person={person_id}" if person_id is not None else "person=*"
+    pattern = os.path.join(output_dir, kind, person_dir, "date=*", "part-*")
+    parts = defaultdict(list)
+
+    for path in sorted(glob.glob(pattern)):
+        person = os.path.basename(os.path.dirname(os.path.dirname(path)))[len("person="):]
+        if path.endswith('.npz'):
+            with np.load(path) as data:
+                columns = {name: data[name] for name in data.files}
+        elif pq is not None:
+            table = pq.read_table(path)
+            columns = {name: table.column(name).to_numpy() for name in table.column_names}
+        else:
+            raise ImportError("Reading Parquet parts requires pyarrow (pip install pyarrow)")
+        rows = len(next(iter(columns.values())))
+        for name, values in columns.items():
+            parts[name].append(values)
+        parts['person_id'].append(np.full(rows, person))
+
+    if not parts:
+        return {}
+    result = {name: np.concatenate(values) for name, values in parts.items()}
+    sort_key = 'date' if kind == 'health' else 'booking_date'
+    order = np.lexsort((result[sort_key], result['person_id']))
+    return {name: values[order] for name, values in result.items()}
@@ -5,7 +5,24 @@ Data simulator for generating synthetic health and travel data.
 import random
 from datetime import datetime, timedelta
 import uuid
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
+import numpy as np
+from .profiling import profiled
+
+# Flat metric name -> key path into a generate_daily_health_data record
+HEALTH_METRIC_PATHS = {
+    'steps': ('steps',),
+    'heart_rate_average': ('heart_rate', 'average'),
+    'heart_rate_max': ('heart_rate', 'max'),
+    'heart_rate_min': ('heart_rate', 'min'),
+    'sleep_duration': ('sleep', 'duration'),
+    'deep_sleep': ('sleep', 'deep_sleep'),
+    'rem_sleep': ('sleep', 'rem_sleep'),
+    'calories_burned': ('calories_burned',),
+    'blood_pressure_systolic': ('blood_pressure', 'systolic'),
+    'blood_pressure_diastolic': ('blood_pressure', 'diastolic'),
+    'weight': ('weight',)
+}
 
 class PersonalDataSimulator:
     def __init__(self, start_date: Optional[datetime] = None):
@@ -44,6 +61,7 @@ class PersonalDataSimulator:
             'Four Seasons', 'Ritz-Carlton', 'W Hotels'
         ]
 
+    @profiled('generation')
     def generate_daily_health_data(self) -> Dict[str, Any]:
         """Generate synthetic health data for a single day."""
         return {
@@ -67,6 +85,47 @@ class PersonalDataSimulator:
             'weight': round(random.uniform(*self.health_ranges['weight_kg']), 1)
         }
 
+    @profiled('generation')
+    def generate_health_arrays(self, num_persons: int, num_days: int,
+                               rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """
+        Generate health metrics for many persons and days at once.
+        
+        Values follow the same ranges as generate_daily_health_data, with the
+        nested record fields flattened into one persons x days array per metric.
+        
+        Args:
+            num_persons: Number of persons (rows)
+            num_days: Number of days (columns)
+            rng: Optional NumPy random generator
+            
+        Returns:
+            Dict mapping metric name to a (num_persons, num_days) array
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        shape = (num_persons, num_days)
+        
+        def integers(low, high):
+            return rng.integers(low, high, size=shape, endpoint=True)
+            
+        def uniform(low, high, decimals=2):
+            return np.round(rng.uniform(low, high, size=shape), decimals)
+            
+        return {
+            'steps': integers(*self.health_ranges['steps']),
+            'heart_rate_average': integers(*self.health_ranges['heart_rate']),
+            'heart_rate_max': integers(100, 140),
+            'heart_rate_min': integers(45, 60),
+            'sleep_duration': uniform(*self.health_ranges['sleep_hours']),
+            'deep_sleep': uniform(1, 3),
+            'rem_sleep': uniform(1, 2.5),
+            'calories_burned': integers(*self.health_ranges['calories_burned']),
+            'blood_pressure_systolic': integers(*self.health_ranges['blood_pressure_systolic']),
+            'blood_pressure_diastolic': integers(*self.health_ranges['blood_pressure_diastolic']),
+            'weight': uniform(*self.health_ranges['weight_kg'], decimals=1)
+        }
+
+    @profiled('generation')
     def generate_travel_booking(self) -> Dict[str, Any]:
         """Generate synthetic travel booking data."""
         # Select random airports for departure and arrival
@@ -144,4 +203,27 @@ class PersonalDataSimulator:
 
     def advance_day(self) -> None:
         """Advance the simulation by one day."""
-        self.current_date += timedelta(days=1) 
\ No newline at end of file
+        self.current_date += timedelta(days=1)
+
+    def iter_days(self, num_days: int, health_probability: float = 1.0,
+                  travel_probability: float = 0.0) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily generate one record per simulated day, advancing the date as it goes.
+        
+        Args:
+            num_days: Number of days to generate
+            health_probability: Chance of health data on a given day
+            travel_probability: Chance of a travel booking on a given day
+            
+        Yields:
+            Dict with 'date', 'health' and 'travel' entries (None when absent)
+        """
+        for _ in range(num_days):
+            yield {
+                'date': self.current_date.isoformat(),
+                'health': self.generate_daily_health_data()
+                          if random.random() < health_probability else None,
+                'travel': self.generate_travel_booking()
+                          if random.random() < travel_probability else None
+            }
+            self.advance_day() 
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+Drift injection engine for batch-generated health data.
+"""
+
+from enum import Enum, auto
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+class DriftPattern(Enum):
+    STEP = auto()
+    RAMP = auto()
+    SEASONAL = auto()
+
+# Relative changes of the "lazy" pattern used by the baseline drift example
+LAZY_EFFECTS = {
+    'steps': -0.4,
+    'heart_rate_average': -0.1,
+    'calories_burned': -0.3,
+    'sleep_duration': 0.2
+}
+
+class DriftScenario:
+    def __init__(self, name: str, pattern: DriftPattern,
+                 effects: Optional[Dict[str, float]] = None,
+                 ramp_days: int = 14, period_days: int = 7):
+        """
+        Describe one kind of drift applied to health metrics.
+
+        Args:
+            name: Name of the scenario
+            pattern: Shape of the drift over time after onset
+            effects: Metric name -> relative change at full intensity (e.g. -0.4 for 40% fewer steps)
+            ramp_days: Days until a RAMP drift reaches full intensity
+            period_days: Period of a SEASONAL drift
+        """
+        self.name = name
+        self.pattern = pattern
+        self.effects = dict(effects if effects is not None else LAZY_EFFECTS)
+        self.ramp_days = max(1, ramp_days)
+        self.period_days = max(1, period_days)
+
+    def intensity(self, elapsed: np.ndarray) -> np.ndarray:
+        """
+        Drift intensity for days elapsed since onset (negative before onset).
+
+        Args:
+            elapsed: Array of days since onset
+
+        Returns:
+            Array of intensities, 0 before onset
+        """
+        active = elapsed >= 0
+        if self.pattern == DriftPattern.STEP:
+            values = np.ones(elapsed.shape)
+        elif self.pattern == DriftPattern.RAMP:
+            values = np.minimum((elapsed + 1) / self.ramp_days, 1.0)
+        else:
+            values = np.sin(2 * np.pi * elapsed / self.period_days)
+        return np.where(active, values, 0.0)
+
+class DriftInjector:
+    def __init__(self, scenarios: Sequence[DriftScenario],
+                 weights: Optional[Sequence[float]] = None,
+                 drift_probability: float = 1.0,
+                 onset_range: Optional[Tuple[int, int]] = None):
+        """
+        Initialize the drift injector.
+
+        Args:
+            scenarios: Drift scenarios to draw from
+            weights: Optional relative probability of each scenario
+            drift_probability: Probability that a person drifts at all
+            onset_range: Inclusive (first, last) day range for random onsets;
+                defaults to the whole simulated horizon
+        """
+        if not scenarios:
+            raise ValueError("At least one drift scenario is required")
+        self.scenarios = list(scenarios)
+        weights = np.ones(len(self.scenarios)) if weights is None else np.asarray(weights, dtype=float)
+        self.weights = weights / weights.sum()
+        self.drift_probability = drift_probability
+        self.onset_range = onset_range
+
+        # Metric x scenario effect table, resolved once per metric set
+        self._effect_cache = {}
+
+    def _effect_table(self, metrics: List[str]) -> np.ndarray:
+        key = tuple(metrics)
+        if key not in self._effect_cache:
+            self._effect_cache[key] = np.array(
+                [[scenario.effects.get(metric, 0.0) for metric in metrics]
+                 for scenario in self.scenarios])
+        return self._effect_cache[key]
+
+    def assign(self, num_persons: int, num_days: int,
+               rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw a scenario and onset day for every person.
+
+        Args:
+            num_persons: Number of persons
+            num_days: Number of simulated days
+            rng: Optional NumPy random generator
+
+        Returns:
+            Tuple of (scenario index per person, onset day per person); both are
+            -1 for persons without drift
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        first, last = self.onset_range if self.onset_range else (0, num_days - 1)
+
+        scenario_idx = rng.choice(len(self.scenarios), size=num_persons, p=self.weights)
+        onsets = rng.integers(first, last, size=num_persons, endpoint=True)
+        drifting = rng.random(num_persons) < self.drift_probability
+
+        scenario_idx = np.where(drifting, scenario_idx, -1)
+        onsets = np.where(drifting, onsets, -1)
+        return scenario_idx, onsets
+
+    def inject(self, health: Dict[str, np.ndarray],
+               scenario_idx: Optional[np.ndarray] = None,
+               onsets: Optional[np.ndarray] = None,
+               rng: Optional[np.random.Generator] = None) -> Dict[str, object]:
+        """
+        Apply drift to persons x days health arrays in a single vectorized pass.
+
+        Args:
+            health: Metric name -> (persons, days) array, e.g. from
+                PersonalDataSimulator.generate_health_arrays
+            scenario_idx: Optional scenario index per person (-1 for none)
+            onsets: Optional onset day per person (-1 for none)
+            rng: Optional NumPy random generator used when assignments are drawn
+
+        Returns:
+            Dict with 'data' (drifted arrays), 'labels' (persons x days bool,
+            True where drift is active), 'scenario' and 'onset' per person
+        """
+        metrics = list(health)
+        num_persons, num_days = health[metrics[0]].shape
+        if scenario_idx is None or onsets is None:
+            scenario_idx, onsets = self.assign(num_persons, num_days, rng)
+        scenario_idx = np.asarray(scenario_idx)
+        onsets = np.asarray(onsets)
+        drifting = scenario_idx >= 0
+
+        elapsed = np.arange(num_days)[None, :] - onsets[:, None]
+        elapsed = np.where(drifting[:, None], elapsed, -1)
+        labels = elapsed >= 0
+
+        # Intensity depends only on the pattern, so evaluate each scenario on its rows
+        intensity = np.zeros((num_persons, num_days))
+        for i, scenario in enumerate(self.scenarios):
+            rows = scenario_idx == i
+            if rows.any():
+                intensity[rows] = scenario.intensity(elapsed[rows])
+
+        # persons x metrics effect, zero for persons without drift
+        effects = self._effect_table(metrics)[np.maximum(scenario_idx, 0)]
+        effects[~drifting] = 0.0
+
+        drifted = {}
+        for m, metric in enumerate(metrics):
+            values = health[metric] * (1.0 + intensity * effects[:, m, None])
+            if np.issubdtype(health[metric].dtype, np.integer):
+                values = np.rint(values).astype(health[metric].dtype)
+            drifted[metric] = values
+
+        return {
+            'data': drifted,
+            'labels': labels,
+            'scenario': scenario_idx,
+            'onset': onsets
+        }
@@ -4,106 +4,160 @@ Data simulator that generates synthetic data based on the structure defined in a
 
 from datetime import datetime, timedelta
 import random
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+import numpy as np
 from rdflib import Graph, Namespace, RDF, RDFS, OWL, XSD
 from rdflib.term import URIRef, Literal
+from .schema_cache import SchemaCache, file_digest
+from .ontology_schema import OntologySchema
 
 class OntologyDataSimulator:
-    def __init__(self, owl_file_path: str, start_date: Optional[datetime] = None):
+    SCHEMA_CACHE_KIND = 'ontology-data-schema'
+    
+    def __init__(self, owl_file_path: str, start_date: Optional[datetime] = None,
+                 use_cache: bool = True, cache_dir: Optional[str] = None):
         """
         Initialize the ontology-based data simulator.
         
         Args:
             owl_file_path: Path to the OWL file containing the ontology structure
             start_date: Starting date for the simulation. Defaults to current date.
+            use_cache: Whether to reuse a previously extracted schema for the same file contents
+            cache_dir: Optional schema cache directory
         """
         self.current_date = start_date if start_date else datetime.now()
-        self.graph = Graph()
-        self.graph.parse(owl_file_path)
+        self.owl_file_path = owl_file_path
+        self._graph = None
+        
+        # Extract ontology structure, or load the indexed schema from the cache
+        cache = SchemaCache(cache_dir) if use_cache else None
+        digest = file_digest(owl_file_path) if cache else None
+        schema = cache.load(digest, self.SCHEMA_CACHE_KIND) if cache else None
         
-        # Extract ontology structure
-        self._extract_ontology_structure()
+        if schema is not None:
+            self._load_schema(schema)
+        else:
+            self._extract_ontology_structure()
+            if cache:
+                cache.store(digest, self.SCHEMA_CACHE_KIND, self.schema)
+    
+    @property
+    def graph(self) -> Graph:
+        """The parsed ontology graph, parsed on first access."""
+        if self._graph is None:
+            self._graph = Graph()
+            self._graph.parse(self.owl_file_path)
+        return self._graph
         
     def _extract_ontology_structure(self) -> None:
         """Extract classes, properties, and constraints from the OWL file."""
+        self._load_schema(OntologySchema.from_graph(self.graph))
+    
+    def _load_schema(self, schema: OntologySchema) -> None:
+        """Derive the name-keyed class and property tables from an indexed schema."""
+        self.schema = schema
         self.classes = {}
         self.object_properties = {}
         self.data_properties = {}
         self.value_ranges = {}
         
-        # Extract classes
-        for class_uri in self.graph.subjects(RDF.type, OWL.Class):
+        # Extract classes, with inherited properties included
+        for class_uri in schema.class_order:
             class_name = self._get_local_name(class_uri)
             if class_name:
                 self.classes[class_name] = {
                     'uri': class_uri,
-                    'label': self._get_label(class_uri),
-                    'properties': []
+                    'label': schema.classes[class_uri]['label'],
+                    'properties': [self._get_local_name(p) for p in schema.properties_of(class_uri)]
                 }
         
         # Extract properties and their domains/ranges
-        for prop in self.graph.subjects(RDF.type, OWL.ObjectProperty):
+        for prop, prop_info in schema.properties.items():
             prop_name = self._get_local_name(prop)
             if prop_name:
-                domains = list(self.graph.objects(prop, RDFS.domain))
-                ranges = list(self.graph.objects(prop, RDFS.range))
-                self.object_properties[prop_name] = {
+                table = self.object_properties if prop_info['type'] == 'object' else self.data_properties
+                table[prop_name] = {
                     'uri': prop,
-                    'label': self._get_label(prop),
-                    'domains': [self._get_local_name(d) for d in domains],
-                    'ranges': [self._get_local_name(r) for r in ranges]
-                }
-        
-        for prop in self.graph.subjects(RDF.type, OWL.DatatypeProperty):
-            prop_name = self._get_local_name(prop)
-            if prop_name:
-                domains = list(self.graph.objects(prop, RDFS.domain))
-                ranges = list(self.graph.objects(prop, RDFS.range))
-                self.data_properties[prop_name] = {
-                    'uri': prop,
-                    'label': self._get_label(prop),
-                    'domains': [self._get_local_name(d) for d in domains],
-                    'ranges': [self._get_local_name(r) for r in ranges]
+                    'label': prop_info['label'],
+                    'domains': [self._get_local_name(d) for d in prop_info['domains']],
+                    'ranges': [self._get_local_name(r) for r in prop_info['ranges']]
                 }
                 
         # Extract value constraints and ranges
         self._extract_value_constraints()
+        
+        # Resolve what to generate for each class once
+        self._compile_generation_plans()
     
     def _extract_value_constraints(self) -> None:
         """Extract value constraints for data properties."""
-        XSD = Namespace("http://www.w3.org/2001/XMLSchema#")
-        
         for prop_name, prop_info in self.data_properties.items():
+            schema_constraints = self.schema.constraints_of(prop_info['uri'])
             constraints = {}
-            prop_uri = prop_info['uri']
-            
-            # Get restrictions
-            for restrictions in self.graph.objects(prop_uri, OWL.withRestrictions):
-                for restriction in self.graph.items(restrictions):
-                    # Check for min/max values
-                    min_values = list(self.graph.objects(restriction, XSD.minInclusive))
-                    max_values = list(self.graph.objects(restriction, XSD.maxInclusive))
-                    
-                    if min_values:
-                        constraints['min'] = float(min_values[0])
-                    if max_values:
-                        constraints['max'] = float(max_values[0])
-            
-            # Get enumerated values
-            for enum_list in self.graph.objects(prop_uri, OWL.oneOf):
-                values = []
-                current = enum_list
-                while current:
-                    first = list(self.graph.objects(current, RDF.first))
-                    if first:
-                        values.append(str(first[0]))
-                    rest = list(self.graph.objects(current, RDF.rest))
-                    current = rest[0] if rest and rest[0] != RDF.nil else None
-                if values:
-                    constraints['values'] = values
-            
+            if 'min' in schema_constraints:
+                constraints['min'] = schema_constraints['min']
+            if 'max' in schema_constraints:
+                constraints['max'] = schema_constraints['max']
+            if schema_constraints.get('values'):
+                constraints['values'] = [str(v) for v in schema_constraints['values']]
             self.value_ranges[prop_name] = constraints
     
+    def _value_spec(self, prop_name: str) -> Tuple:
+        """
+        Resolve how values of a data property are drawn.
+        
+        Returns:
+            Tuple of (kind, *parameters) where kind is one of 'choice', 'int',
+            'float', 'bool', 'datetime' or 'string'
+        """
+        constraints = self.value_ranges.get(prop_name, {})
+        prop_info = self.data_properties[prop_name]
+        range_type = prop_info['ranges'][0] if prop_info['ranges'] else None
+        
+        if 'values' in constraints:
+            return ('choice', list(constraints['values']))
+        
+        if 'min' in constraints or 'max' in constraints:
+            min_val = constraints.get('min', 0)
+            max_val = constraints.get('max', 100)
+            
+            if range_type == 'integer':
+                return ('int', int(min_val), int(max_val))
+            return ('float', min_val, max_val)
+        
+        # Default generation based on property range
+        if range_type == 'integer':
+            return ('int', 0, 100)
+        elif range_type in ['decimal', 'float']:
+            return ('float', 0, 100)
+        elif range_type == 'boolean':
+            return ('bool',)
+        elif range_type == 'dateTime':
+            return ('datetime', 0, 365)
+        else:
+            return ('string', 1, 1000)
+    
+    def _compile_generation_plans(self) -> None:
+        """
+        Build a per-class generation plan so instance generation only visits
+        the properties whose domain includes the class or one of its superclasses.
+        """
+        self._value_specs = {prop_name: self._value_spec(prop_name)
+                             for prop_name in self.data_properties}
+        self.generation_plans = {}
+        
+        for class_name, class_info in self.classes.items():
+            plan = {'data': [], 'object': []}
+            for prop in self.schema.properties_of(class_info['uri']):
+                prop_name = self._get_local_name(prop)
+                if self.schema.properties[prop]['type'] == 'datatype':
+                    plan['data'].append((prop_name, self._value_specs[prop_name]))
+                else:
+                    ranges = self.object_properties[prop_name]['ranges']
+                    if ranges:
+                        plan['object'].append((prop_name, ranges[0]))
+            self.generation_plans[class_name] = plan
+    
     def _get_local_name(self, uri: URIRef) -> Optional[str]:
         """Get the local name part of a URI."""
         if not uri:
@@ -134,51 +188,93 @@ class OntologyDataSimulator:
             'properties': {}
         }
         
+        plan = self.generation_plans[class_name]
+        
         # Generate values for data properties
-        for prop_name, prop_info in self.data_properties.items():
-            if class_name in prop_info['domains']:
-                value = self._generate_property_value(prop_name)
-                if value is not None:
-                    data['properties'][prop_name] = value
+        for prop_name, spec in plan['data']:
+            value = self._draw_value(spec)
+            if value is not None:
+                data['properties'][prop_name] = value
         
         # Generate values for object properties
-        for prop_name, prop_info in self.object_properties.items():
-            if class_name in prop_info['domains']:
-                related_class = prop_info['ranges'][0] if prop_info['ranges'] else None
-                if related_class:
-                    data['properties'][prop_name] = self._generate_related_instance(related_class)
+        for prop_name, related_class in plan['object']:
+            data['properties'][prop_name] = self._generate_related_instance(related_class)
         
         return data
     
-    def _generate_property_value(self, prop_name: str) -> Any:
-        """Generate a value for a property based on its constraints."""
-        constraints = self.value_ranges.get(prop_name, {})
-        prop_info = self.data_properties[prop_name]
-        range_type = prop_info['ranges'][0] if prop_info['ranges'] else None
-        
-        if 'values' in constraints:
-            return random.choice(constraints['values'])
+    def generate_instances(self, class_name: str, num_instances: int,
+                           rng: Optional[np.random.Generator] = None) -> Dict[str, Any]:
+        """
+        Generate property values for many instances of a class at once.
         
-        if 'min' in constraints or 'max' in constraints:
-            min_val = constraints.get('min', 0)
-            max_val = constraints.get('max', 100)
+        Args:
+            class_name: Name of the class to generate data for
+            num_instances: Number of instances to generate
+            rng: Optional NumPy random generator
             
-            if range_type == 'integer':
-                return random.randint(int(min_val), int(max_val))
-            return round(random.uniform(min_val, max_val), 2)
+        Returns:
+            Dict with 'type', 'timestamp', 'count' and 'properties', where each
+            property maps to a NumPy column of num_instances values
+        """
+        if class_name not in self.classes:
+            raise ValueError(f"Unknown class: {class_name}")
+        rng = rng if rng is not None else np.random.default_rng()
+        plan = self.generation_plans[class_name]
         
-        # Default generation based on property range
-        if range_type == 'integer':
-            return random.randint(0, 100)
-        elif range_type in ['decimal', 'float']:
-            return round(random.uniform(0, 100), 2)
-        elif range_type == 'boolean':
+        columns = {}
+        for prop_name, spec in plan['data']:
+            columns[prop_name] = self._draw_column(spec, num_instances, rng)
+        for prop_name, related_class in plan['object']:
+            ids = rng.integers(1, 1000, size=num_instances, endpoint=True)
+            columns[prop_name] = np.char.add(f"{related_class}_", ids.astype(str))
+        
+        return {
+            'type': class_name,
+            'timestamp': self.current_date.isoformat(),
+            'count': num_instances,
+            'properties': columns
+        }
+    
+    def _draw_value(self, spec: Tuple) -> Any:
+        """Draw a single value according to a compiled value spec."""
+        kind = spec[0]
+        if kind == 'choice':
+            return random.choice(spec[1])
+        elif kind == 'int':
+            return random.randint(spec[1], spec[2])
+        elif kind == 'float':
+            return round(random.uniform(spec[1], spec[2]), 2)
+        elif kind == 'bool':
             return random.choice([True, False])
-        elif range_type == 'dateTime':
-            days = random.randint(0, 365)
+        elif kind == 'datetime':
+            days = random.randint(spec[1], spec[2])
             return (self.current_date + timedelta(days=days)).isoformat()
         else:
-            return f"Value_{random.randint(1, 1000)}"
+            return f"Value_{random.randint(spec[1], spec[2])}"
+    
+    def _draw_column(self, spec: Tuple, size: int,
+                     rng: np.random.Generator) -> np.ndarray:
+        """Draw a column of values according to a compiled value spec."""
+        kind = spec[0]
+        if kind == 'choice':
+            return np.asarray(spec[1])[rng.integers(0, len(spec[1]), size=size)]
+        elif kind == 'int':
+            return rng.integers(spec[1], spec[2], size=size, endpoint=True)
+        elif kind == 'float':
+            return np.round(rng.uniform(spec[1], spec[2], size=size), 2)
+        elif kind == 'bool':
+            return rng.random(size) < 0.5
+        elif kind == 'datetime':
+            days = rng.integers(spec[1], spec[2], size=size, endpoint=True)
+            return np.datetime64(self.current_date.replace(microsecond=0), 's') + \
+                days.astype('timedelta64[D]')
+        else:
+            ids = rng.integers(spec[1], spec[2], size=size, endpoint=True)
+            return np.char.add("Value_", ids.astype(str))
+    
+    def _generate_property_value(self, prop_name: str) -> Any:
+        """Generate a value for a property based on its constraints."""
+        return self._draw_value(self._value_specs[prop_name])
     
     def _generate_related_instance(self, class_name: str) -> Dict[str, Any]:
         """Generate a simplified related instance."""
@@ -187,6 +283,24 @@ class OntologyDataSimulator:
             'id': f"{class_name}_{random.randint(1, 1000)}"
         }
     
+    def iter_instances(self, class_name: str, num_instances: int,
+                       per_day: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily generate instance data for a class.
+        
+        Args:
+            class_name: Name of the class to generate data for
+            num_instances: Number of instances to generate
+            per_day: If given, advance the date after every per_day instances
+            
+        Yields:
+            Dict containing the generated property values
+        """
+        for i in range(num_instances):
+            if per_day and i and i % per_day == 0:
+                self.advance_day()
+            yield self.generate_instance_data(class_name)
+    
     def advance_day(self) -> None:
         """Advance the current date by one day."""
         self.current_date += timedelta(days=1)
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+Indexed ontology schema shared by the ontology-driven simulators.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+from rdflib import Graph, RDF, RDFS, OWL, Namespace
+from rdflib.term import Node, URIRef
+
+XSD_FACETS = Namespace("http://www.w3.org/2001/XMLSchema#")
+
+def local_name(uri: Node) -> str:
+    """Get the local name part of a URI."""
+    uri = str(uri)
+    return uri.split('#')[-1] if '#' in uri else uri.split('/')[-1]
+
+class OntologySchema:
+    def __init__(self):
+        """
+        Create an empty schema; use OntologySchema.from_graph to build one.
+
+        Classes are numbered in declaration order and every class carries a
+        bitset of its ancestors (including itself) over those numbers, so
+        subclass tests and inherited-property lookups are plain integer and
+        dictionary operations.
+        """
+        self.classes = {}  # class URI -> {'label', 'index', 'subclass_of'}
+        self.class_order = []  # index -> class URI
+        self.ancestor_bits = {}  # class URI -> bitset of ancestor indexes
+        self.properties = {}  # property URI -> {'type', 'label', 'domains', 'ranges', 'functional'}
+        self.constraints = {}  # property URI -> constraint table
+        self.restrictions = {}  # property URI -> OWL restrictions, each with its classes
+        self.class_properties = {}  # class URI -> property URIs, inherited ones included
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'OntologySchema':
+        """
+        Build the schema from an ontology graph.
+
+        Args:
+            graph: Graph containing the ontology
+
+        Returns:
+            OntologySchema: The indexed schema
+        """
+        schema = cls()
+        for class_uri in graph.subjects(RDF.type, OWL.Class):
+            if class_uri in schema.classes or not isinstance(class_uri, URIRef):
+                continue
+            schema.classes[class_uri] = {
+                'label': cls._label(graph, class_uri),
+                'index': len(schema.class_order),
+                'subclass_of': list(graph.objects(class_uri, RDFS.subClassOf))
+            }
+            schema.class_order.append(class_uri)
+
+        for prop_type, rdf_type in (('datatype', OWL.DatatypeProperty),
+                                    ('object', OWL.ObjectProperty)):
+            for prop in graph.subjects(RDF.type, rdf_type):
+                if prop in schema.properties:
+                    continue
+                schema.properties[prop] = {
+                    'type': prop_type,
+                    'label': cls._label(graph, prop),
+                    'domains': list(graph.objects(prop, RDFS.domain)),
+                    'ranges': list(graph.objects(prop, RDFS.range)),
+                    'functional': (prop, RDF.type, OWL.FunctionalProperty) in graph
+                }
+                constraints = cls._constraints(graph, prop)
+                if constraints:
+                    schema.constraints[prop] = constraints
+                restrictions = cls._restrictions(graph, prop)
+                if restrictions:
+                    schema.restrictions[prop] = restrictions
+
+        schema._index()
+        return schema
+
+    @staticmethod
+    def _label(graph: Graph, uri: Node) -> str:
+        label = graph.value(uri, RDFS.label)
+        return str(label) if label else local_name(uri)
+
+    @staticmethod
+    def _constraints(graph: Graph, prop: Node) -> Dict:
+        """
+        Collect facet, enumeration and restriction constraints for a property.
+
+        Restrictions are merged into one table regardless of the class they
+        belong to, which is what value generation needs; see _restrictions
+        for the per-class view used in validation.
+        """
+        constraints = {}
+
+        # Datatype facets, e.g. xsd:minInclusive inside owl:withRestrictions
+        for restrictions in graph.objects(prop, OWL.withRestrictions):
+            for facet in graph.items(restrictions):
+                min_value = graph.value(facet, XSD_FACETS.minInclusive)
+                max_value = graph.value(facet, XSD_FACETS.maxInclusive)
+                if min_value is not None:
+                    constraints['min'] = float(min_value)
+                if max_value is not None:
+                    constraints['max'] = float(max_value)
+
+        # Enumerated values
+        for enum_list in graph.objects(prop, OWL.oneOf):
+            values = list(graph.items(enum_list))
+            if values:
+                constraints['values'] = values
+
+        # OWL restrictions on the property
+        for restriction in graph.subjects(OWL.onProperty, prop):
+            if (restriction, RDF.type, OWL.Restriction) not in graph:
+                continue
+            min_card = graph.value(restriction, OWL.minCardinality)
+            max_card = graph.value(restriction, OWL.maxCardinality)
+            if min_card:
+                constraints['min_cardinality'] = int(min_card)
+            if max_card:
+                constraints['max_cardinality'] = int(max_card)
+            for value in graph.objects(restriction, OWL.hasValue):
+                constraints.setdefault('has_value', []).append(value)
+
+        return constraints
+
+    @staticmethod
+    def _restrictions(graph: Graph, prop: Node) -> List[Dict]:
+        """
+        Collect the OWL restrictions on a property, each with its classes.
+
+        A restriction belongs to the classes declaring it as a superclass or
+        an equivalent class; restrictions attached to no class are skipped.
+
+        Returns:
+            List[Dict]: One dict per restriction with 'classes', and
+            'min_cardinality', 'max_cardinality' and 'has_value' where given
+        """
+        restrictions = []
+        for restriction in graph.subjects(OWL.onProperty, prop):
+            if (restriction, RDF.type, OWL.Restriction) not in graph:
+                continue
+            classes = set(graph.subjects(RDFS.subClassOf, restriction))
+            classes.update(graph.subjects(OWL.equivalentClass, restriction))
+            classes.update(graph.objects(restriction, OWL.equivalentClass))
+            classes = [c for c in classes if isinstance(c, URIRef)]
+            if not classes:
+                continue
+            entry = {'classes': classes}
+            exact = graph.value(restriction, OWL.cardinality)
+            min_card = graph.value(restriction, OWL.minCardinality)
+            max_card = graph.value(restriction, OWL.maxCardinality)
+            if exact is not None:
+                entry['min_cardinality'] = entry['max_cardinality'] = int(exact)
+            if min_card is not None:
+                entry['min_cardinality'] = int(min_card)
+            if max_card is not None:
+                entry['max_cardinality'] = int(max_card)
+            values = list(graph.objects(restriction, OWL.hasValue))
+            if values:
+                entry['has_value'] = values
+            if len(entry) > 1:
+                restrictions.append(entry)
+        return restrictions
+
+    def _index(self) -> None:
+        """Compute the subclass closure and the class -> properties table."""
+        bits = {uri: 1 << info['index'] for uri, info in self.classes.items()}
+        parents = {uri: [p for p in info['subclass_of'] if p in self.classes]
+                   for uri, info in self.classes.items()}
+
+        # Propagate ancestor bits until stable; terminates on cyclic hierarchies too
+        changed = True
+        while changed:
+            changed = False
+            for uri, direct in parents.items():
+                merged = bits[uri]
+                for parent in direct:
+                    merged |= bits[parent]
+                if merged != bits[uri]:
+                    bits[uri] = merged
+                    changed = True
+        self.ancestor_bits = bits
+
+        by_domain = {}
+        for prop, info in self.properties.items():
+            for domain in info['domains']:
+                by_domain.setdefault(domain, []).append(prop)
+
+        for uri in self.class_order:
+            props = []
+            seen = set()
+            for ancestor in self._classes_in(bits[uri]):
+                for prop in by_domain.get(ancestor, ()):
+                    if prop not in seen:
+                        seen.add(prop)
+                        props.append(prop)
+            self.class_properties[uri] = tuple(props)
+
+    def _classes_in(self, bits: int) -> Iterator[URIRef]:
+        """Yield the classes whose index bit is set, in declaration order."""
+        index = 0
+        while bits:
+            if bits & 1:
+                yield self.class_order[index]
+            bits >>= 1
+            index += 1
+
+    def is_subclass(self, sub_class: Node, super_class: Node) -> bool:
+        """Check whether sub_class is (transitively) a subclass of super_class."""
+        if sub_class not in self.classes or super_class not in self.classes:
+            return sub_class == super_class
+        return bool(self.ancestor_bits[sub_class] >> self.classes[super_class]['index'] & 1)
+
+    def ancestors(self, class_uri: Node) -> List[URIRef]:
+        """All superclasses of a class, including the class itself."""
+        if class_uri not in self.ancestor_bits:
+            return [class_uri]
+        return list(self._classes_in(self.ancestor_bits[class_uri]))
+
+    def descendants(self, class_uri: Node) -> List[URIRef]:
+        """All subclasses of a class, including the class itself."""
+        if class_uri not in self.classes:
+            return [class_uri]
+        bit = 1 << self.classes[class_uri]['index']
+        return [uri for uri in self.class_order if self.ancestor_bits[uri] & bit]
+
+    def properties_of(self, class_uri: Node, prop_type: Optional[str] = None) -> Tuple[URIRef, ...]:
+        """
+        Properties applicable to a class, including inherited ones.
+
+        Args:
+            class_uri: URI of the class
+            prop_type: Optional filter ('datatype' or 'object')
+        """
+        props = self.class_properties.get(class_uri, ())
+        if prop_type is None:
+            return props
+        return tuple(p for p in props if self.properties[p]['type'] == prop_type)
+
+    def constraints_of(self, prop: Node) -> Dict:
+        """Constraint table of a property (empty if unconstrained)."""
+        return self.constraints.get(prop, {})
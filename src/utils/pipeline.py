@@ -0,0 +1,233 @@
+"""
+Composable generator pipeline for streaming simulation records.
+
+A stage is any callable that takes an iterator and returns an iterator, so
+stages can be chained with pipeline() and consumed with run():
+
+    records = simulator.iter_days(365, travel_probability=0.1)
+    stream = pipeline(records,
+                      drift_stage(scenario, onset_day=180),
+                      triples_stage(builder, "person123"),
+                      threaded())
+    run(stream, graph_sink(builder, "person123"))
+
+Every stage pulls one item at a time, so memory stays flat regardless of
+the simulated horizon.
+"""
+
+import os
+import queue
+import threading
+from itertools import islice
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from .data_simulator import HEALTH_METRIC_PATHS
+from .drift_simulator import DriftScenario
+
+Stage = Callable[[Iterator[Any]], Iterator[Any]]
+
+def pipeline(source: Iterable[Any], *stages: Stage) -> Iterator[Any]:
+    """
+    Chain stages onto a source iterable.
+
+    Args:
+        source: Iterable of records, e.g. PersonalDataSimulator.iter_days
+        stages: Stages applied in order
+
+    Returns:
+        Iterator over the output of the last stage
+    """
+    stream = iter(source)
+    for stage in stages:
+        stream = stage(stream)
+    return stream
+
+def run(stream: Iterable[Any], sink: Optional[Callable[[Any], None]] = None) -> int:
+    """
+    Drain a pipeline, passing every item to a sink.
+
+    Args:
+        stream: Pipeline output
+        sink: Optional callable invoked with each item
+
+    Returns:
+        int: Number of items consumed
+    """
+    count = 0
+    for item in stream:
+        if sink is not None:
+            sink(item)
+        count += 1
+    return count
+
+def filter_stage(predicate: Callable[[Any], bool]) -> Stage:
+    """Keep only items for which predicate returns True."""
+    def stage(stream):
+        return (item for item in stream if predicate(item))
+    return stage
+
+def transform_stage(func: Callable[[Any], Any]) -> Stage:
+    """Apply func to every item."""
+    def stage(stream):
+        return (func(item) for item in stream)
+    return stage
+
+def batch_stage(size: int) -> Stage:
+    """Group items into lists of at most size items."""
+    def stage(stream):
+        while True:
+            batch = list(islice(stream, size))
+            if not batch:
+                return
+            yield batch
+    return stage
+
+def drift_stage(scenario: DriftScenario, onset_day: int) -> Stage:
+    """
+    Apply a drift scenario to the health part of day records.
+
+    Records are modified in place and gain a boolean 'drift' label. The day
+    index is counted from the first record that passes through the stage.
+
+    Args:
+        scenario: Drift scenario to apply
+        onset_day: Index of the first drifted day
+    """
+    paths = [(HEALTH_METRIC_PATHS[metric], effect)
+             for metric, effect in scenario.effects.items()
+             if metric in HEALTH_METRIC_PATHS]
+
+    def stage(stream):
+        for day, record in enumerate(stream):
+            elapsed = day - onset_day
+            record['drift'] = elapsed >= 0
+            health = record.get('health')
+            if health is not None and elapsed >= 0:
+                intensity = float(scenario.intensity(np.asarray(elapsed)))
+                for path, effect in paths:
+                    parent = health
+                    for key in path[:-1]:
+                        parent = parent[key]
+                    value = parent[path[-1]] * (1.0 + intensity * effect)
+                    parent[path[-1]] = int(round(value)) if isinstance(parent[path[-1]], int) else value
+            yield record
+    return stage
+
+def triples_stage(builder, person_id: str) -> Stage:
+    """
+    Convert day records into batches of triples without touching the graph.
+
+    Days without health or travel data become a general activity, mirroring
+    PersonalDataKnowledgeSimulator.simulate_day. Insert the batches with
+    graph_sink (or builder.insert_triples): until a batch is inserted, the
+    builder keeps describing its person and reference entities in later
+    batches, so batches dropped downstream leave no dangling references.
+
+    Args:
+        builder: PersonalOntologyBuilder providing the triple templates
+        person_id: Identifier for the person the records belong to
+    """
+    def stage(stream):
+        for record in stream:
+            triples = []
+            if record.get('travel') is not None:
+                triples.extend(builder.travel_triples(record['travel'], person_id))
+            if record.get('health') is not None:
+                triples.extend(builder.health_triples(record['health'], person_id))
+            if not triples:
+                triples = builder.general_activity_triples(person_id, record['date'])
+            yield triples
+    return stage
+
+def graph_sink(builder, person_id: str) -> Callable[[List], None]:
+    """
+    Sink that bulk-inserts triples_stage batches through their builder.
+
+    Shared reference entities are broadcast and the rest is routed by the
+    person (see PersonalOntologyBuilder.insert_triples).
+
+    Args:
+        builder: PersonalOntologyBuilder that built the batches
+        person_id: Identifier for the person the batches belong to
+    """
+    def sink(triples):
+        builder.insert_triples(triples, person_id)
+    return sink
+
+_DONE = object()
+
+class _StageError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+def threaded(maxsize: int = 64) -> Stage:
+    """
+    Run everything upstream of this stage in a background thread.
+
+    Items are handed over through a bounded queue, so a slow consumer
+    applies back-pressure instead of letting the producer run ahead.
+
+    Args:
+        maxsize: Maximum number of items buffered between the threads
+    """
+    def stage(stream):
+        buffer = queue.Queue(maxsize)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for item in stream:
+                    if not put(item):
+                        return
+            except BaseException as e:
+                put(_StageError(e))
+                return
+            put(_DONE)
+
+        worker = threading.Thread(target=produce, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _StageError):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+    return stage
+
+def process_stage(func: Callable[[Any], Any], processes: Optional[int] = None,
+                  chunksize: int = 64) -> Stage:
+    """
+    Apply a picklable function to every item in a pool of worker processes.
+
+    Input is consumed in bounded windows (processes x chunksize items) rather
+    than all at once, and output order is preserved.
+
+    Args:
+        func: Module-level function applied to each item
+        processes: Number of worker processes (defaults to CPU count)
+        chunksize: Items sent to a worker per task
+    """
+    def stage(stream):
+        workers = processes or os.cpu_count() or 1
+        with Pool(workers) as pool:
+            window = workers * chunksize
+            while True:
+                items = list(islice(stream, window))
+                if not items:
+                    return
+                yield from pool.map(func, items, chunksize)
+    return stage
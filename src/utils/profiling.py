@@ -0,0 +1,296 @@
+"""
+Opt-in profiling of the simulation pipeline stages.
+
+Pipeline methods are decorated with profiled(stage), where stage is one of
+STAGES. While a Profiler is active, each call records wall-clock and CPU
+time under its caller, building a tree of stages (e.g. simulate_day >
+add_health_data > GraphManager.add_triples); otherwise the decorators only
+cost a global lookup. A Profiler can optionally run cProfile as well, and
+write the stage tree as collapsed stacks for flame-graph tools.
+
+Profile a whole run without editing it through the RDFLIB_SIMULATOR_PROFILE
+environment variable:
+
+    RDFLIB_SIMULATOR_PROFILE=1 python -m examples.simulate_personal_data
+        prints the stage tree to stderr at exit
+    RDFLIB_SIMULATOR_PROFILE=profile-out python -m examples.simulate_personal_data
+        also runs cProfile and writes stages.txt, stages.folded and
+        cprofile.prof into the profile-out directory
+
+Spawned worker processes (e.g. the benchmark harness' isolated runs) inherit
+the variable. With an output directory each writes its own files, suffixed
+with its pid (stages-<pid>.txt, ...); with 1 only the main process reports.
+
+Or profile a block of code:
+
+    with Profiler(cprofile=True) as profiler:
+        simulator.simulate_period(365)
+    print(profiler.report())
+    profiler.write('profile-out')
+"""
+
+import atexit
+import cProfile
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ENV_VAR = 'RDFLIB_SIMULATOR_PROFILE'
+
+# Pipeline stages, in pipeline order
+STAGES = ('simulation', 'generation', 'build', 'insert', 'query', 'analysis', 'serialization')
+
+# The Profiler currently collecting, if any
+_active = None
+
+def _new_node(name: str, stage: Optional[str]) -> Dict[str, Any]:
+    return {'name': name, 'stage': stage, 'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'children': {}}
+
+class Profiler:
+    def __init__(self, cprofile: bool = False):
+        """
+        Collect hierarchical stage timings while active.
+
+        Timings are kept as a tree of dicts with 'name', 'stage', 'calls',
+        'wall', 'cpu' (seconds, inclusive of children) and 'children'. Each
+        thread nests its calls under the shared root, updating nodes under a
+        lock; CPU time is per thread.
+
+        Args:
+            cprofile: Whether to run cProfile on the activating thread too
+        """
+        self.root = _new_node('total', None)
+        self.profile = cProfile.Profile() if cprofile else None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._previous = None
+        self._started = None
+
+    def start(self) -> 'Profiler':
+        """Make this the active profiler."""
+        global _active
+        self._previous, _active = _active, self
+        self._started = (time.perf_counter(), time.process_time())
+        if self.profile is not None:
+            self.profile.enable()
+        return self
+
+    def stop(self) -> None:
+        """Stop collecting, restoring the previously active profiler."""
+        global _active
+        if self.profile is not None:
+            self.profile.disable()
+        if self._started is not None:
+            wall, cpu = self._started
+            self.root['wall'] += time.perf_counter() - wall
+            self.root['cpu'] += time.process_time() - cpu
+            self.root['calls'] += 1
+            self._started = None
+        if _active is self:
+            _active = self._previous
+
+    def __enter__(self) -> 'Profiler':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = [self.root]
+        return stack
+
+    def call(self, name: str, stage: Optional[str], func: Callable, *args, **kwargs) -> Any:
+        """
+        Call func, recording its timings as a child of the current node.
+
+        Args:
+            name: Label of the node, e.g. a qualified method name
+            stage: Pipeline stage of the call (see STAGES)
+            func: Callable to time
+
+        Returns:
+            The return value of func
+        """
+        stack = self._stack()
+        children = stack[-1]['children']
+        node = children.get(name)
+        if node is None:
+            with self._lock:
+                node = children.setdefault(name, _new_node(name, stage))
+        stack.append(node)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            with self._lock:
+                node['wall'] += wall
+                node['cpu'] += cpu
+                node['calls'] += 1
+            stack.pop()
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Self wall and CPU seconds per pipeline stage.
+
+        Each node contributes its time minus that of its children, so the
+        stages partition the profiled time: inserts nested in a build step
+        count as insert, and the rest of the build step as build.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Stage -> 'wall', 'cpu' and 'calls'
+        """
+        totals = {}
+
+        def visit(node):
+            children = node['children'].values()
+            if node['stage'] is not None:
+                total = totals.setdefault(node['stage'], {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+                total['wall'] += node['wall'] - sum(c['wall'] for c in children)
+                total['cpu'] += node['cpu'] - sum(c['cpu'] for c in children)
+                total['calls'] += node['calls']
+            for child in children:
+                visit(child)
+
+        visit(self.root)
+        return {stage: totals[stage] for stage in STAGES if stage in totals}
+
+    def report(self, min_fraction: float = 0.001) -> str:
+        """
+        Format the stage tree and per-stage totals as text.
+
+        Args:
+            min_fraction: Hide nodes below this fraction of the total wall time
+
+        Returns:
+            str: One line per node, indented by depth
+        """
+        total = self.root['wall'] or sum(c['wall'] for c in self.root['children'].values())
+        lines = [f"{'stage':<14}{'calls':>10}{'wall s':>12}{'cpu s':>12}{'wall %':>9}  name"]
+
+        def visit(node, depth):
+            for child in sorted(node['children'].values(), key=lambda n: -n['wall']):
+                if total and child['wall'] < min_fraction * total:
+                    continue
+                share = 100.0 * child['wall'] / total if total else 0.0
+                lines.append(f"{child['stage'] or '':<14}{child['calls']:>10}{child['wall']:>12.4f}"
+                             f"{child['cpu']:>12.4f}{share:>8.1f}%  {'  ' * depth}{child['name']}")
+                visit(child, depth + 1)
+
+        visit(self.root, 0)
+        lines.append('')
+        lines.append(f"{'stage (self)':<14}{'calls':>10}{'wall s':>12}{'cpu s':>12}")
+        for stage, t in self.stage_totals().items():
+            lines.append(f"{stage:<14}{t['calls']:>10}{t['wall']:>12.4f}{t['cpu']:>12.4f}")
+        lines.append(f"{'total':<14}{'':>10}{self.root['wall']:>12.4f}{self.root['cpu']:>12.4f}")
+        return '\n'.join(lines)
+
+    def collapsed_stacks(self) -> List[str]:
+        """
+        The stage tree in collapsed-stack format ("a;b;c <microseconds>").
+
+        Each line carries the self wall time of a node, so the output can be
+        fed to flamegraph.pl, speedscope or inferno directly.
+
+        Returns:
+            List[str]: One line per node with non-zero self time
+        """
+        lines = []
+
+        def visit(node, path):
+            children = node['children'].values()
+            own = node['wall'] - sum(c['wall'] for c in children)
+            if own > 0 and path:
+                lines.append(f"{';'.join(path)} {int(round(own * 1e6))}")
+            for child in children:
+                visit(child, path + [child['name']])
+
+        visit(self.root, [])
+        return lines
+
+    def write(self, output_dir: str, suffix: str = '') -> List[str]:
+        """
+        Write stages.txt, stages.folded and, with cProfile, cprofile.prof.
+
+        Args:
+            output_dir: Directory receiving the files (created if needed)
+            suffix: Appended to the file names before the extension, e.g.
+                '-1234' for stages-1234.txt
+
+        Returns:
+            List[str]: Paths written
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        paths = [os.path.join(output_dir, f'stages{suffix}.txt'),
+                 os.path.join(output_dir, f'stages{suffix}.folded')]
+        with open(paths[0], 'w') as f:
+            f.write(self.report() + '\n')
+        with open(paths[1], 'w') as f:
+            f.writelines(line + '\n' for line in self.collapsed_stacks())
+        if self.profile is not None:
+            paths.append(os.path.join(output_dir, f'cprofile{suffix}.prof'))
+            self.profile.dump_stats(paths[-1])
+        return paths
+
+def active_profiler() -> Optional[Profiler]:
+    """The Profiler currently collecting, if any."""
+    return _active
+
+def profiled(stage: str, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorate a pipeline function so active profilers time it.
+
+    Args:
+        stage: Pipeline stage of the function (see STAGES)
+        name: Node label (defaults to the function's qualified name)
+    """
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage!r}; expected one of {STAGES}")
+
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return func(*args, **kwargs)
+            return profiler.call(label, stage, func, *args, **kwargs)
+        return wrapper
+    return decorate
+
+def _finish_environment_profile(profiler: Profiler, output_dir: Optional[str],
+                                suffix: str) -> None:
+    profiler.stop()
+    if not suffix:
+        print(profiler.report(), file=sys.stderr)
+    if output_dir:
+        paths = profiler.write(output_dir, suffix)
+        print(f"Profile written to {', '.join(paths)}", file=sys.stderr)
+
+def _start_from_environment() -> None:
+    """Start a process-wide profiler when RDFLIB_SIMULATOR_PROFILE is set."""
+    value = os.environ.get(ENV_VAR, '').strip()
+    if value.lower() in ('', '0', 'false', 'no', 'off'):
+        return
+    output_dir = None if value.lower() in ('1', 'true', 'yes', 'on') else value
+
+    # Worker processes inherit the variable: they write pid-suffixed files
+    # next to the main process' instead of overwriting them, and stay quiet
+    # without an output directory
+    suffix = ''
+    if multiprocessing.parent_process() is not None:
+        if output_dir is None:
+            return
+        suffix = f'-{os.getpid()}'
+    profiler = Profiler(cprofile=output_dir is not None).start()
+    atexit.register(_finish_environment_profile, profiler, output_dir, suffix)
+
+_start_from_environment()
@@ -0,0 +1,82 @@
+"""
+Persistent on-disk cache for analyzed ontology schemas.
+
+Entries are keyed by the SHA-256 of the ontology file contents, so editing
+the file invalidates its entry automatically. The cache directory defaults
+to ~/.cache/rdflib-simulator and can be moved with the
+RDFLIB_SIMULATOR_CACHE environment variable.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Optional
+
+# Bump when the layout of cached payloads changes
+CACHE_VERSION = 3
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def default_cache_dir() -> str:
+    """Return the cache directory configured for this environment."""
+    return os.environ.get('RDFLIB_SIMULATOR_CACHE',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'rdflib-simulator'))
+
+class SchemaCache:
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the schema cache.
+
+        Args:
+            cache_dir: Directory holding cache entries (see default_cache_dir)
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+
+    def _path(self, digest: str, kind: str) -> str:
+        return os.path.join(self.cache_dir, f"{kind}-v{CACHE_VERSION}-{digest}.pickle")
+
+    def load(self, digest: str, kind: str) -> Optional[Any]:
+        """
+        Load a cached payload.
+
+        Args:
+            digest: Content hash of the ontology file(s)
+            kind: Name of the payload, e.g. 'ontology-data-schema'
+
+        Returns:
+            The cached payload, or None on a miss or unreadable entry
+        """
+        try:
+            with open(self._path(digest, kind), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def store(self, digest: str, kind: str, payload: Any) -> None:
+        """
+        Store a payload atomically; failures to write are ignored.
+
+        Args:
+            digest: Content hash of the ontology file(s)
+            kind: Name of the payload
+            payload: Picklable object to store
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(digest, kind))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
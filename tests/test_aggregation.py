@@ -0,0 +1,68 @@
+"""Tests for the vectorized window aggregation."""
+
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.analysis.aggregation import aggregate_metrics, aggregate_windows, window_starts
+
+def _values(persons: int = 4, days: int = 17, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(100, 10, (persons, days))
+    values[rng.random((persons, days)) < 0.2] = np.nan
+    return values
+
+def _reference(values, starts):
+    """Per-window loop with NumPy's NaN-aware reductions."""
+    bounds = list(zip(starts, list(starts[1:]) + [values.shape[1]]))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return {name: np.array([[func(row[a:b]) for a, b in bounds] for row in values])
+                for name, func in (('mean', np.nanmean), ('std', np.nanstd),
+                                   ('p90', lambda w: np.nanpercentile(w, 90)))}
+
+def test_window_starts():
+    assert window_starts(17, 'week').tolist() == [0, 7, 14]
+    assert window_starts(10, 4).tolist() == [0, 4, 8]
+    assert window_starts(0, 'week').tolist() == []
+    # 2024-01-30 + 40 days crosses into February and March
+    assert window_starts(40, 'month', datetime(2024, 1, 30)).tolist() == [0, 2, 31]
+
+@pytest.mark.parametrize('window, start_date', [(0, None), ('fortnight', None), ('month', None)])
+def test_window_starts_rejects_bad_windows(window, start_date):
+    with pytest.raises(ValueError):
+        window_starts(10, window, start_date)
+
+def test_matches_per_window_loop_with_ragged_last_week():
+    values = _values()
+    values[1, 14:] = np.nan  # a window without observations
+    starts = window_starts(values.shape[1], 'week')
+    result = aggregate_windows(values, starts, percentiles=[90], chunk_size=3)
+    expected = _reference(values, starts)
+
+    np.testing.assert_array_equal(result['count'][:, -1], (~np.isnan(values[:, 14:])).sum(axis=1))
+    for name in ('mean', 'std', 'p90'):
+        np.testing.assert_allclose(result[name], expected[name], equal_nan=True)
+    assert np.isnan(result['mean'][1, -1]) and np.isnan(result['p90'][1, -1])
+
+def test_chunking_does_not_change_percentiles():
+    values = _values(persons=7)
+    starts = window_starts(values.shape[1], 5)
+    whole = aggregate_windows(values, starts, percentiles=[10, 50], chunk_size=100)
+    chunked = aggregate_windows(values, starts, percentiles=[10, 50], chunk_size=2)
+    for key in ('p10', 'p50'):
+        np.testing.assert_array_equal(whole[key], chunked[key])
+
+def test_aggregate_metrics_shares_windows():
+    metrics = {'steps': _values(seed=1), 'sleep': _values(seed=2)}
+    result = aggregate_metrics(metrics, window='month', start_date=datetime(2024, 1, 25))
+    assert result['windows']['start'].tolist() == [0, 7]
+    assert result['windows']['length'].tolist() == [7, 10]
+    assert result['steps']['mean'].shape == result['sleep']['mean'].shape == (4, 2)
+    assert aggregate_metrics({}) == {}
+
+def test_rejects_non_matrix_values():
+    with pytest.raises(ValueError):
+        aggregate_windows(np.zeros(5), np.array([0]))
@@ -0,0 +1,31 @@
+"""Tests for the baseline comparison of the benchmark harness."""
+
+import json
+
+from benchmarks.harness import compare_to_baseline
+
+def _compare(tmp_path, before, after, thresholds=None):
+    path = tmp_path / 'baseline.json'
+    path.write_text(json.dumps({'cases': [{'name': 'case', 'params': {}, 'metrics': before}]}))
+    return compare_to_baseline([{'name': 'case', 'params': {}, 'metrics': after}],
+                               str(path), thresholds)
+
+def test_relative_threshold_on_throughput(tmp_path):
+    assert _compare(tmp_path, {'triples_per_second': 100.0}, {'triples_per_second': 95.0}) == []
+    regressions = _compare(tmp_path, {'triples_per_second': 100.0}, {'triples_per_second': 80.0})
+    assert [r['metric'] for r in regressions] == ['triples_per_second']
+    assert regressions[0]['change'] == -0.2
+
+def test_exponent_uses_absolute_tolerance(tmp_path):
+    # A 0.05 -> 0.1 exponent is a 100% relative change but only noise on a near-constant cost
+    assert _compare(tmp_path, {'exponent': 0.05}, {'exponent': 0.1}) == []
+    # 1.0 -> 1.1 is within the default tolerance, 1.0 -> 1.3 is not
+    assert _compare(tmp_path, {'exponent': 1.0}, {'exponent': 1.1}) == []
+    regressions = _compare(tmp_path, {'exponent': 1.0}, {'exponent': 1.3})
+    assert regressions[0]['metric'] == 'exponent'
+
+def test_exponent_tolerance_override_and_zero_baseline(tmp_path):
+    assert _compare(tmp_path, {'exponent': 1.0}, {'exponent': 1.1}, {'exponent': 0.05})
+    assert _compare(tmp_path, {'exponent': 0.0}, {'exponent': 0.5})
+    # 'default' only sets the relative fallback
+    assert _compare(tmp_path, {'exponent': 1.0}, {'exponent': 1.1}, {'default': 0.01}) == []
@@ -0,0 +1,90 @@
+"""Tests for the partitioned columnar export."""
+
+import glob
+import os
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.utils.columnar_export import ColumnarRecordWriter, read_columns
+from src.utils.data_simulator import PersonalDataSimulator
+
+def _records(days: int):
+    random.seed(0)
+    return list(PersonalDataSimulator(datetime(2024, 1, 1)).iter_days(days, travel_probability=0.5))
+
+def _export(output_dir, records, **kwargs):
+    with ColumnarRecordWriter(str(output_dir), **kwargs) as writer:
+        for record in records:
+            writer.add_day_record(record, 'person1')
+
+def test_round_trip_partitions_by_month(tmp_path):
+    records = _records(45)
+    _export(tmp_path, records, batch_size=7)
+
+    assert sorted(os.listdir(tmp_path / 'health' / 'person=person1')) == ['date=2024-01', 'date=2024-02']
+    health = read_columns(str(tmp_path), 'health')
+    expected = [np.datetime64(record['health']['date']) for record in records]
+    assert list(health['date']) == expected
+    assert set(health['person_id']) == {'person1'}
+
+def test_rerun_overwrites_instead_of_duplicating(tmp_path):
+    records = _records(40)
+    _export(tmp_path, records, batch_size=5)
+    _export(tmp_path, records, batch_size=5)
+
+    assert len(read_columns(str(tmp_path), 'health')['date']) == 40
+
+def test_overwrite_keeps_partitions_the_writer_does_not_touch(tmp_path):
+    records = _records(45)
+    _export(tmp_path, records)
+    # Only January is rewritten; February survives
+    _export(tmp_path, records[:10])
+
+    dates = read_columns(str(tmp_path), 'health')['date']
+    assert len(dates) == 10 + 14
+    assert (dates >= np.datetime64('2024-02-01')).sum() == 14
+
+def test_append_mode_keeps_existing_parts(tmp_path):
+    records = _records(10)
+    _export(tmp_path, records)
+    _export(tmp_path, records, mode='append')
+
+    assert len(read_columns(str(tmp_path), 'health')['date']) == 20
+    assert len(glob.glob(str(tmp_path / 'health' / '*' / '*' / 'part-*'))) == 2
+
+def test_travel_columns_cover_both_flights_and_hotel(tmp_path):
+    records = _records(30)
+    bookings = [record['travel'] for record in records if record['travel'] is not None]
+    _export(tmp_path, records)
+
+    travel = read_columns(str(tmp_path), 'travel')
+    assert len(travel['booking_id']) == len(bookings)
+    order = np.argsort(travel['booking_id'])
+    bookings.sort(key=lambda booking: booking['booking_id'])
+    for row, booking in zip(order, bookings):
+        assert travel['departure_city'][row] == booking['flight']['departure']['city']
+        assert travel['departure_country'][row] == booking['flight']['departure']['country']
+        assert travel['flight_number'][row] == booking['flight']['flight_number']
+        assert travel['return_flight_number'][row] == booking['return_flight']['flight_number']
+        assert travel['return_departure_datetime'][row] == np.datetime64(
+            booking['return_flight']['departure']['datetime'])
+        assert travel['booking_reference'][row] == booking['hotel']['booking_reference']
+
+def test_booking_without_return_flight(tmp_path):
+    random.seed(0)
+    booking = PersonalDataSimulator(datetime(2024, 1, 1)).generate_travel_booking()
+    del booking['return_flight']
+    with ColumnarRecordWriter(str(tmp_path)) as writer:
+        writer.add_travel(booking, 'person1')
+
+    travel = read_columns(str(tmp_path), 'travel')
+    assert travel['return_flight_number'][0] == ''
+    assert np.isnat(travel['return_arrival_datetime'][0])
+    assert travel['flight_number'][0] == booking['flight']['flight_number']
+
+def test_rejects_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarRecordWriter(str(tmp_path), mode='replace')
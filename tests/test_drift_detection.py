@@ -0,0 +1,72 @@
+"""Tests for the online drift detector."""
+
+import numpy as np
+import pytest
+
+from src.analysis.drift_detection import OnlineDriftDetector
+
+def _stream(noise: float = 0.01, days: int = 20, jump_day: int = 15, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    values = 100.0 * (1 + noise * rng.standard_normal(days))
+    values[jump_day:] *= 1.5
+    return values
+
+def test_flags_a_jump_but_not_the_stable_part():
+    detector = OnlineDriftDetector(['steps'], threshold=0.2)
+    values = [100.0 + (-1) ** day for day in range(15)] + [150.0] * 5
+    flags = [detector.observe('p', 'steps', value) for value in values]
+    assert not any(flags[:15])
+    assert flags[15]
+    assert detector.statistics('steps')['alarms'][0] == sum(flags)
+
+def test_no_flags_during_baseline():
+    detector = OnlineDriftDetector(['steps'], threshold=0.01, baseline_size=3)
+    flags = [detector.observe('p', 'steps', value) for value in [100, 200, 50, 400, 100]]
+    # Three relative changes form the baseline; only the fifth value can be flagged
+    assert flags[:4] == [False] * 4
+    assert flags[4]
+
+def test_vectorized_update_matches_observe():
+    metrics = ['steps', 'sleep']
+    values = np.stack([np.stack([_stream(seed=s), _stream(seed=s + 10, jump_day=8)], axis=-1)
+                       for s in range(5)])  # persons x days x metrics
+    batch = OnlineDriftDetector(metrics)
+    batch.add_persons(range(5))
+    single = OnlineDriftDetector(metrics)
+
+    for day in range(values.shape[1]):
+        flags = batch.update(values[:, day, :])
+        expected = [[single.observe(p, m, values[p, day, j]) for j, m in enumerate(metrics)]
+                    for p in range(5)]
+        assert flags.tolist() == expected
+    for metric in metrics:
+        for key, array in batch.statistics(metric).items():
+            np.testing.assert_allclose(array, single.statistics(metric)[key])
+
+def test_missing_observations_leave_streams_untouched():
+    detector = OnlineDriftDetector(['steps', 'sleep'])
+    detector.update(np.array([[100.0, 8.0]]), person_ids=['p'])
+    flags = detector.update(np.array([[np.nan, 7.0]]), person_ids=['p'])
+    assert not flags.any()
+    assert detector.statistics('steps')['count'].tolist() == [1]
+    assert detector.statistics('sleep')['count'].tolist() == [2]
+
+def test_state_survives_growth_and_reset():
+    detector = OnlineDriftDetector(['steps'])
+    for person in range(40):
+        detector.observe(person, 'steps', float(person))
+    assert detector.statistics('steps')['mean'].tolist() == [float(p) for p in range(40)]
+
+    detector.reset(3)
+    stats = detector.statistics('steps')
+    assert stats['count'][3] == 0 and stats['count'][4] == 1
+    detector.reset()
+    assert not detector.statistics('steps')['count'].any()
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        OnlineDriftDetector(['steps'], alpha=0)
+    detector = OnlineDriftDetector(['steps', 'sleep'])
+    detector.add_persons(['a', 'b'])
+    with pytest.raises(ValueError):
+        detector.update(np.zeros((2, 3)))
@@ -0,0 +1,63 @@
+"""Tests for the vectorized drift injection engine."""
+
+import numpy as np
+import pytest
+
+from src.utils.drift_simulator import DriftInjector, DriftPattern, DriftScenario
+
+def _health(persons: int = 3, days: int = 10):
+    return {
+        'steps': np.full((persons, days), 10000, dtype=np.int64),
+        'sleep_duration': np.full((persons, days), 8.0),
+        'weight': np.full((persons, days), 70.0)
+    }
+
+def test_step_drift_applies_from_onset():
+    injector = DriftInjector([DriftScenario('lazy', DriftPattern.STEP,
+                                            {'steps': -0.4, 'sleep_duration': 0.25})])
+    result = injector.inject(_health(), scenario_idx=np.array([0, -1, 0]), onsets=np.array([2, -1, 9]))
+    steps, sleep = result['data']['steps'], result['data']['sleep_duration']
+
+    assert steps.dtype == np.int64
+    assert (steps[0, :2] == 10000).all() and (steps[0, 2:] == 6000).all()
+    assert (sleep[0, 2:] == 10.0).all()
+    # Persons without drift and metrics without an effect are untouched
+    assert (steps[1] == 10000).all()
+    assert (result['data']['weight'] == 70.0).all()
+    assert result['labels'].sum(axis=1).tolist() == [8, 0, 1]
+
+def test_ramp_and_seasonal_intensity():
+    ramp = DriftScenario('ramp', DriftPattern.RAMP, ramp_days=4)
+    assert ramp.intensity(np.array([-1, 0, 1, 3, 10])).tolist() == [0.0, 0.25, 0.5, 1.0, 1.0]
+    seasonal = DriftScenario('seasonal', DriftPattern.SEASONAL, period_days=4)
+    np.testing.assert_allclose(seasonal.intensity(np.array([-2, 0, 1, 3])), [0.0, 0.0, 1.0, -1.0],
+                               atol=1e-12)
+
+def test_scenarios_apply_per_person():
+    injector = DriftInjector([DriftScenario('up', DriftPattern.STEP, {'weight': 0.1}),
+                              DriftScenario('ramp', DriftPattern.RAMP, {'weight': -0.1}, ramp_days=2)])
+    result = injector.inject(_health(2, 3), scenario_idx=[0, 1], onsets=[0, 0])
+    np.testing.assert_allclose(result['data']['weight'], [[77.0, 77.0, 77.0], [66.5, 63.0, 63.0]])
+
+def test_assign_respects_probability_weights_and_onset_range():
+    injector = DriftInjector([DriftScenario('a', DriftPattern.STEP), DriftScenario('b', DriftPattern.STEP)],
+                             weights=[0, 1], onset_range=(3, 5))
+    scenario, onsets = injector.assign(200, 30, np.random.default_rng(0))
+    assert (scenario == 1).all()
+    assert onsets.min() >= 3 and onsets.max() <= 5
+
+    never = DriftInjector([DriftScenario('a', DriftPattern.STEP)], drift_probability=0.0)
+    result = never.inject(_health(), rng=np.random.default_rng(0))
+    assert (result['scenario'] == -1).all() and (result['onset'] == -1).all()
+    assert not result['labels'].any()
+    assert (result['data']['steps'] == 10000).all()
+
+def test_assign_is_reproducible_with_a_seeded_generator():
+    injector = DriftInjector([DriftScenario('a', DriftPattern.STEP)], drift_probability=0.5)
+    first = injector.assign(50, 30, np.random.default_rng(7))
+    second = injector.assign(50, 30, np.random.default_rng(7))
+    assert all((a == b).all() for a, b in zip(first, second))
+
+def test_requires_a_scenario():
+    with pytest.raises(ValueError):
+        DriftInjector([])
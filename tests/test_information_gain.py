@@ -0,0 +1,72 @@
+"""Regression tests for InformationGainAnalyzer in GraphManager mode."""
+
+import math
+
+from rdflib import Literal, URIRef
+from rdflib.namespace import OWL, RDF
+
+from src.analysis.information_gain import InformationGainAnalyzer
+from src.core.graph_manager import GraphManager
+
+HEALTH = 'http://example.org/personal/health/'
+
+def _uri(name: str) -> URIRef:
+    return URIRef(HEALTH + name)
+
+def test_delta_after_add_then_remove():
+    gm = GraphManager()
+    analyzer = InformationGainAnalyzer(gm)
+    node = _uri('record')
+    gm.add_triples([(node, _uri('p'), _uri('a')), (node, _uri('q'), _uri('b'))])
+    analyzer.calculate_information_gain_delta()
+
+    # A triple added and removed again between two calls leaves no trace
+    triple = (node, _uri('r'), _uri('a'))
+    gm.add_triples([triple])
+    gm.remove_triples([triple])
+    gain = analyzer.calculate_information_gain_delta()
+    assert gain['health']['gain'] == 0.0
+    assert analyzer.calculate_node_entropy(node) == 1.0
+    assert (analyzer.calculate_node_entropy(node)
+            == InformationGainAnalyzer(gm.graph).calculate_node_entropy(node))
+
+    gm.remove_triples(list(gm.graph))
+    gain = analyzer.calculate_information_gain_delta()
+    assert gain['health']['after'] == 0.0
+    assert analyzer._category_totals['health'] == [0.0, 0]
+
+def test_select_nodes_index_matches_scan():
+    gm = GraphManager()
+    analyzer = InformationGainAnalyzer(gm)
+    namespaces = list(analyzer.category_namespaces.items())
+    record, other = _uri('record'), URIRef('http://example.org/personal/travel/trip')
+    changes = [
+        ('add', [(record, _uri('p'), _uri('a')), (other, _uri('q'), record)]),
+        ('remove', [(record, _uri('p'), _uri('a'))]),
+        ('remove', [(other, _uri('q'), record)]),
+        ('add', [(other, _uri('q'), _uri('a'))])
+    ]
+    for action, triples in changes:
+        getattr(gm, f"{action}_triples")(triples)
+        assert (analyzer.select_nodes()
+                == analyzer._select(namespaces, gm.graph, gm.graph.all_nodes()))
+
+def test_category_entropy_index_matches_scan():
+    gm = GraphManager()
+    analyzer = InformationGainAnalyzer(gm)
+    trip = URIRef('http://example.org/personal/travel/trip')
+    gm.add_triples([(_uri('record'), _uri('p'), _uri('a')), (_uri('record'), _uri('q'), _uri('b')),
+                    (trip, _uri('q'), _uri('record')), (trip, RDF.type, _uri('Trip')),
+                    (_uri('Metric'), RDF.type, OWL.Class), (_uri('record'), _uri('r'), Literal(1))])
+
+    expected = analyzer.category_entropy()
+    # record, a, b, the class Trip and the trip typed with it; not the schema class
+    assert expected['health']['nodes'] == 5
+    assert expected['travel'] == {'nodes': 1, 'total': 1.0, 'average': 1.0}
+    for processes, chunk_size in ((1, 50000), (2, 2)):
+        scanned = InformationGainAnalyzer(gm.graph).category_entropy(processes=processes,
+                                                                    chunk_size=chunk_size)
+        assert scanned.keys() == expected.keys()
+        for category, values in expected.items():
+            assert scanned[category]['nodes'] == values['nodes']
+            assert math.isclose(scanned[category]['total'], values['total'])
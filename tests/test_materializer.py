@@ -0,0 +1,96 @@
+"""Tests for the incremental RDFS/OWL-RL materializer."""
+
+import pytest
+from rdflib import Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS
+
+from src.core.graph_manager import GraphManager
+from src.core.materializer import RDFSMaterializer
+
+EX = 'http://example.org/test/'
+
+def _uri(name: str) -> URIRef:
+    return URIRef(EX + name)
+
+class Recorder:
+    def __init__(self):
+        self.added = []
+
+    def on_add(self, triples):
+        self.added.extend(triples)
+
+def test_closes_existing_triples_on_attach():
+    gm = GraphManager()
+    gm.add_triples([(_uri('A'), RDFS.subClassOf, _uri('B')),
+                    (_uri('B'), RDFS.subClassOf, _uri('C')),
+                    (_uri('x'), RDF.type, _uri('A'))])
+    materializer = RDFSMaterializer(gm)
+
+    assert (_uri('A'), RDFS.subClassOf, _uri('C')) in gm.graph
+    assert (_uri('x'), RDF.type, _uri('C')) in gm.graph
+    assert materializer.inferred_count == 3
+
+def test_materialize_existing_false_only_closes_new_triples():
+    gm = GraphManager()
+    gm.add_triples([(_uri('A'), RDFS.subClassOf, _uri('B')), (_uri('x'), RDF.type, _uri('A'))])
+    RDFSMaterializer(gm, materialize_existing=False)
+    assert (_uri('x'), RDF.type, _uri('B')) not in gm.graph
+
+    gm.add_triple(_uri('y'), RDF.type, _uri('A'))
+    assert (_uri('y'), RDF.type, _uri('B')) in gm.graph
+
+def test_schema_added_after_data_types_existing_instances():
+    gm = GraphManager()
+    RDFSMaterializer(gm)
+    gm.add_triples([(_uri('x'), _uri('knows'), _uri('y')), (_uri('x'), _uri('age'), Literal(3))])
+    gm.add_triples([(_uri('knows'), RDFS.domain, _uri('Person')),
+                    (_uri('knows'), RDFS.range, _uri('Person')),
+                    (_uri('age'), RDFS.range, _uri('Number')),
+                    (_uri('knows'), RDFS.subPropertyOf, _uri('related'))])
+
+    assert set(gm.graph.subjects(RDF.type, _uri('Person'))) == {_uri('x'), _uri('y')}
+    assert (_uri('x'), _uri('related'), _uri('y')) in gm.graph
+    # Literals are never typed by rdfs:range
+    assert not list(gm.graph.subjects(RDF.type, _uri('Number')))
+
+def test_owl_rules_are_opt_in_and_chain():
+    gm = GraphManager()
+    RDFSMaterializer(gm, rules=['prp-inv', 'prp-symp', 'prp-trp', 'cax-eqc'])
+    gm.add_triples([(_uri('parentOf'), OWL.inverseOf, _uri('childOf')),
+                    (_uri('sibling'), RDF.type, OWL.SymmetricProperty),
+                    (_uri('ancestor'), RDF.type, OWL.TransitiveProperty),
+                    (_uri('Human'), OWL.equivalentClass, _uri('Person'))])
+    gm.add_triples([(_uri('a'), _uri('parentOf'), _uri('b')),
+                    (_uri('b'), _uri('sibling'), _uri('c')),
+                    (_uri('a'), _uri('ancestor'), _uri('b')),
+                    (_uri('b'), _uri('ancestor'), _uri('c')),
+                    (_uri('c'), _uri('ancestor'), _uri('d')),
+                    (_uri('a'), RDF.type, _uri('Person'))])
+
+    assert (_uri('b'), _uri('childOf'), _uri('a')) in gm.graph
+    assert (_uri('c'), _uri('sibling'), _uri('b')) in gm.graph
+    assert set(gm.graph.objects(_uri('a'), _uri('ancestor'))) == {_uri('b'), _uri('c'), _uri('d')}
+    assert (_uri('a'), RDF.type, _uri('Human')) in gm.graph
+
+def test_default_rules_ignore_owl():
+    gm = GraphManager()
+    RDFSMaterializer(gm)
+    gm.add_triples([(_uri('sibling'), RDF.type, OWL.SymmetricProperty),
+                    (_uri('b'), _uri('sibling'), _uri('c'))])
+    assert (_uri('c'), _uri('sibling'), _uri('b')) not in gm.graph
+
+def test_other_listeners_see_inferred_triples_and_detach_stops():
+    gm = GraphManager()
+    materializer = RDFSMaterializer(gm)
+    recorder = Recorder()
+    gm.add_listener(recorder)
+    gm.add_triples([(_uri('A'), RDFS.subClassOf, _uri('B')), (_uri('x'), RDF.type, _uri('A'))])
+    assert (_uri('x'), RDF.type, _uri('B')) in recorder.added
+
+    materializer.detach()
+    gm.add_triple(_uri('y'), RDF.type, _uri('A'))
+    assert (_uri('y'), RDF.type, _uri('B')) not in gm.graph
+
+def test_rejects_unknown_rules():
+    with pytest.raises(ValueError):
+        RDFSMaterializer(GraphManager(), rules=['rdfs2', 'owl-everything'])
@@ -0,0 +1,88 @@
+"""Tests for graph memory accounting and allocation tracking."""
+
+import random
+import tracemalloc
+from datetime import datetime
+
+import pytest
+from rdflib import BNode, Literal, URIRef
+
+from src.core.graph_manager import GraphManager
+from src.core.memory import AllocationTracker, combine_memory_usage, format_memory_usage
+from src.core.personal_ontology_builder import PersonalOntologyBuilder
+from src.utils.data_simulator import PersonalDataSimulator
+
+EX = 'http://example.org/test/'
+
+def _filled(n: int) -> GraphManager:
+    gm = GraphManager()
+    gm.add_triples([(URIRef(f"{EX}s{i}"), URIRef(EX + 'value'), Literal(i)) for i in range(n)]
+                   + [(URIRef(f"{EX}s{i}"), URIRef(EX + 'link'), BNode()) for i in range(n)])
+    return gm
+
+def test_empty_graph():
+    usage = GraphManager().memory_usage()
+    assert usage['triples'] == 0
+    assert usage['bytes_per_triple'] is None
+    assert usage['terms']['uris']['objects'] == 0
+    assert '0 triples' in format_memory_usage(usage)
+
+def test_components_add_up_and_count_terms():
+    usage = _filled(100).memory_usage()
+    terms = usage['terms']
+
+    assert usage['triples'] == 200
+    assert usage['total'] == (usage['store_indexes'] + terms['bytes']
+                              + usage['namespace_bindings'] + usage['caches'])
+    assert usage['bytes_per_triple'] == usage['total'] / 200
+    assert terms['uris']['unique'] == 102
+    assert terms['literals']['unique'] == 100
+    assert terms['bnodes']['unique'] == 100
+    assert terms['uris']['objects'] >= terms['uris']['unique']
+    assert terms['bytes'] == sum(terms[kind]['bytes'] for kind in ('uris', 'literals', 'bnodes'))
+
+def test_usage_grows_with_the_graph():
+    small, large = _filled(100).memory_usage(), _filled(1000).memory_usage()
+    assert large['store_indexes'] > 5 * small['store_indexes']
+    assert large['terms']['bytes'] > 5 * small['terms']['bytes']
+
+def test_combine_memory_usage():
+    usages = [_filled(10).memory_usage(), _filled(30).memory_usage()]
+    combined = combine_memory_usage(usages)
+    assert combined['triples'] == 80
+    assert combined['total'] == usages[0]['total'] + usages[1]['total']
+    assert combined['terms']['literals']['objects'] == sum(u['terms']['literals']['objects'] for u in usages)
+
+    deduplicated = combine_memory_usage(usages, triples=60)
+    assert deduplicated['bytes_per_triple'] == combined['total'] / 60
+
+def test_allocation_tracker_charges_builder_methods():
+    random.seed(0)
+    gm = GraphManager()
+    builder = PersonalOntologyBuilder(graph_manager=gm)
+    simulator = PersonalDataSimulator(datetime(2024, 1, 1))
+    records = [simulator.generate_daily_health_data() for _ in range(20)]
+    was_tracing = tracemalloc.is_tracing()
+
+    tracker = gm.track_allocations()
+    with pytest.raises(RuntimeError):
+        tracker.by_method()
+    with tracker:
+        for record in records:
+            builder.add_health_data(record, 'alice')
+
+    methods = tracker.by_method()
+    assert tracemalloc.is_tracing() == was_tracing
+    assert any(name.startswith('PersonalOntologyBuilder.') and m['bytes'] > 0
+               for name, m in methods.items())
+    assert list(methods.values()) == sorted(methods.values(), key=lambda m: -m['bytes'])
+    assert 'peak traced during the run' in tracker.report()
+
+def test_allocation_tracker_with_function_targets():
+    def allocate():
+        return [object() for _ in range(1000)]
+
+    with AllocationTracker([allocate]) as tracker:
+        kept = allocate()
+    assert tracker.by_method()[allocate.__qualname__]['blocks'] >= 1000
+    assert len(kept) == 1000
@@ -0,0 +1,37 @@
+"""Tests for instance generation in OntologyBasedSimulator."""
+
+import os
+
+from rdflib import URIRef
+from rdflib.namespace import RDF
+
+from src.core.graph_manager import GraphManager
+from src.core.ontology_builder import OntologyBuilder
+from src.core.ontology_simulator import OntologyBasedSimulator
+
+ONTOLOGY = os.path.join(os.path.dirname(__file__), '..', 'data', 'custom_ontology.owl')
+PERSON = URIRef('http://example.org/custom/Person')
+
+def _simulator(gm: GraphManager) -> OntologyBasedSimulator:
+    simulator = OntologyBasedSimulator(use_cache=False)
+    simulator.ontology_builder = OntologyBuilder(gm)
+    simulator.load_custom_ontology(ONTOLOGY)
+    return simulator
+
+def test_simulators_sharing_a_graph_generate_distinct_ids():
+    gm = GraphManager()
+    first, second = _simulator(gm), _simulator(gm)
+    first.simulate_data(PERSON, 5)
+    second.simulate_data(PERSON, 5)
+
+    instances = set(gm.graph.subjects(RDF.type, PERSON))
+    assert len(instances) == 10
+    assert all(str(uri).startswith('http://example.org/instance_') for uri in instances)
+    assert not set(first.instance_pools[PERSON]) & set(second.instance_pools[PERSON])
+
+def test_explicit_ids_are_kept():
+    gm = GraphManager()
+    simulator = _simulator(gm)
+    simulator.simulate_data(PERSON, 2, base_id='person')
+    assert set(gm.graph.subjects(RDF.type, PERSON)) == {
+        URIRef('http://example.org/person_0'), URIRef('http://example.org/person_1')}
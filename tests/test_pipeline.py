@@ -0,0 +1,119 @@
+"""Tests for the streaming simulation pipeline."""
+
+import random
+from datetime import datetime
+
+import pytest
+from rdflib.namespace import RDF
+
+from src.core.graph_manager import GraphManager
+from src.core.personal_ontology_builder import PersonalOntologyBuilder
+from src.utils.data_simulator import PersonalDataSimulator
+from src.utils.drift_simulator import DriftPattern, DriftScenario
+from src.utils.pipeline import (batch_stage, drift_stage, filter_stage, graph_sink, pipeline,
+                                process_stage, run, threaded, transform_stage, triples_stage)
+
+class RecordingGraphManager(GraphManager):
+    """GraphManager remembering the routing hints of every batch."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def add_triples(self, triples, partition_key=None, broadcast=False):
+        triples = list(triples)
+        self.calls.append((triples, partition_key, broadcast))
+        super().add_triples(triples, partition_key, broadcast)
+
+def _records(days: int, travel_probability: float = 1.0):
+    random.seed(0)
+    return PersonalDataSimulator(datetime(2024, 1, 1)).iter_days(
+        days, travel_probability=travel_probability)
+
+def test_stages_compose_in_order():
+    stream = pipeline(range(10), filter_stage(lambda x: x % 2 == 0),
+                      transform_stage(lambda x: x * 10), batch_stage(2))
+    assert list(stream) == [[0, 20], [40, 60], [80]]
+
+def test_run_counts_and_sinks_items():
+    seen = []
+    assert run(iter([1, 2, 3]), seen.append) == 3
+    assert seen == [1, 2, 3]
+
+def test_threaded_passes_items_and_errors():
+    assert list(pipeline(range(100), threaded(maxsize=4))) == list(range(100))
+
+    def failing(stream):
+        yield 1
+        raise RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        list(pipeline(iter([None]), failing, threaded()))
+
+def test_process_stage_preserves_order():
+    assert list(pipeline(range(-20, 0), process_stage(abs, processes=2, chunksize=3))) == \
+        list(range(20, 0, -1))
+
+def test_drift_stage_labels_and_scales_from_onset():
+    scenario = DriftScenario('tachycardia', DriftPattern.STEP,
+                             {'heart_rate_average': 0.5})
+    records = list(_records(4, travel_probability=0.0))
+    before = [r['health']['heart_rate']['average'] for r in records]
+    drifted = list(pipeline(records, drift_stage(scenario, onset_day=2)))
+    assert [r['drift'] for r in drifted] == [False, False, True, True]
+    after = [r['health']['heart_rate']['average'] for r in drifted]
+    assert after[:2] == before[:2]
+    assert all(a > b for a, b in zip(after[2:], before[2:]))
+
+def test_dropped_batches_do_not_suppress_entity_descriptions():
+    gm = GraphManager()
+    builder = PersonalOntologyBuilder(graph_manager=gm)
+    records = list(_records(3))
+    # The first day's batch is built, then dropped before reaching the sink
+    stream = pipeline(records, triples_stage(builder, 'alice'), filter_stage(lambda _: False))
+    run(stream)
+    run(pipeline(records[1:], triples_stage(builder, 'alice')), graph_sink(builder, 'alice'))
+
+    graph = gm.graph
+    person = builder.person['person_alice']
+    assert (person, RDF.type, builder.person.Person) in graph
+    # Every airport, city, airline and hotel referenced is described
+    for predicate in (builder.travel.hasDeparture, builder.travel.hasArrival,
+                      builder.travel.operatedBy, builder.travel.hotel):
+        for target in graph.objects(None, predicate):
+            assert graph.value(target, RDF.type) is not None
+
+def test_failed_insert_keeps_entities_pending():
+    gm = GraphManager()
+    builder = PersonalOntologyBuilder(graph_manager=gm)
+    record = next(_records(1))
+    triples = builder.travel_triples(record['travel'], 'bob')
+
+    def unavailable(*args, **kwargs):
+        raise OSError("store down")
+    gm.add_triples = unavailable
+    with pytest.raises(OSError):
+        builder.insert_triples(triples, 'bob')
+    del gm.add_triples
+
+    again = builder.travel_triples(record['travel'], 'bob')
+    assert sorted(again) == sorted(triples)
+    builder.insert_triples(again, 'bob')
+    assert builder.travel_triples(record['travel'], 'bob') != again
+
+def test_graph_sink_forwards_routing_hints():
+    gm = RecordingGraphManager()
+    builder = PersonalOntologyBuilder(graph_manager=gm)
+    gm.calls.clear()
+    run(pipeline(_records(2), triples_stage(builder, 'carol')), graph_sink(builder, 'carol'))
+
+    shared_types = {builder.location.City, builder.location.Airport,
+                    builder.travel.Airline, builder.travel.Hotel}
+    broadcast = [c for c in gm.calls if c[2]]
+    owned = [c for c in gm.calls if not c[2]]
+    assert broadcast and owned
+    assert all(key == 'carol' for _, key, _ in owned)
+    broadcast_subjects = {t[0] for triples, _, _ in broadcast for t in triples}
+    assert all(o in shared_types for s, p, o in gm.graph.triples((None, RDF.type, None))
+               if s in broadcast_subjects)
+    # Nothing describing a shared entity is routed to the person's shard
+    assert not any(t[0] in broadcast_subjects for triples, _, _ in owned for t in triples)
@@ -0,0 +1,81 @@
+"""Tests for the opt-in stage profiler."""
+
+import os
+import threading
+
+import pytest
+
+from src.utils import profiling
+from src.utils.profiling import Profiler, active_profiler, profiled
+
+@profiled('build')
+def _build(n):
+    return sum(_insert(i) for i in range(n))
+
+@profiled('insert')
+def _insert(i):
+    return i
+
+def test_decorated_functions_run_unprofiled():
+    assert active_profiler() is None
+    assert _build(3) == 3
+
+def test_unknown_stage_is_rejected():
+    with pytest.raises(ValueError):
+        profiled('warp')
+
+def test_calls_nest_and_stages_partition_time():
+    with Profiler() as profiler:
+        _build(5)
+        _build(2)
+    build = profiler.root['children']['_build']
+    assert build['calls'] == 2
+    assert build['children']['_insert']['calls'] == 7
+    totals = profiler.stage_totals()
+    assert list(totals) == ['build', 'insert']
+    assert totals['insert']['calls'] == 7
+    assert sum(t['wall'] for t in totals.values()) == pytest.approx(build['wall'])
+    assert active_profiler() is None
+
+def test_concurrent_calls_are_all_counted():
+    threads, calls = 8, 2000
+
+    def work():
+        for i in range(calls):
+            _insert(i)
+
+    with Profiler() as profiler:
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    assert profiler.root['children']['_insert']['calls'] == threads * calls
+
+def test_collapsed_stacks_and_files(tmp_path):
+    with Profiler(cprofile=True) as profiler:
+        _build(3)
+    stacks = profiler.collapsed_stacks()
+    assert any(line.startswith('_build;_insert ') for line in stacks)
+    paths = profiler.write(str(tmp_path), '-7')
+    assert sorted(os.path.basename(p) for p in paths) == \
+        ['cprofile-7.prof', 'stages-7.folded', 'stages-7.txt']
+
+def _start(monkeypatch, value, parent):
+    registered = []
+    monkeypatch.setenv(profiling.ENV_VAR, value)
+    monkeypatch.setattr(profiling.multiprocessing, 'parent_process', lambda: parent)
+    monkeypatch.setattr(profiling.atexit, 'register', lambda *args: registered.append(args))
+    profiling._start_from_environment()
+    for args in registered:
+        args[1].stop()
+    return registered
+
+def test_environment_profiler_in_worker_processes(monkeypatch, tmp_path):
+    assert _start(monkeypatch, '0', None) == []
+    assert _start(monkeypatch, '1', object()) == []
+
+    (main,) = _start(monkeypatch, str(tmp_path), None)
+    assert main[2:] == (str(tmp_path), '')
+    (worker,) = _start(monkeypatch, str(tmp_path), object())
+    assert worker[2:] == (str(tmp_path), f'-{os.getpid()}')
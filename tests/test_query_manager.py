@@ -0,0 +1,76 @@
+"""Tests for extracting health arrays from the graph."""
+
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.core import query_manager
+from src.core.graph_manager import GraphManager
+from src.core.personal_data_simulator import PersonalDataKnowledgeSimulator
+from src.core.query_manager import HEALTH_PROPERTY_METRICS, QueryManager
+from src.utils.columnar_export import ColumnarRecordWriter, read_columns
+
+START = datetime(2024, 1, 1)
+PERSONS = ['alice', 'bob']
+
+@pytest.fixture(scope='module')
+def simulated(tmp_path_factory):
+    """A graph of two persons plus the same health records as columns."""
+    random.seed(0)
+    output_dir = str(tmp_path_factory.mktemp('columns'))
+    gm = GraphManager()
+    with ColumnarRecordWriter(output_dir) as writer:
+        for person in PERSONS:
+            simulator = PersonalDataKnowledgeSimulator(person, START, columnar_writer=writer,
+                                                       graph_manager=gm)
+            simulator.simulate_period(30)
+    return gm.graph, output_dir
+
+def _expected(output_dir, person, dates):
+    columns = read_columns(output_dir, 'health', person)
+    cols = (columns['date'].astype('datetime64[D]') - dates[0]).astype(np.int64)
+    inside = (cols >= 0) & (cols < len(dates))
+    expected = {}
+    for metric in HEALTH_PROPERTY_METRICS.values():
+        array = np.full(len(dates), np.nan)
+        array[cols[inside]] = columns[metric][inside]
+        expected[metric] = array
+    return expected
+
+@pytest.mark.parametrize('lookup_max', [query_manager.PERSON_LOOKUP_MAX, 0])
+def test_matches_simulated_records_on_both_paths(simulated, monkeypatch, lookup_max):
+    graph, output_dir = simulated
+    monkeypatch.setattr(query_manager, 'PERSON_LOOKUP_MAX', lookup_max)
+    result = QueryManager(graph).get_health_arrays(PERSONS + ['nobody'])
+
+    dates = result['dates']
+    assert result['persons'][0] == 'http://example.org/personal/person/person_alice'
+    assert dates[0] >= np.datetime64('2024-01-01') and dates[-1] <= np.datetime64('2024-01-30')
+    assert (~np.isnan(result['metrics']['steps'][:2])).sum(axis=1).min() > 5
+    for row, person in enumerate(PERSONS):
+        for metric, expected in _expected(output_dir, person, dates).items():
+            np.testing.assert_array_equal(result['metrics'][metric][row], expected)
+    # A person without records gets an all-NaN row
+    assert np.isnan(result['metrics']['steps'][2]).all()
+
+def test_single_person_window_and_metric_subset(simulated):
+    graph, output_dir = simulated
+    start, end = datetime(2023, 12, 30), datetime(2024, 1, 10)
+    result = QueryManager(graph).get_health_arrays('alice', start, end, metrics=['steps'])
+
+    assert list(result['metrics']) == ['steps']
+    assert result['dates'][0] == np.datetime64('2023-12-30') and len(result['dates']) == 12
+    steps = result['metrics']['steps']
+    assert steps.shape == (12,)
+    assert np.isnan(steps[:2]).all()
+    np.testing.assert_array_equal(steps[2:], _expected(output_dir, 'alice', result['dates'][2:])['steps'])
+
+def test_empty_result_and_unknown_metric(simulated):
+    graph, _ = simulated
+    result = QueryManager(graph).get_health_arrays(['nobody'])
+    assert len(result['dates']) == 0
+    assert result['metrics']['steps'].shape == (1, 0)
+    with pytest.raises(ValueError):
+        QueryManager(graph).get_health_arrays('alice', metrics=['mood'])
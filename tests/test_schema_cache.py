@@ -0,0 +1,86 @@
+"""Tests for the on-disk schema cache used by OntologyBasedSimulator."""
+
+import os
+
+from rdflib import Literal, URIRef
+from rdflib.namespace import RDF, RDFS, OWL
+
+from src.core import ontology_simulator
+from src.core.ontology_simulator import OntologyBasedSimulator
+from src.utils.schema_cache import SchemaCache, file_digest
+
+ONTOLOGY = os.path.join(os.path.dirname(__file__), '..', 'data', 'custom_ontology.owl')
+EX = 'http://example.org/custom/'
+
+def _count_analyses(monkeypatch) -> list:
+    calls = []
+    original = ontology_simulator.OntologySchema.from_graph
+
+    def from_graph(graph):
+        calls.append(len(graph))
+        return original(graph)
+    monkeypatch.setattr(ontology_simulator.OntologySchema, 'from_graph', from_graph)
+    return calls
+
+def _simulator(cache_dir) -> OntologyBasedSimulator:
+    return OntologyBasedSimulator(custom_ontology_path=ONTOLOGY, cache_dir=str(cache_dir))
+
+def test_store_and_load_round_trip(tmp_path):
+    cache = SchemaCache(str(tmp_path))
+    assert cache.load('abc', 'kind') is None
+    cache.store('abc', 'kind', {'value': 1})
+    assert cache.load('abc', 'kind') == {'value': 1}
+    assert cache.load('abc', 'other') is None
+
+def test_file_digest_follows_contents(tmp_path):
+    path = tmp_path / 'o.ttl'
+    path.write_text('a')
+    first = file_digest(str(path))
+    path.write_text('b')
+    assert file_digest(str(path)) != first
+
+def test_analysis_is_reused_for_the_same_file(tmp_path, monkeypatch):
+    calls = _count_analyses(monkeypatch)
+    first = _simulator(tmp_path)
+    first.analyze_ontology()
+    second = _simulator(tmp_path)
+    second.analyze_ontology()
+    assert len(calls) == 1
+    assert set(second.classes) == set(first.classes)
+
+def test_graph_with_other_triples_is_not_served_from_cache(tmp_path, monkeypatch):
+    calls = _count_analyses(monkeypatch)
+    _simulator(tmp_path).analyze_ontology()
+
+    # Same triple count as the plain file, different contents
+    simulator = _simulator(tmp_path)
+    gm = simulator.ontology_builder.get_graph_manager()
+    label = next(gm.graph.triples((None, RDFS.label, None)))
+    extra = URIRef(EX + 'Robot')
+    gm.remove_triples([label])
+    gm.add_triples([(extra, RDF.type, OWL.Class)])
+    simulator.analyze_ontology()
+    assert len(calls) == 2
+    assert extra in simulator.classes
+
+def test_triples_added_before_loading_disable_the_cache(tmp_path, monkeypatch):
+    calls = _count_analyses(monkeypatch)
+    _simulator(tmp_path).analyze_ontology()
+
+    simulator = OntologyBasedSimulator(cache_dir=str(tmp_path))
+    simulator.ontology_builder.get_graph_manager().add_triples(
+        [(URIRef(EX + 'Robot'), RDF.type, OWL.Class)])
+    simulator.load_custom_ontology(ONTOLOGY)
+    simulator.analyze_ontology()
+    assert len(calls) == 2
+    assert URIRef(EX + 'Robot') in simulator.classes
+
+def test_direct_graph_edits_disable_the_cache(tmp_path, monkeypatch):
+    calls = _count_analyses(monkeypatch)
+    _simulator(tmp_path).analyze_ontology()
+
+    simulator = _simulator(tmp_path)
+    simulator.ontology_builder.get_graph_manager().graph.add(
+        (URIRef(EX + 'Robot'), RDFS.label, Literal('Robot')))
+    simulator.analyze_ontology()
+    assert len(calls) == 2
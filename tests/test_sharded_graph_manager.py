@@ -0,0 +1,97 @@
+"""Tests for ShardedGraphManager."""
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+from src.analysis.information_gain import InformationGainAnalyzer
+from src.core.materializer import RDFSMaterializer
+from src.core.sharded_graph_manager import ShardedGraphManager
+from src.core.validator import ConstraintValidator
+
+EX = 'http://example.org/test/'
+PREFIX = f"PREFIX ex: <{EX}>\n"
+
+def _uri(name: str) -> URIRef:
+    return URIRef(EX + name)
+
+def _person_triples(person: str, days: int) -> list:
+    triples = [(_uri(person), RDF.type, _uri('Person'))]
+    for day in range(days):
+        record = _uri(f"{person}_record_{day}")
+        triples.append((_uri(person), _uri('hasRecord'), record))
+        triples.append((record, _uri('day'), Literal(day, datatype=XSD.integer)))
+    return triples
+
+@pytest.fixture
+def sharded():
+    gm = ShardedGraphManager(base_uri=EX, num_shards=3)
+    yield gm
+    gm.close()
+
+def _fill(gm) -> Graph:
+    """Add three persons to gm and return the same data as one plain Graph."""
+    reference = Graph()
+    schema = [(_uri('Person'), RDF.type, OWL.Class),
+              (_uri('Patient'), RDFS.subClassOf, _uri('Person'))]
+    gm.add_triples(schema)
+    reference += schema
+    for person, days in (('alice', 4), ('bob', 3), ('carol', 5)):
+        triples = _person_triples(person, days)
+        gm.add_triples(triples, partition_key=person)
+        reference += triples
+    return reference
+
+def test_partition_key_keeps_a_batch_on_one_shard(sharded):
+    sharded.add_triples(_person_triples('alice', 10), partition_key='alice')
+    sizes = sharded.shard_sizes()
+    assert sorted(sizes) == [0, 0, 21]
+    assert sizes[sharded.shard_of('alice')] == 21
+
+def test_schema_and_broadcast_triples_are_replicated(sharded):
+    sharded.add_triples([(_uri('Person'), RDF.type, OWL.Class)])
+    sharded.add_triples([(_uri('city'), RDFS.label, Literal('Oslo'))], broadcast=True)
+    assert sharded.shard_sizes() == [2, 2, 2]
+    assert len(sharded) == 2
+
+def test_ordered_window_matches_a_single_graph(sharded):
+    reference = _fill(sharded)
+    query = PREFIX + """
+        SELECT ?record ?day WHERE { ?person ex:hasRecord ?record . ?record ex:day ?day }
+        ORDER BY DESC(?day) ?record LIMIT 5 OFFSET 2
+    """
+    expected = [tuple(row) for row in reference.query(query)]
+    assert [tuple(row) for row in sharded.query(query)] == expected
+
+def test_distinct_rows_are_merged_across_shards(sharded):
+    _fill(sharded)
+    rows = sharded.query(PREFIX + "SELECT DISTINCT ?day WHERE { ?r ex:day ?day }")
+    assert sorted(int(row.day) for row in rows) == [0, 1, 2, 3, 4]
+
+def test_unsupported_queries_are_rejected(sharded):
+    with pytest.raises(ValueError):
+        sharded.query(PREFIX + "SELECT (COUNT(?r) AS ?n) WHERE { ?r ex:day ?day }")
+    with pytest.raises(ValueError):
+        sharded.query(PREFIX + "SELECT ?r WHERE { ?r ex:day ?day } ORDER BY (?day + 1)")
+
+def test_removals_reach_every_shard(sharded):
+    reference = _fill(sharded)
+    removed = _person_triples('bob', 3)
+    sharded.remove_triples(removed)
+    for triple in removed:
+        reference.remove(triple)
+    assert set(sharded.to_graph()) == set(reference)
+
+def test_memory_usage_sums_the_shards(sharded):
+    _fill(sharded)
+    usage = sharded.memory_usage()
+    assert len(usage['shards']) == 3
+    assert usage['total'] == sum(shard['total'] for shard in usage['shards'])
+    assert usage['triples'] == len(sharded)
+
+def test_listeners_and_listener_based_consumers_are_rejected(sharded):
+    with pytest.raises(TypeError):
+        sharded.add_listener(object())
+    for consumer in (InformationGainAnalyzer, ConstraintValidator, RDFSMaterializer):
+        with pytest.raises(ValueError):
+            consumer(sharded)
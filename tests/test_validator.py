@@ -0,0 +1,127 @@
+"""Tests for ConstraintValidator."""
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+from src.core.graph_manager import GraphManager
+from src.core.validator import ConstraintValidator
+
+EX = 'http://example.org/test#'
+
+def _uri(name: str) -> URIRef:
+    return URIRef(EX + name)
+
+def _restriction(prop: URIRef, class_uri: URIRef, **facts) -> list:
+    node = BNode()
+    triples = [(node, RDF.type, OWL.Restriction), (node, OWL.onProperty, prop),
+               (class_uri, RDFS.subClassOf, node)]
+    for name, value in facts.items():
+        triples.append((node, getattr(OWL, name), value))
+    return triples
+
+def _manager() -> GraphManager:
+    """
+    Ontology with a Patient subclass of Person and an unrelated Thing.
+
+    A Person has at most one bloodType and a Patient at least one; a Patient
+    must have the status 'active'. heartRate is bounded to [40, 200].
+    """
+    person, patient, thing = _uri('Person'), _uri('Patient'), _uri('Thing')
+    blood_type, status, heart_rate = _uri('bloodType'), _uri('status'), _uri('heartRate')
+    facets = BNode()
+    low, high = BNode(), BNode()
+    triples = [
+        (person, RDF.type, OWL.Class), (patient, RDF.type, OWL.Class),
+        (thing, RDF.type, OWL.Class), (patient, RDFS.subClassOf, person),
+        (blood_type, RDF.type, OWL.DatatypeProperty), (blood_type, RDFS.domain, person),
+        (blood_type, RDFS.domain, thing),
+        (status, RDF.type, OWL.DatatypeProperty), (status, RDFS.domain, person),
+        (heart_rate, RDF.type, OWL.DatatypeProperty),
+        (heart_rate, OWL.withRestrictions, facets),
+        (facets, RDF.first, low), (facets, RDF.rest, BNode('rest')),
+        (BNode('rest'), RDF.first, high), (BNode('rest'), RDF.rest, RDF.nil),
+        (low, XSD.minInclusive, Literal(40)), (high, XSD.maxInclusive, Literal(200))
+    ]
+    triples += _restriction(blood_type, person, maxCardinality=Literal(1))
+    triples += _restriction(blood_type, patient, minCardinality=Literal(1))
+    triples += _restriction(status, patient, hasValue=Literal('active'))
+    gm = GraphManager()
+    gm.add_triples(triples)
+    return gm
+
+def test_bounds_are_checked_per_batch():
+    gm = _manager()
+    validator = ConstraintValidator(gm)
+    gm.add_triples([(_uri('a'), _uri('heartRate'), Literal(30)),
+                    (_uri('b'), _uri('heartRate'), Literal(80)),
+                    (_uri('c'), _uri('heartRate'), Literal('fast'))])
+    assert validator.report.summary() == {'min': 1, 'datatype': 1}
+
+def test_max_cardinality_only_applies_to_restricted_classes():
+    gm = _manager()
+    validator = ConstraintValidator(gm)
+    # A Thing may have several blood types, a Patient (a Person) only one
+    gm.add_triples([(_uri('t'), RDF.type, _uri('Thing')),
+                    (_uri('t'), _uri('bloodType'), Literal('A')),
+                    (_uri('t'), _uri('bloodType'), Literal('B')),
+                    (_uri('p'), RDF.type, _uri('Patient')),
+                    (_uri('p'), _uri('bloodType'), Literal('A'))])
+    assert validator.report.total == 0
+    gm.add_triples([(_uri('p'), _uri('bloodType'), Literal('B'))])
+    assert validator.report.summary() == {'max_cardinality': 1}
+
+def test_max_cardinality_when_type_is_added_later():
+    gm = _manager()
+    validator = ConstraintValidator(gm)
+    gm.add_triples([(_uri('x'), _uri('bloodType'), Literal('A')),
+                    (_uri('x'), _uri('bloodType'), Literal('B'))])
+    assert validator.report.total == 0
+    gm.add_triples([(_uri('x'), RDF.type, _uri('Patient')), (_uri('x'), RDF.type, _uri('Person'))])
+    assert validator.report.summary() == {'max_cardinality': 1}
+
+def test_existing_values_count_towards_max_cardinality():
+    gm = _manager()
+    gm.add_triples([(_uri('p'), RDF.type, _uri('Person')),
+                    (_uri('p'), _uri('bloodType'), Literal('A'))])
+    validator = ConstraintValidator(gm)
+    gm.add_triples([(_uri('p'), _uri('bloodType'), Literal('B'))])
+    assert validator.report.summary() == {'max_cardinality': 1}
+
+def test_removals_release_cardinality():
+    gm = _manager()
+    validator = ConstraintValidator(gm)
+    gm.add_triples([(_uri('p'), RDF.type, _uri('Person')),
+                    (_uri('p'), _uri('bloodType'), Literal('A'))])
+    gm.remove_triples([(_uri('p'), _uri('bloodType'), Literal('A'))])
+    gm.add_triples([(_uri('p'), _uri('bloodType'), Literal('B'))])
+    assert validator.report.total == 0
+
+def test_min_cardinality_counts_each_instance_once():
+    gm = _manager()
+    validator = ConstraintValidator(gm)
+    gm.add_triples([(_uri('p'), RDF.type, _uri('Patient')), (_uri('p'), RDF.type, _uri('Person')),
+                    (_uri('q'), RDF.type, _uri('Person')),
+                    (_uri('t'), RDF.type, _uri('Thing'))])
+    # Only the Patient needs a blood type
+    assert validator.check_min_cardinality() == 1
+    assert validator.report.entries[-1]['triple'][0] == _uri('p')
+
+def test_has_value_requires_the_value_without_excluding_others():
+    gm = _manager()
+    validator = ConstraintValidator(gm)
+    gm.add_triples([(_uri('p'), RDF.type, _uri('Patient')),
+                    (_uri('p'), _uri('status'), Literal('active')),
+                    (_uri('p'), _uri('status'), Literal('insured')),
+                    (_uri('q'), RDF.type, _uri('Patient')),
+                    (_uri('r'), RDF.type, _uri('Person')),
+                    (_uri('r'), _uri('status'), Literal('inactive'))])
+    assert validator.report.total == 0
+    assert validator.check_has_value() == 1
+    assert validator.report.entries[-1]['triple'][0] == _uri('q')
+
+def test_violation_report_is_bounded():
+    gm = _manager()
+    validator = ConstraintValidator(gm, max_violations=2)
+    gm.add_triples([(_uri(f"n{i}"), _uri('heartRate'), Literal(300 + i)) for i in range(5)])
+    assert validator.report.total == 5
+    assert len(validator.report.entries) == 2